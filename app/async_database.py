@@ -0,0 +1,250 @@
+import json
+import psycopg
+from psycopg import sql
+from psycopg.types.json import set_json_loads
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+from functools import partial
+from typing import Optional, Dict, Any, List
+from app.config import settings
+from app.utils.logger import logger
+
+# Decode numbers inside json/json_agg results as Decimal, matching how NUMERIC columns are returned
+set_json_loads(partial(json.loads, parse_float=Decimal))
+
+
+class AsyncDatabaseConnectionPool:
+    """Async database connection pool manager"""
+    _instance = None
+    _pool = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AsyncDatabaseConnectionPool, cls).__new__(cls)
+        return cls._instance
+
+    async def initialize(self):
+        """Initialize async connection pool"""
+        if self._pool is None:
+            try:
+                conninfo = make_conninfo(
+                    host=settings.DB_HOST,
+                    dbname=settings.DB_NAME,
+                    user=settings.DB_USER,
+                    password=settings.DB_PASSWORD,
+                    port=int(settings.DB_PORT)
+                )
+                self._pool = AsyncConnectionPool(
+                    conninfo,
+                    min_size=settings.ASYNC_DB_MIN_CONN,
+                    max_size=settings.ASYNC_DB_MAX_CONN,
+                    kwargs={"row_factory": dict_row},
+                    open=False
+                )
+                await self._pool.open(wait=True)
+                logger.info(
+                    "Async database connection pool created (min=%s, max=%s)",
+                    settings.ASYNC_DB_MIN_CONN, settings.ASYNC_DB_MAX_CONN
+                )
+            except Exception as e:
+                logger.error("Failed to create async connection pool: %s", e)
+                self._pool = None
+                raise
+
+    @asynccontextmanager
+    async def connection(self):
+        """Borrow a connection from the pool, committing on success"""
+        if self._pool is None:
+            await self.initialize()
+        async with self._pool.connection() as conn:
+            yield conn
+
+    async def close_all(self):
+        """Close all connections in pool"""
+        if self._pool:
+            await self._pool.close()
+            self._pool = None
+            logger.info("All async database connections closed")
+
+
+# Global async connection pool instance
+async_db_pool = AsyncDatabaseConnectionPool()
+
+
+# Connection pinned by AsyncDatabase.transaction() for the current task
+_transaction_conn: ContextVar = ContextVar("async_transaction_conn", default=None)
+
+
+class AsyncDatabase:
+    """Async counterpart of app.database.Database with the same query methods"""
+
+    @asynccontextmanager
+    async def get_connection(self):
+        """Context manager for async database connections; reuses the transaction() connection when inside one"""
+        pinned = _transaction_conn.get()
+        if pinned is not None:
+            yield pinned
+            return
+
+        try:
+            async with async_db_pool.connection() as conn:
+                yield conn
+        except Exception as e:
+            logger.error("Async database error: %s", e)
+            raise
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Unit of work: run every AsyncDatabase call in the block on one pooled connection
+
+        Commits once when the block exits and rolls back if it raises. Nested
+        transaction() blocks join the outer one.
+
+        Usage:
+            async with async_db.transaction():
+                director_id = await async_db.get_or_create("directors", "name", name)
+                await async_db.execute_insert(query, (director_id, ...))
+        """
+        if _transaction_conn.get() is not None:
+            yield _transaction_conn.get()
+            return
+
+        # The pool's connection() commits on a clean exit and rolls back on an exception
+        async with async_db_pool.connection() as conn:
+            token = _transaction_conn.set(conn)
+            try:
+                yield conn
+            except psycopg.Error as e:
+                logger.error("Async transaction rolled back: %s", e)
+                raise
+            finally:
+                _transaction_conn.reset(token)
+
+    async def execute_query(
+        self, query: str, params: tuple = None, fetch_one: bool = False, fetch_all: bool = True
+    ) -> Optional[Any]:
+        """
+        Execute a query with proper error handling
+
+        Args:
+            query: SQL query string using %s placeholders
+            params: Query parameters tuple
+            fetch_one: Return single row
+            fetch_all: Return all rows
+
+        Returns:
+            Query results or None
+        """
+        try:
+            async with self.get_connection() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(query, params)
+
+                    if fetch_one:
+                        return await cursor.fetchone()
+                    elif fetch_all:
+                        return await cursor.fetchall()
+                    return None
+        except psycopg.Error as e:
+            logger.error("Async query execution error: %s", e)
+            logger.error("Query: %s", query)
+            logger.error("Params: %s", params)
+            raise
+        except Exception as e:
+            logger.error("Unexpected error in async execute_query: %s", e)
+            raise
+
+    async def execute_insert(self, query: str, params: tuple) -> Optional[Dict]:
+        """Execute INSERT query and return inserted row"""
+        return await self.execute_query(query, params, fetch_one=True)
+
+    async def execute_update(self, query: str, params: tuple) -> Optional[Dict]:
+        """Execute UPDATE query and return updated row"""
+        return await self.execute_query(query, params, fetch_one=True)
+
+    async def execute_delete(self, query: str, params: tuple) -> bool:
+        """Execute DELETE query and return success status"""
+        try:
+            async with self.get_connection() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(query, params)
+                    return cursor.rowcount > 0
+        except Exception as e:
+            logger.error("Async delete operation error: %s", e)
+            raise
+
+    async def get_or_create(self, table: str, field: str, value: str, return_field: str = "id") -> Any:
+        """
+        Get existing record or create new one
+
+        Args:
+            table: Table name
+            field: Field to search/insert
+            value: Value to search/insert
+            return_field: Field to return
+
+        Returns:
+            Value of return_field
+        """
+        try:
+            async with self.get_connection() as conn:
+                async with conn.cursor() as cursor:
+                    select_query = sql.SQL("SELECT {return_field} FROM {table} WHERE {field} = %s").format(
+                        return_field=sql.Identifier(return_field),
+                        table=sql.Identifier(table),
+                        field=sql.Identifier(field)
+                    )
+                    await cursor.execute(select_query, (value,))
+                    result = await cursor.fetchone()
+
+                    if result:
+                        return result[return_field]
+
+                    insert_query = sql.SQL("INSERT INTO {table} ({field}) VALUES (%s) RETURNING {return_field}").format(
+                        table=sql.Identifier(table),
+                        field=sql.Identifier(field),
+                        return_field=sql.Identifier(return_field)
+                    )
+                    await cursor.execute(insert_query, (value,))
+                    result = await cursor.fetchone()
+                    return result[return_field]
+
+        except Exception as e:
+            logger.error("Async get_or_create error for table %s: %s", table, e)
+            raise
+
+    async def resolve_ids(self, lookups: Dict[str, str], field: str = "name") -> Dict[str, List[int]]:
+        """
+        Resolve ILIKE patterns to matching ids, one table per lookup, in a single round trip
+
+        Args:
+            lookups: Mapping of table name to ILIKE pattern
+            field: Field the patterns are matched against
+
+        Returns:
+            Mapping of table name to list of matching ids
+        """
+        if not lookups:
+            return {}
+        tables = list(lookups)
+        query = sql.SQL("SELECT {columns}").format(
+            columns=sql.SQL(", ").join([
+                sql.SQL("ARRAY(SELECT id FROM {table} WHERE {field} ILIKE %s) AS {alias}").format(
+                    table=sql.Identifier(table),
+                    field=sql.Identifier(field),
+                    alias=sql.Identifier(table)
+                )
+                for table in tables
+            ])
+        )
+        result = await self.execute_query(query, tuple(lookups[table] for table in tables), fetch_one=True)
+        return {table: list(result[table]) for table in tables}
+
+
+# Global async database instance
+async_db = AsyncDatabase()
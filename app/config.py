@@ -14,13 +14,98 @@ class Settings:
     # Connection Pool
     DB_MIN_CONN: int = int(os.getenv("DB_MIN_CONN", "2"))
     DB_MAX_CONN: int = int(os.getenv("DB_MAX_CONN", "10"))
+    # Seconds to wait for a free connection before answering 503
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+    DB_POOL_MAX_LIFETIME: float = float(os.getenv("DB_POOL_MAX_LIFETIME", "1800"))
+    DB_POOL_MAX_IDLE: float = float(os.getenv("DB_POOL_MAX_IDLE", "300"))
+    # Idle connections older than this are checked with SELECT 1 on checkout
+    DB_POOL_VALIDATE_AFTER: float = float(os.getenv("DB_POOL_VALIDATE_AFTER", "30"))
+    # Worker threads for sync handlers; defaults to twice the pool size so cache hits keep flowing while DB work queues
+    THREADPOOL_SIZE: int = int(os.getenv("THREADPOOL_SIZE", "0")) or 2 * DB_MAX_CONN
+
+    # PREPARE named hot-path statements once per connection
+    DB_PREPARED_STATEMENTS: bool = os.getenv("DB_PREPARED_STATEMENTS", "true").lower() == "true"
+
+    # Fetch tuple rows and zip them with the column names instead of using RealDictCursor
+    DB_TUPLE_ROWS: bool = os.getenv("DB_TUPLE_ROWS", "true").lower() == "true"
+    # Write list responses with orjson when it is installed (stdlib json otherwise)
+    FAST_JSON_ENABLED: bool = os.getenv("FAST_JSON_ENABLED", "true").lower() == "true"
+
+    # Read replicas: comma-separated host[:port] list; empty sends everything to DB_HOST
+    DB_REPLICA_HOSTS: str = os.getenv("DB_REPLICA_HOSTS", "")
+    # Replicas further behind the primary than this are taken out of rotation
+    DB_REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+    DB_REPLICA_CHECK_INTERVAL: float = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "1"))
+    # A client that wrote reads from the primary for this long (db_last_write cookie)
+    DB_REPLICA_STICKY_SECONDS: float = float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
+
+    # Async API (asyncio counterparts of the routes, mounted under /api/async)
+    ASYNC_API_ENABLED: bool = os.getenv("ASYNC_API_ENABLED", "false").lower() == "true"
+    ASYNC_DB_MIN_CONN: int = int(os.getenv("ASYNC_DB_MIN_CONN", "2"))
+    ASYNC_DB_MAX_CONN: int = int(os.getenv("ASYNC_DB_MAX_CONN", "20"))
     
     # API
     API_TITLE: str = "Movies API"
     API_VERSION: str = "1.0.0"
     CORS_ORIGINS: list = ["http://localhost:3000","https://movie-explorer-frontend-ten.vercel.app","https://movie-explorer-frontend-0oks.onrender.com"]
     
+    # Response cache
+    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "1000"))
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+
+    # Home page rows (materialized view refresh)
+    HOME_ROWS_ENABLED: bool = os.getenv("HOME_ROWS_ENABLED", "true").lower() == "true"
+    HOME_ROWS_REFRESH_SECONDS: float = float(os.getenv("HOME_ROWS_REFRESH_SECONDS", "300"))
+    # Minimum gap between refreshes; writes within it are folded into the next one
+    HOME_ROWS_MIN_INTERVAL_SECONDS: float = float(os.getenv("HOME_ROWS_MIN_INTERVAL_SECONDS", "5"))
+
+    # "More like this" index
+    SIMILAR_ENABLED: bool = os.getenv("SIMILAR_ENABLED", "true").lower() == "true"
+    # Neighbours kept per movie; also the largest limit GET /api/movies/{id}/similar serves
+    SIMILAR_TOP_K: int = int(os.getenv("SIMILAR_TOP_K", "20"))
+
+    # How often (seconds) a lookup compares the tables behind an in-memory index with the version it
+    # was built at; writes made by other processes (workers, the importer CLI) trigger a background
+    # rebuild. 0 disables the check
+    INDEX_VERSION_CHECK_SECONDS: float = float(os.getenv("INDEX_VERSION_CHECK_SECONDS", "10"))
+
+    # Actor collaboration graph
+    ACTOR_GRAPH_ENABLED: bool = os.getenv("ACTOR_GRAPH_ENABLED", "true").lower() == "true"
+
+    # Typeahead prefix index
+    AUTOCOMPLETE_ENABLED: bool = os.getenv("AUTOCOMPLETE_ENABLED", "true").lower() == "true"
+    # Prefixes matching more keys than this have their ranked suggestions memoized until the next write
+    AUTOCOMPLETE_MEMO_MIN_MATCHES: int = int(os.getenv("AUTOCOMPLETE_MEMO_MIN_MATCHES", "500"))
+
+    # Latest reviews embedded in GET /api/movies/{id}
+    MOVIE_DETAIL_REVIEW_LIMIT: int = int(os.getenv("MOVIE_DETAIL_REVIEW_LIMIT", "10"))
+
+    # Export
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+    # Metrics
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # Slow query log (0 disables)
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    SLOW_QUERY_LOG_FILE: str = os.getenv("SLOW_QUERY_LOG_FILE", "logs/slow_queries.log")
+    SLOW_QUERY_LOG_MAX_BYTES: int = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    SLOW_QUERY_LOG_BACKUPS: int = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5"))
+    # Fraction of slow queries re-run with EXPLAIN (ANALYZE, BUFFERS)
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0.1"))
+    SLOW_QUERY_EXPLAIN_QUEUE: int = int(os.getenv("SLOW_QUERY_EXPLAIN_QUEUE", "100"))
+
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # "text" or "json" (one object per line)
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+    # Records buffered for the writer thread; more are dropped rather than blocking requests
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    # Fraction of requests whose INFO logs are kept; warnings and errors are always kept
+    LOG_INFO_SAMPLE_RATE: float = float(os.getenv("LOG_INFO_SAMPLE_RATE", "1.0"))
+    # Per-route overrides by route template, e.g. "/api/movies=0.1,/api/autocomplete=0"
+    LOG_ROUTE_SAMPLE_RATES: str = os.getenv("LOG_ROUTE_SAMPLE_RATES", "")
 
 settings = Settings()
@@ -1,99 +1,780 @@
+import json
+import math
+import re
+import threading
+import time
 import psycopg2
-from psycopg2 import pool, sql
-from psycopg2.extras import RealDictCursor
+import psycopg2.errors
+import psycopg2.extensions
+from psycopg2 import sql
+from psycopg2.extras import RealDictCursor, register_default_json, register_default_jsonb
+from collections import deque
 from contextlib import contextmanager
-from typing import Optional, List, Dict, Any
+from contextvars import ContextVar
+from decimal import Decimal
+from functools import partial
+from http.cookies import CookieError, SimpleCookie
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+from uuid import uuid4
 from app.config import settings
 from app.utils.logger import logger
+from app.utils.metrics import registry, CallbackMetric, db_query_duration, db_rows_returned
+from app.utils.slow_query import current_scope, slow_query_log
+
+# Decode numbers inside json/json_agg results as Decimal, matching how NUMERIC columns are returned
+register_default_json(globally=True, loads=partial(json.loads, parse_float=Decimal))
+register_default_jsonb(globally=True, loads=partial(json.loads, parse_float=Decimal))
+
+
+class PreparedStatementConnection(psycopg2.extensions.connection):
+    """Connection that remembers which statements have been PREPAREd on its session"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Statement name -> (query text, server-side statement name)
+        self.prepared: Dict[str, Tuple[str, str]] = {}
+        self.prepare_seq = 0
+        # Pool bookkeeping for lifetime and idle recycling
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ZipDictCursor(psycopg2.extensions.cursor):
+    """
+    Cursor returning plain dicts built by zipping tuple rows with the column names
+
+    RealDictCursor assembles each row key by key in Python; this fetches the
+    tuples psycopg2 builds in C and reads the column names once per result.
+    """
+
+    def _columns(self) -> List[str]:
+        return [column.name for column in self.description]
+
+    def fetchone(self):
+        row = super().fetchone()
+        return None if row is None else dict(zip(self._columns(), row))
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(size) if size is not None else super().fetchmany()
+        columns = self._columns() if rows else None
+        return [dict(zip(columns, row)) for row in rows]
+
+    def fetchall(self):
+        rows = super().fetchall()
+        columns = self._columns() if rows else None
+        return [dict(zip(columns, row)) for row in rows]
+
+    def __iter__(self):
+        # Named cursors iterate through fetchmany, so batch through it here as well
+        while True:
+            rows = self.fetchmany(self.itersize)
+            if not rows:
+                return
+            yield from rows
+
+
+def dict_cursor_factory():
+    """Cursor class for dict rows, per DB_TUPLE_ROWS"""
+    return ZipDictCursor if settings.DB_TUPLE_ROWS else RealDictCursor
+
+
+class StatementStats:
+    """Per-statement counters for named (prepared) queries"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, name: str, prepare_seconds: Optional[float], execute_seconds: float):
+        with self._lock:
+            entry = self._stats.setdefault(name, {
+                "prepares": 0,
+                "executions": 0,
+                "prepare_seconds": 0.0,
+                "execute_seconds": 0.0
+            })
+            if prepare_seconds is not None:
+                entry["prepares"] += 1
+                entry["prepare_seconds"] += prepare_seconds
+            entry["executions"] += 1
+            entry["execute_seconds"] += execute_seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._stats.items()}
+
+
+# Parse/plan and execution timings of named statements
+statement_stats = StatementStats()
+
+_PLACEHOLDER = re.compile(r"%%|%s")
+_STATEMENT_NAME = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+def to_positional(query: str) -> Tuple[str, int]:
+    """
+    Rewrite a %s-style query to $n placeholders for PREPARE
+
+    Returns:
+        Tuple of (rewritten query, number of parameters)
+    """
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        if match.group(0) == "%%":
+            return "%"
+        count += 1
+        return f"${count}"
+
+    return _PLACEHOLDER.sub(replace, query), count
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes available within the acquire timeout"""
+
+
+class _Waiter:
+    """A caller queued for a connection"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.conn = None
+
+
+# Upper bounds (seconds) of the acquire wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, float("inf"))
 
 
 class DatabaseConnectionPool:
-    """Database connection pool manager"""
+    """
+    Blocking database connection pool
+
+    Callers wait up to DB_POOL_TIMEOUT seconds for a free connection instead of
+    failing as soon as DB_MAX_CONN are checked out. Connections are recycled
+    after DB_POOL_MAX_LIFETIME seconds, closed after DB_POOL_MAX_IDLE seconds
+    idle (down to DB_MIN_CONN), and checked before reuse.
+    """
     _instance = None
-    _pool = None
+    # Seconds psycopg2 waits for a new connection (None: libpq default, no limit)
+    connect_timeout: Optional[int] = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DatabaseConnectionPool, cls).__new__(cls)
+            cls._instance._setup("primary", settings.DB_HOST, int(settings.DB_PORT))
         return cls._instance
 
+    def _setup(self, name: str, host: str, port: int):
+        self.name = name
+        self.host = host
+        self.port = port
+        self._lock = threading.Lock()
+        self._idle = deque()
+        self._queue = deque()
+        self._initialized = False
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self._size = 0
+        self._in_use = 0
+        self._timeouts = 0
+        self._acquired = 0
+        self._created = 0
+        self._recycled = 0
+        self._wait_seconds = 0.0
+        self._wait_counts = [0] * len(WAIT_BUCKETS)
+
     def initialize(self):
         """Initialize connection pool"""
-        if self._pool is None:
+        with self._lock:
+            if self._initialized:
+                return
             try:
                 # Test connection first before creating pool
-                test_conn = psycopg2.connect(
-                    host=settings.DB_HOST,
-                    database=settings.DB_NAME,
-                    user=settings.DB_USER,
-                    password=settings.DB_PASSWORD,
-                    port=int(settings.DB_PORT)
-                )
+                test_conn = self._connect()
                 test_conn.close()
-                logger.info("Database connection test successful")
+                logger.info("Database connection test successful (%s)", self.name)
                 
-                # Create connection pool
-                self._pool = psycopg2.pool.ThreadedConnectionPool(
-                    settings.DB_MIN_CONN,
-                    settings.DB_MAX_CONN,
-                    host=settings.DB_HOST,
-                    database=settings.DB_NAME,
-                    user=settings.DB_USER,
-                    password=settings.DB_PASSWORD,
-                    port=int(settings.DB_PORT)
+                for _ in range(settings.DB_MIN_CONN):
+                    self._idle.append(self._connect())
+                    self._size += 1
+                self._initialized = True
+                logger.info(
+                    "Database connection pool %s created (min=%s, max=%s, timeout=%ss)",
+                    self.name, settings.DB_MIN_CONN, settings.DB_MAX_CONN, settings.DB_POOL_TIMEOUT
                 )
-                logger.info(f"Database connection pool created (min={settings.DB_MIN_CONN}, max={settings.DB_MAX_CONN})")
             except Exception as e:
-                logger.error(f"Failed to create connection pool: {str(e)}")
+                logger.error("Failed to create connection pool %s: %s", self.name, e)
+                self._close_idle()
                 raise
 
-    def get_connection(self):
-        """Get connection from pool"""
-        if self._pool is None:
+    def _connect(self):
+        conn = psycopg2.connect(
+            host=self.host,
+            database=settings.DB_NAME,
+            user=settings.DB_USER,
+            password=settings.DB_PASSWORD,
+            port=self.port,
+            connect_timeout=self.connect_timeout,
+            connection_factory=PreparedStatementConnection
+        )
+        self._created += 1
+        return conn
+
+    def get_connection(self, timeout: float = None):
+        """
+        Get connection from pool, waiting up to timeout seconds for one to free up
+
+        Waiters are served in arrival order: a returned connection (or a freed
+        slot) is handed straight to the longest-waiting caller.
+
+        Raises:
+            PoolTimeout: No connection became available in time
+        """
+        if not self._initialized:
             self.initialize()
-        try:
-            return self._pool.getconn()
-        except Exception as e:
-            logger.error(f"Failed to get connection from pool: {str(e)}")
-            raise
+        timeout = settings.DB_POOL_TIMEOUT if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            waiter = None
+            with self._lock:
+                if self._idle and not self._queue:
+                    conn = self._idle.pop()
+                    self._in_use += 1
+                elif self._size < settings.DB_MAX_CONN and not self._queue:
+                    # Reserve the slot before connecting outside the lock
+                    conn = None
+                    self._size += 1
+                    self._in_use += 1
+                else:
+                    waiter = _Waiter()
+                    self._queue.append(waiter)
+
+            if waiter is not None:
+                waiter.event.wait(max(0.0, deadline - time.monotonic()))
+                with self._lock:
+                    if not waiter.event.is_set():
+                        self._queue.remove(waiter)
+                        self._timeouts += 1
+                        logger.error(
+                            "Timed out after %ss waiting for a database connection (%s in use)", timeout, self._in_use
+                        )
+                        raise PoolTimeout(f"No database connection available within {timeout}s")
+                conn = waiter.conn
+
+            try:
+                if conn is None:
+                    conn = self._connect()
+                elif not self._usable(conn):
+                    self._discard(conn)
+                    continue
+            except Exception as e:
+                with self._lock:
+                    self._release_slot()
+                logger.error("Failed to get connection from pool: %s", e)
+                raise
+
+            self._record_wait(time.monotonic() - started)
+            return conn
 
     def return_connection(self, conn):
         """Return connection to pool"""
-        if self._pool and conn:
-            self._pool.putconn(conn)
+        if conn is None:
+            return
+        if not conn.closed and conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                pass
+
+        now = time.monotonic()
+        if (
+            not self._initialized
+            or conn.closed
+            or conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE
+            or now - conn.created_at > settings.DB_POOL_MAX_LIFETIME
+        ):
+            self._discard(conn)
+            return
+
+        conn.last_used = now
+        with self._lock:
+            if self._queue:
+                # Hand over directly; the slot stays checked out
+                waiter = self._queue.popleft()
+                waiter.conn = conn
+                waiter.event.set()
+                return
+            self._in_use -= 1
+            self._idle.append(conn)
+            expired = self._expire_idle(now)
+        for stale in expired:
+            stale.close()
+
+    def _usable(self, conn) -> bool:
+        """Check a connection taken from the idle list before handing it out"""
+        if conn.closed or time.monotonic() - conn.created_at > settings.DB_POOL_MAX_LIFETIME:
+            return False
+        if time.monotonic() - conn.last_used < settings.DB_POOL_VALIDATE_AFTER:
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error as e:
+            logger.warning("Discarding broken pooled connection: %s", e)
+            return False
+
+    def _discard(self, conn):
+        """Close a checked-out connection and free its slot"""
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+        with self._lock:
+            self._recycled += 1
+            self._release_slot()
+
+    def _release_slot(self):
+        """Free a checked-out slot, passing it to the next waiter if any; caller holds the lock"""
+        if self._queue:
+            # The waiter opens a new connection in the freed slot
+            waiter = self._queue.popleft()
+            waiter.conn = None
+            waiter.event.set()
+            return
+        self._in_use -= 1
+        self._size -= 1
+
+    def _expire_idle(self, now: float) -> List:
+        """Drop connections idle longer than DB_POOL_MAX_IDLE, keeping DB_MIN_CONN; caller holds the lock"""
+        expired = []
+        # Idle list is LIFO, so the longest-idle connections sit at the left
+        while (
+            self._idle
+            and self._size > settings.DB_MIN_CONN
+            and now - self._idle[0].last_used > settings.DB_POOL_MAX_IDLE
+        ):
+            expired.append(self._idle.popleft())
+            self._size -= 1
+            self._recycled += 1
+        return expired
+
+    def _record_wait(self, seconds: float):
+        with self._lock:
+            self._acquired += 1
+            self._wait_seconds += seconds
+            for index, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self._wait_counts[index] += 1
+                    break
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool occupancy and acquire wait counters"""
+        with self._lock:
+            cumulative = 0
+            histogram = {}
+            for bound, count in zip(WAIT_BUCKETS, self._wait_counts):
+                cumulative += count
+                histogram["+Inf" if bound == float("inf") else str(bound)] = cumulative
+            return {
+                "size": self._size,
+                "max_size": settings.DB_MAX_CONN,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "waiters": len(self._queue),
+                "acquired": self._acquired,
+                "timeouts": self._timeouts,
+                "created": self._created,
+                "recycled": self._recycled,
+                "wait_seconds_total": round(self._wait_seconds, 6),
+                "wait_histogram": histogram
+            }
+
+    def _close_idle(self):
+        while self._idle:
+            self._idle.pop().close()
+            self._size -= 1
 
     def close_all(self):
         """Close all connections in pool"""
-        if self._pool:
-            self._pool.closeall()
-            logger.info("All database connections closed")
+        with self._lock:
+            if not self._initialized:
+                return
+            self._initialized = False
+            self._close_idle()
+        logger.info("All database connections closed (%s)", self.name)
 
 
 # Global connection pool instance
 db_pool = DatabaseConnectionPool()
 
 
+class ReplicaConnectionPool(DatabaseConnectionPool):
+    """
+    Connection pool for one read replica
+
+    Unlike the primary pool there is one instance per replica. Sessions are
+    read-only, so a write routed here by mistake fails instead of diverging.
+    Health is kept up to date by ReplicaSet.check().
+    """
+    connect_timeout = 2
+
+    def __new__(cls, host: str, port: int):
+        pool = object.__new__(cls)
+        pool._setup(f"{host}:{port}", host, port)
+        pool.healthy = False
+        pool.lag_seconds = None
+        pool.last_error = None
+        pool.checked_at = None
+        return pool
+
+    def _connect(self):
+        conn = super()._connect()
+        conn.set_session(readonly=True)
+        return conn
+
+
+PRIMARY_LSN_QUERY = "SELECT pg_current_wal_lsn()::text AS lsn"
+
+# bytes_behind is NULL until the replica has replayed any WAL; on a server that
+# isn't in recovery (a standalone copy) both replay columns are NULL
+REPLICA_LAG_QUERY = """
+    SELECT pg_is_in_recovery() AS in_recovery,
+           pg_wal_lsn_diff(%s::pg_lsn, pg_last_wal_replay_lsn()) AS bytes_behind,
+           EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) AS replay_age
+"""
+
+
+def parse_replica_hosts(value: str) -> List[Tuple[str, int]]:
+    """Parse DB_REPLICA_HOSTS ("replica-1:5433,replica-2") into (host, port) pairs"""
+    hosts = []
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        host, _, port = item.partition(":")
+        hosts.append((host, int(port or settings.DB_PORT)))
+    return hosts
+
+
+def replica_lag(in_recovery: bool, bytes_behind: Optional[float], replay_age: Optional[float]) -> Optional[float]:
+    """
+    Seconds a replica is behind the primary LSN sampled just before it
+
+    A replica that has replayed up to that LSN is 0 behind however old its last
+    replayed transaction is (an idle primary produces no new transactions).
+    Returns None when the lag is unknown (nothing replayed yet).
+    """
+    if not in_recovery:
+        return 0.0
+    if bytes_behind is None:
+        return None
+    if bytes_behind <= 0:
+        return 0.0
+    return None if replay_age is None else max(0.0, float(replay_age))
+
+
+class ReplicaSet:
+    """
+    Read replica pools with a background lag check
+
+    Every DB_REPLICA_CHECK_INTERVAL seconds the primary's WAL position is
+    compared with each replica's replay position. Replicas that are unreachable
+    or more than DB_REPLICA_MAX_LAG_SECONDS behind are taken out of rotation
+    until a later check finds them caught up. Replicas start out of rotation
+    until their first check passes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pools: List[ReplicaConnectionPool] = []
+        self._next = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def configure(self, hosts: str):
+        """Create one pool per host[:port] entry"""
+        self.pools = [ReplicaConnectionPool(host, port) for host, port in parse_replica_hosts(hosts)]
+
+    def start(self):
+        """Create the replica pools from DB_REPLICA_HOSTS and start the lag checker"""
+        if not self.pools:
+            self.configure(settings.DB_REPLICA_HOSTS)
+        if not self.pools or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-lag-check", daemon=True)
+        self._thread.start()
+        logger.info(
+            "Replica lag checker started for %s (max lag %ss)",
+            ", ".join(pool.name for pool in self.pools), settings.DB_REPLICA_MAX_LAG_SECONDS
+        )
+
+    def stop(self):
+        """Stop the lag checker and close the replica pools"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+        for pool in self.pools:
+            pool.healthy = False
+            pool.close_all()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.check()
+            except Exception as e:
+                logger.error("Unexpected error checking replica lag: %s", e)
+            self._stop.wait(settings.DB_REPLICA_CHECK_INTERVAL)
+
+    def check(self):
+        """Measure each replica's lag and update which ones serve reads"""
+        try:
+            conn = db_pool.get_connection(timeout=1)
+        except Exception as e:
+            logger.warning("Skipping replica lag check, primary unavailable: %s", e)
+            return
+        try:
+            cursor = conn.cursor()
+            cursor.execute(PRIMARY_LSN_QUERY)
+            primary_lsn = cursor.fetchone()[0]
+            conn.rollback()
+        finally:
+            db_pool.return_connection(conn)
+
+        for pool in self.pools:
+            try:
+                lag = self._measure(pool, primary_lsn)
+                error = None if lag is not None else "replay position unknown"
+            except Exception as e:
+                lag, error = None, str(e)
+            self._update(pool, lag, error)
+
+    def _measure(self, pool: ReplicaConnectionPool, primary_lsn: str) -> Optional[float]:
+        conn = pool.get_connection(timeout=1)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(REPLICA_LAG_QUERY, (primary_lsn,))
+            in_recovery, bytes_behind, replay_age = cursor.fetchone()
+            conn.rollback()
+        finally:
+            pool.return_connection(conn)
+        return replica_lag(in_recovery, bytes_behind, replay_age)
+
+    def _update(self, pool: ReplicaConnectionPool, lag: Optional[float], error: Optional[str]):
+        healthy = lag is not None and lag <= settings.DB_REPLICA_MAX_LAG_SECONDS
+        if healthy != pool.healthy:
+            if healthy:
+                logger.info("Replica %s back in rotation (lag %.3fs)", pool.name, lag)
+            else:
+                logger.warning("Replica %s out of rotation: %s", pool.name, error or f"lag {lag:.3f}s")
+        pool.healthy = healthy
+        pool.lag_seconds = lag
+        pool.last_error = error
+        pool.checked_at = time.time()
+
+    def eject(self, pool: ReplicaConnectionPool, error: Exception):
+        """Take a replica out of rotation until the next successful check"""
+        if pool.healthy:
+            logger.warning("Replica %s out of rotation: %s", pool.name, error)
+        pool.healthy = False
+        pool.last_error = str(error)
+
+    def choose(self) -> Optional[ReplicaConnectionPool]:
+        """Next healthy replica in round-robin order, or None"""
+        pools = self.pools
+        with self._lock:
+            for _ in range(len(pools)):
+                pool = pools[self._next % len(pools)]
+                self._next += 1
+                if pool.healthy:
+                    return pool
+        return None
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Health, lag and pool occupancy per replica"""
+        return [
+            {
+                "replica": pool.name,
+                "healthy": pool.healthy,
+                "lag_seconds": pool.lag_seconds,
+                "last_error": pool.last_error,
+                "checked_at": pool.checked_at,
+                "pool": pool.stats()
+            }
+            for pool in self.pools
+        ]
+
+
+# Global read replica set (empty unless DB_REPLICA_HOSTS is set)
+replicas = ReplicaSet()
+
+
+# Connection pinned by Database.transaction() for the current request/task
+_transaction_conn: ContextVar = ContextVar("transaction_conn", default=None)
+
+# Set inside Database.use_primary() blocks
+_primary_reads: ContextVar = ContextVar("primary_reads", default=False)
+
+# Request scope keys: reads stay on the primary / the request wrote something /
+# the replica this request reads from
+PRIMARY_READS_KEY = "movies_api.primary_reads"
+WROTE_KEY = "movies_api.wrote"
+REPLICA_KEY = "movies_api.replica"
+
+_READ_STATEMENT = re.compile(r"^\s*\(?\s*(SELECT|WITH|VALUES|TABLE)\b", re.IGNORECASE)
+_WRITE_KEYWORD = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|nextval|setval|pg_(try_)?advisory\w*)\b|\bFOR\s+(NO\s+KEY\s+|KEY\s+)?SHARE\b",
+    re.IGNORECASE
+)
+
+
+def is_read_only(query) -> bool:
+    """
+    Whether a statement can run on a replica
+
+    Only plain-text SELECT/WITH statements that don't modify rows, take row
+    locks or advisory locks qualify; sql.Composed queries are treated as writes.
+    """
+    return isinstance(query, str) and bool(_READ_STATEMENT.match(query)) and not _WRITE_KEYWORD.search(query)
+
+
+def _mark_write():
+    """Keep the rest of the current request's reads on the primary and tell the client to as well"""
+    scope = current_scope.get()
+    if scope is not None:
+        scope[PRIMARY_READS_KEY] = True
+        scope[WROTE_KEY] = True
+
+
+def _read_pool():
+    """
+    Pool for a read: a healthy replica unless read-your-writes applies
+
+    A request keeps reading from the replica it started on, so its reads never
+    go back in time (e.g. a version check followed by the full query). If that
+    replica leaves the rotation, the rest of the request reads from the primary.
+    """
+    if not replicas.pools or _primary_reads.get():
+        return db_pool
+    scope = current_scope.get()
+    if scope is None:
+        return replicas.choose() or db_pool
+    if scope.get(PRIMARY_READS_KEY):
+        return db_pool
+    pinned = scope.get(REPLICA_KEY)
+    if pinned is not None:
+        return pinned if pinned.healthy else db_pool
+    pool = replicas.choose()
+    if pool is None:
+        return db_pool
+    scope[REPLICA_KEY] = pool
+    return pool
+
+
 class Database:
     """Database operations class with common query methods"""
 
     @contextmanager
-    def get_connection(self):
-        """Context manager for database connections"""
+    def get_connection(self, read_only: bool = False):
+        """
+        Context manager for database connections
+
+        Inside Database.transaction() this yields the pinned connection and
+        leaves commit/rollback to the transaction. read_only connections come
+        from a replica when one is in rotation; everything else uses the primary.
+        """
+        pinned = _transaction_conn.get()
+        if pinned is not None:
+            yield pinned
+            return
+
+        pool = _read_pool() if read_only else db_pool
         conn = None
         try:
-            conn = db_pool.get_connection()
+            conn, pool = self._checkout(pool)
             yield conn
             conn.commit()
         except Exception as e:
             if conn:
                 conn.rollback()
-            logger.error(f"Database error: {str(e)}")
+            if isinstance(e, psycopg2.OperationalError) and pool is not db_pool:
+                replicas.eject(pool, e)
+            logger.error("Database error: %s", e)
             raise
         finally:
             if conn:
-                db_pool.return_connection(conn)
+                pool.return_connection(conn)
+
+    def _checkout(self, pool):
+        """Check out from pool, falling back to the primary when a replica can't be reached"""
+        if pool is db_pool:
+            return db_pool.get_connection(), db_pool
+        try:
+            return pool.get_connection(), pool
+        except (psycopg2.OperationalError, PoolTimeout) as e:
+            replicas.eject(pool, e)
+            return db_pool.get_connection(), db_pool
+
+    @contextmanager
+    def use_primary(self):
+        """
+        Send every read in the block to the primary
 
-    def execute_query(self, query: str, params: tuple = None, fetch_one: bool = False, fetch_all: bool = True) -> Optional[Any]:
+        For code that must see its own or other requests' latest writes, such as
+        the in-memory indexes re-reading the rows a write just changed.
+        """
+        token = _primary_reads.set(True)
+        try:
+            yield
+        finally:
+            _primary_reads.reset(token)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Unit of work: run every Database call in the block on one pooled connection
+
+        Commits once when the block exits and rolls back if it raises. Nested
+        transaction() blocks join the outer one. Always runs on the primary.
+
+        Usage:
+            with db.transaction():
+                director_id = db.get_or_create("directors", "name", name)
+                db.execute_insert(query, (director_id, ...))
+        """
+        if _transaction_conn.get() is not None:
+            yield _transaction_conn.get()
+            return
+
+        conn = db_pool.get_connection()
+        token = _transaction_conn.set(conn)
+        try:
+            yield conn
+            conn.commit()
+            _mark_write()
+        except Exception as e:
+            conn.rollback()
+            if isinstance(e, psycopg2.Error):
+                logger.error("Transaction rolled back: %s", e)
+            raise
+        finally:
+            _transaction_conn.reset(token)
+            db_pool.return_connection(conn)
+
+    def execute_query(
+        self,
+        query: str,
+        params: tuple = None,
+        fetch_one: bool = False,
+        fetch_all: bool = True,
+        name: str = None,
+        read_only: bool = None
+    ) -> Optional[Any]:
         """
         Execute a query with proper error handling
         
@@ -102,46 +783,151 @@ class Database:
             params: Query parameters tuple
             fetch_one: Return single row
             fetch_all: Return all rows
+            name: Statement name; the query is PREPAREd once per connection and EXECUTEd afterwards
+            read_only: Whether the statement may run on a replica; detected from the query text by default
         
         Returns:
             Query results or None
         """
+        if read_only is None:
+            read_only = is_read_only(query)
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor(cursor_factory=RealDictCursor)
-                cursor.execute(query, params or ())
+            with self.get_connection(read_only=read_only) as conn:
+                started = time.perf_counter()
+                cursor = conn.cursor(cursor_factory=dict_cursor_factory())
+                if name and settings.DB_PREPARED_STATEMENTS and hasattr(conn, "prepared"):
+                    self._execute_prepared(conn, cursor, name, query, params or ())
+                else:
+                    cursor.execute(query, params or ())
                 
+                result = None
+                rows = 0
                 if fetch_one:
-                    return cursor.fetchone()
+                    result = cursor.fetchone()
+                    rows = 1 if result is not None else 0
                 elif fetch_all:
-                    return cursor.fetchall()
-                return None
+                    result = cursor.fetchall()
+                    rows = len(result)
+                duration = time.perf_counter() - started
+                statement = name or "unnamed"
+                db_query_duration.observe(duration, statement)
+                db_rows_returned.inc(rows, statement)
+                if slow_query_log.is_slow(duration):
+                    self._record_slow(conn, query, params, duration, name)
+            if not read_only:
+                _mark_write()
+            return result
         except psycopg2.Error as e:
-            logger.error(f"Query execution error: {str(e)}")
-            logger.error(f"Query: {query}")
-            logger.error(f"Params: {params}")
+            logger.error("Query execution error: %s", e)
+            logger.error("Query: %s", query)
+            logger.error("Params: %s", params)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error in execute_query: {str(e)}")
+            logger.error("Unexpected error in execute_query: %s", e)
+            raise
+
+    def _record_slow(self, conn, query, params: tuple, duration: float, name: Optional[str]):
+        """Hand a statement that exceeded SLOW_QUERY_THRESHOLD_MS to the slow query log"""
+        text = query if isinstance(query, str) else query.as_string(conn)
+        slow_query_log.record(text, params, duration, name)
+
+    def _execute_prepared(self, conn, cursor, name: str, query: str, params: tuple):
+        """EXECUTE a named statement, PREPAREing it first if this connection hasn't seen it"""
+        if not _STATEMENT_NAME.match(name):
+            raise ValueError(f"Invalid statement name: {name}")
+
+        prepare_seconds = None
+        entry = conn.prepared.get(name)
+        if entry is not None and entry[0] != query:
+            raise ValueError(f"Statement name {name} is already used for a different query")
+        if entry is None:
+            positional, _ = to_positional(query)
+            conn.prepare_seq += 1
+            server_name = f"{name}_{conn.prepare_seq}"
+            started = time.perf_counter()
+            cursor.execute(f"PREPARE {server_name} AS {positional}")
+            prepare_seconds = time.perf_counter() - started
+            entry = (query, server_name)
+            conn.prepared[name] = entry
+
+        server_name = entry[1]
+        if params:
+            placeholders = ", ".join(["%s"] * len(params))
+            statement = f"EXECUTE {server_name} ({placeholders})"
+        else:
+            statement = f"EXECUTE {server_name}"
+        started = time.perf_counter()
+        try:
+            cursor.execute(statement, params or None)
+        except (psycopg2.errors.InvalidSqlStatementName, psycopg2.errors.FeatureNotSupported) as e:
+            # Statement was dropped (DISCARD ALL) or its cached plan went stale after a
+            # schema change; forget it so the next call prepares a fresh one
+            conn.prepared.pop(name, None)
+            if _transaction_conn.get() is conn:
+                # Rolling back would also undo the caller's earlier statements
+                raise
+            # The failed EXECUTE aborted only this statement's own transaction
+            logger.warning("Prepared statement %s failed (%s); running it unprepared", server_name, e)
+            conn.rollback()
+            cursor.execute(query, params or ())
+            return
+        statement_stats.record(name, prepare_seconds, time.perf_counter() - started)
+
+    def stream_query(self, query: str, params: tuple = None, batch_size: int = 1000) -> Iterator[Dict]:
+        """
+        Yield rows through a named server-side cursor, fetching batch_size rows per round trip
+
+        Memory use stays constant regardless of result size. The connection is
+        held until the generator is exhausted or closed, and is always handed
+        back with the read transaction rolled back. Runs on a replica when one
+        is in rotation.
+
+        Args:
+            query: SQL query string
+            params: Query parameters tuple
+            batch_size: Rows fetched from the server per round trip
+        """
+        conn, pool = self._checkout(_read_pool())
+        try:
+            cursor = conn.cursor(name=f"stream_{uuid4().hex}", cursor_factory=dict_cursor_factory())
+            cursor.itersize = batch_size
+            cursor.execute(query, params or ())
+            for row in cursor:
+                yield row
+            cursor.close()
+        except psycopg2.Error as e:
+            logger.error("Stream query error: %s", e)
+            logger.error("Query: %s", query)
             raise
+        finally:
+            if not conn.closed:
+                conn.rollback()
+            pool.return_connection(conn)
 
-    def execute_insert(self, query: str, params: tuple) -> Optional[Dict]:
+    def execute_insert(self, query: str, params: tuple, name: str = None) -> Optional[Dict]:
         """Execute INSERT query and return inserted row"""
-        return self.execute_query(query, params, fetch_one=True)
+        return self.execute_query(query, params, fetch_one=True, name=name, read_only=False)
 
-    def execute_update(self, query: str, params: tuple) -> Optional[Dict]:
+    def execute_update(self, query: str, params: tuple, name: str = None) -> Optional[Dict]:
         """Execute UPDATE query and return updated row"""
-        return self.execute_query(query, params, fetch_one=True)
+        return self.execute_query(query, params, fetch_one=True, name=name, read_only=False)
 
-    def execute_delete(self, query: str, params: tuple) -> bool:
+    def execute_delete(self, query: str, params: tuple, name: str = None) -> bool:
         """Execute DELETE query and return success status"""
         try:
             with self.get_connection() as conn:
+                started = time.perf_counter()
                 cursor = conn.cursor()
                 cursor.execute(query, params)
-                return cursor.rowcount > 0
+                duration = time.perf_counter() - started
+                db_query_duration.observe(duration, name or "unnamed")
+                if slow_query_log.is_slow(duration):
+                    self._record_slow(conn, query, params, duration, name)
+                deleted = cursor.rowcount > 0
+            _mark_write()
+            return deleted
         except Exception as e:
-            logger.error(f"Delete operation error: {str(e)}")
+            logger.error("Delete operation error: %s", e)
             raise
 
     def get_or_create(self, table: str, field: str, value: str, return_field: str = "id") -> Any:
@@ -159,7 +945,7 @@ class Database:
         """
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                cursor = conn.cursor(cursor_factory=dict_cursor_factory())
                 
                 # Try to get existing
                 select_query = sql.SQL("SELECT {return_field} FROM {table} WHERE {field} = %s").format(
@@ -181,12 +967,149 @@ class Database:
                 )
                 cursor.execute(insert_query, (value,))
                 result = cursor.fetchone()
+                _mark_write()
                 return result[return_field]
                 
         except Exception as e:
-            logger.error(f"get_or_create error for table {table}: {str(e)}")
+            logger.error("get_or_create error for table %s: %s", table, e)
             raise
 
+    def resolve_ids(self, lookups: Dict[str, str], field: str = "name") -> Dict[str, List[int]]:
+        """
+        Resolve ILIKE patterns to matching ids, one table per lookup, in a single round trip
+
+        Args:
+            lookups: Mapping of table name to ILIKE pattern
+            field: Field the patterns are matched against
+
+        Returns:
+            Mapping of table name to list of matching ids
+        """
+        if not lookups:
+            return {}
+        tables = list(lookups)
+        query = sql.SQL("SELECT {columns}").format(
+            columns=sql.SQL(", ").join([
+                sql.SQL("ARRAY(SELECT id FROM {table} WHERE {field} ILIKE %s) AS {alias}").format(
+                    table=sql.Identifier(table),
+                    field=sql.Identifier(field),
+                    alias=sql.Identifier(table)
+                )
+                for table in tables
+            ])
+        )
+        result = self.execute_query(query, tuple(lookups[table] for table in tables), fetch_one=True, read_only=True)
+        return {table: list(result[table]) for table in tables}
+
 
 # Global database instance
 db = Database()
+
+
+LAST_WRITE_COOKIE = "db_last_write"
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware keeping a client's reads on the primary right after it writes
+
+    A request that wrote gets a db_last_write cookie; requests carrying one
+    younger than DB_REPLICA_STICKY_SECONDS read from the primary, so a client
+    sees its own writes even while the replicas are still catching up.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        last_write = _last_write(scope)
+        if last_write is not None and time.time() - last_write < settings.DB_REPLICA_STICKY_SECONDS:
+            scope[PRIMARY_READS_KEY] = True
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and scope.get(WROTE_KEY):
+                cookie = SimpleCookie()
+                cookie[LAST_WRITE_COOKIE] = f"{time.time():.3f}"
+                cookie[LAST_WRITE_COOKIE].update({
+                    "max-age": int(math.ceil(settings.DB_REPLICA_STICKY_SECONDS)),
+                    "path": "/",
+                    "httponly": True,
+                    "samesite": "Lax"
+                })
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", cookie[LAST_WRITE_COOKIE].OutputString().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def _last_write(scope) -> Optional[float]:
+    """Timestamp from the request's db_last_write cookie, if any"""
+    for key, value in scope.get("headers", []):
+        if key == b"cookie":
+            cookie = SimpleCookie()
+            try:
+                cookie.load(value.decode("latin-1"))
+                return float(cookie[LAST_WRITE_COOKIE].value)
+            except (CookieError, KeyError, ValueError):
+                return None
+    return None
+
+
+def _pool_samples():
+    stats = db_pool.stats()
+    return [
+        ("", {"state": "in_use"}, stats["in_use"]),
+        ("", {"state": "idle"}, stats["idle"]),
+        ("", {"state": "waiting"}, stats["waiters"])
+    ]
+
+
+def _pool_wait_samples():
+    stats = db_pool.stats()
+    samples = [("_bucket", {"le": bound}, count) for bound, count in stats["wait_histogram"].items()]
+    samples.append(("_sum", {}, stats["wait_seconds_total"]))
+    samples.append(("_count", {}, stats["acquired"]))
+    return samples
+
+
+def _statement_samples(field: str):
+    return lambda: [("", {"statement": name}, entry[field]) for name, entry in statement_stats.snapshot().items()]
+
+
+def _replica_samples(field: str):
+    return lambda: [
+        ("", {"replica": pool.name}, float(getattr(pool, field)))
+        for pool in replicas.pools
+        if getattr(pool, field) is not None
+    ]
+
+
+registry.register(CallbackMetric("db_pool_connections", "Pooled connections by state", "gauge", _pool_samples))
+registry.register(CallbackMetric(
+    "db_pool_wait_seconds", "Time spent waiting to check out a connection", "histogram", _pool_wait_samples
+))
+registry.register(CallbackMetric(
+    "db_pool_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT", "counter",
+    lambda: [("", {}, db_pool.stats()["timeouts"])]
+))
+registry.register(CallbackMetric(
+    "db_statement_prepares_total", "PREPAREs issued per named statement", "counter",
+    _statement_samples("prepares")
+))
+registry.register(CallbackMetric(
+    "db_statement_prepare_seconds_total", "Time spent in PREPARE (parse/analyze) per named statement", "counter",
+    _statement_samples("prepare_seconds")
+))
+registry.register(CallbackMetric(
+    "db_replica_lag_seconds", "Replication lag measured by the last replica check", "gauge",
+    _replica_samples("lag_seconds")
+))
+registry.register(CallbackMetric(
+    "db_replica_healthy", "1 while a replica is in the read rotation", "gauge",
+    _replica_samples("healthy")
+))
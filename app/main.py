@@ -1,11 +1,19 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
+from anyio import to_thread
 from app.config import settings
-from app.database import db_pool
+from app.database import db_pool, replicas, statement_stats, PoolTimeout, ReadYourWritesMiddleware
 from app.utils.logger import logger
-from app.routes import movies, reviews, directors, genres, actors
+from app.utils.cache import response_cache
+from app.utils.metrics import registry, MetricsMiddleware
+from app.utils.slow_query import RouteContextMiddleware, slow_query_log
+from app.services.home_rows import home_rows
+from app.services.similar import similar_index
+from app.services.actor_graph import actor_graph
+from app.services.autocomplete import autocomplete_index
+from app.routes import movies, reviews, directors, genres, actors, export, autocomplete
 
 
 @asynccontextmanager
@@ -16,15 +24,33 @@ async def lifespan(app: FastAPI):
     try:
         db_pool.initialize()
         logger.info("Database connection pool initialized")
+        replicas.start()
+        # Sync handlers run in anyio's threadpool; size it against the connection pool
+        to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+        logger.info("Threadpool size set to %s", settings.THREADPOOL_SIZE)
+        home_rows.start()
+        similar_index.start()
+        actor_graph.start()
+        autocomplete_index.start()
+        if settings.ASYNC_API_ENABLED:
+            from app.async_database import async_db_pool
+            await async_db_pool.initialize()
+            logger.info("Async database connection pool initialized")
     except Exception as e:
-        logger.error(f"Failed to initialize database: {str(e)}")
+        logger.error("Failed to initialize database: %s", e)
         raise
     
     yield
     
     # Shutdown
     logger.info("Shutting down Movies API...")
+    home_rows.stop()
+    slow_query_log.drain()
+    replicas.stop()
     db_pool.close_all()
+    if settings.ASYNC_API_ENABLED:
+        from app.async_database import async_db_pool
+        await async_db_pool.close_all()
     logger.info("Application shutdown complete")
 
 
@@ -49,11 +75,34 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+    """Ask clients to retry when every database connection stays busy past the acquire timeout"""
+    logger.warning("Pool timeout on %s: %s", request.url.path, exc)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database busy, please retry"},
+        headers={"Retry-After": "1"}
+    )
+
+
+# Request latency metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Keeps reads on the primary for clients that just wrote
+if settings.DB_REPLICA_HOSTS:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Lets the slow query log attribute statements to routes
+app.add_middleware(RouteContextMiddleware)
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle uncaught exceptions"""
-    logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
     return JSONResponse(
         status_code=500,
         content={"detail": "Internal server error", "error_type": type(exc).__name__}
@@ -66,6 +115,20 @@ app.include_router(reviews.router)
 app.include_router(directors.router)
 app.include_router(genres.router)
 app.include_router(actors.router)
+app.include_router(export.router)
+app.include_router(autocomplete.router)
+
+# Async counterparts share the same handlers' SQL and are kept for benchmarking against the sync path
+if settings.ASYNC_API_ENABLED:
+    from app.routes.aio import (
+        movies as aio_movies, reviews as aio_reviews, directors as aio_directors, genres as aio_genres,
+        actors as aio_actors
+    )
+    app.include_router(aio_movies.router)
+    app.include_router(aio_reviews.router)
+    app.include_router(aio_directors.router)
+    app.include_router(aio_genres.router)
+    app.include_router(aio_actors.router)
 
 
 # Health check
@@ -89,7 +152,7 @@ def health():
         db.execute_query("SELECT 1", fetch_one=True)
         db_status = "connected"
     except Exception as e:
-        logger.error(f"Database health check failed: {str(e)}")
+        logger.error("Database health check failed: %s", e)
         db_status = "disconnected"
     
     return {
@@ -97,3 +160,33 @@ def health():
         "database": db_status,
         "version": settings.API_VERSION
     }
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Response cache hit/miss/eviction counters"""
+    return response_cache.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text-format metrics"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/db/pool")
+def connection_pool_stats():
+    """Connection pool occupancy, acquire waits and timeouts"""
+    return db_pool.stats()
+
+
+@app.get("/db/replicas")
+def replica_stats():
+    """Read replica health, replication lag and pool occupancy"""
+    return replicas.stats()
+
+
+@app.get("/db/statements")
+def prepared_statement_stats():
+    """Prepare (parse/plan) and execution timings of named statements"""
+    return statement_stats.snapshot()
@@ -1,114 +1,348 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, List
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import Optional, Dict, Any, Tuple
 from app.models import ActorCreate, ActorUpdate, ActorResponse, ErrorResponse
-from app.database import db
+from app.config import settings
+from app.database import db, PoolTimeout
 from app.utils.logger import logger
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.cache import response_cache
+from app.utils.responses import FastJSONResponse
+from app.utils.conditional import (
+    Validators, is_conditional, is_not_modified, make_validators, not_modified, pop_row_versions
+)
+from app.services.similar import similar_index
+from app.services.actor_graph import actor_graph
+from app.services.autocomplete import autocomplete_index
 import psycopg2
 
 router = APIRouter(prefix="/api/actors", tags=["actors"])
 
+ACTOR_NAMES_QUERY = "SELECT id, name FROM actors WHERE id = ANY(%s)"
+MOVIE_TITLES_QUERY = "SELECT id, title FROM movies WHERE id = ANY(%s)"
+
+# Version of an actor's filmography: the actor row plus every credit and the movie,
+# director and genre rows shown for it. actor_detail selects the same xmins as
+# row_version, so a 200 carries its ETag without running this
+ACTOR_VERSION_QUERY = """
+    SELECT a.xmin::text as row_version,
+           COALESCE(
+               string_agg(concat_ws('.', ma.xmin, m.xmin, d.xmin, g.xmin), ',' ORDER BY ma.movie_id), ''
+           ) as credits
+    FROM actors a
+    LEFT JOIN (
+        movie_actors ma
+        JOIN movies m ON m.id = ma.movie_id
+        JOIN directors d ON d.id = m.director_id
+        JOIN genres g ON g.id = m.genre_id
+    ) ON ma.actor_id = a.id
+    WHERE a.id = %s
+    GROUP BY a.id
+"""
+
+
+def require_actor_graph():
+    """Reject collaboration queries when the actor graph is disabled"""
+    if not settings.ACTOR_GRAPH_ENABLED:
+        raise HTTPException(status_code=503, detail="Actor graph is disabled")
+
+
+def require_actor(actor_id: int):
+    """404 unless the actor exists (actors without credits are absent from the graph)"""
+    if not db.execute_query("SELECT id FROM actors WHERE id = %s", (actor_id,), fetch_one=True):
+        logger.warning("Actor not found: id=%s", actor_id)
+        raise HTTPException(status_code=404, detail="Actor not found")
+
 
 @router.get("", response_model=dict)
 def get_actors(
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
-    genre: Optional[str] = None
+    genre: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
     """
     Get all actors with optional filters
     
     Query Parameters:
     - limit: Maximum number of actors to return
-    - offset: Number of actors to skip
+    - offset: Number of actors to skip (legacy, ignored when a cursor is given)
     - genre: Filter actors by genre they've acted in
+    - cursor: Opaque cursor from a previous page's next_cursor, keyed on (name, id)
     """
     try:
-        logger.info(f"Fetching actors: limit={limit}, offset={offset}, genre={genre}")
+        logger.info("Fetching actors: limit=%s, offset=%s, genre=%s, cursor=%s", limit, offset, genre, cursor)
+
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        conditions = []
+        params = []
         
         if genre:
-            # Filter actors by genre
-            query = """
-                SELECT DISTINCT a.id, a.name, a.bio, a.birth_year, a.image_url, a.created_at
-                FROM actors a
-                JOIN movie_actors ma ON a.id = ma.actor_id
-                JOIN movies m ON ma.movie_id = m.id
-                JOIN movie_genres mg ON m.id = mg.movie_id
-                JOIN genres g ON mg.genre_id = g.id
-                WHERE g.name ILIKE %s
-                ORDER BY a.name
-                LIMIT %s OFFSET %s
-            """
-            actors = db.execute_query(query, (genre, limit, offset))
-        else:
-            query = """
-                SELECT id, name, bio, birth_year, image_url, created_at
-                FROM actors
-                ORDER BY name
-                LIMIT %s OFFSET %s
-            """
-            actors = db.execute_query(query, (limit, offset))
+            # Resolve matching genres once, then filter by id set
+            genre_ids = db.resolve_ids({"genres": genre})["genres"]
+            conditions.append("""EXISTS (
+                SELECT 1 FROM movie_actors ma
+                JOIN movie_genres mg ON ma.movie_id = mg.movie_id
+                WHERE ma.actor_id = a.id AND mg.genre_id = ANY(%s)
+            )""")
+            params.append(genre_ids)
         
-        logger.info(f"Retrieved {len(actors)} actors")
-        return {"actors": actors, "count": len(actors)}
+        if after:
+            conditions.append("(a.name, a.id) > (%s, %s)")
+            params.extend([after.get("name"), after.get("id")])
+
+        query = """
+            SELECT a.id, a.name, a.bio, a.birth_year, a.image_url, a.created_at
+            FROM actors a
+        """
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY a.name, a.id LIMIT %s"
+        # Fetch one extra row to know whether another page exists
+        params.append(limit + 1)
+        if not after and offset:
+            query += " OFFSET %s"
+            params.append(offset)
+        actors = db.execute_query(query, tuple(params))
         
+        has_more = len(actors) > limit
+        actors = actors[:limit]
+        next_cursor = None
+        if has_more:
+            next_cursor = encode_cursor({"name": actors[-1]["name"], "id": actors[-1]["id"]})
+
+        logger.info("Retrieved %s actors", len(actors))
+        return FastJSONResponse(
+            {"actors": actors, "count": len(actors), "has_more": has_more, "next_cursor": next_cursor}
+        )
+
+    except HTTPException:
+        raise
     except psycopg2.Error as e:
-        logger.error(f"Database error in get_actors: {str(e)}")
+        logger.error("Database error in get_actors: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in get_actors: {str(e)}")
+        logger.error("Unexpected error in get_actors: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+def actor_validators(actor_id: int) -> Optional[Validators]:
+    """
+    ETag of an actor with their filmography, or None if the actor doesn't exist
+
+    No Last-Modified: a credit leaving the filmography leaves no newer updated_at behind.
+    """
+    row = db.execute_query(ACTOR_VERSION_QUERY, (actor_id,), fetch_one=True, name="actor_version")
+    if row is None:
+        return None
+    return make_validators("actor", (row["row_version"], row["credits"]), None)
+
+
+def load_actor(actor_id: int) -> Optional[Tuple[Dict[str, Any], Validators]]:
+    """Actor details with the movies they've appeared in and their ETag, or None if the actor doesn't exist"""
+    actor_query = """
+        SELECT id, name, bio, birth_year, image_url, created_at, xmin::text as row_version
+        FROM actors
+        WHERE id = %s
+    """
+    actor = db.execute_query(actor_query, (actor_id,), fetch_one=True, name="actor_detail")
+    if not actor:
+        return None
+
+    movies_query = """
+        SELECT m.id, m.title, d.name as director, m.release_year,
+               g.name as genre, m.rating, m.review_count, m.avg_review_rating, m.description, m.language,
+               m.image_url, ma.role, concat_ws('.', ma.xmin, m.xmin, d.xmin, g.xmin) as row_version
+        FROM movies m
+        JOIN directors d ON m.director_id = d.id
+        JOIN genres g ON m.genre_id = g.id
+        JOIN movie_actors ma ON m.id = ma.movie_id
+        WHERE ma.actor_id = %s
+        ORDER BY m.release_year DESC
+    """
+    movies = db.execute_query(movies_query, (actor_id,), name="actor_movies")
+    validators = make_validators("actor", pop_row_versions(actor, movies), None)
+    return {
+        **actor,
+        "movies": movies,
+        "movie_count": len(movies)
+    }, validators
+
+
+def actor_detail(actor_id: int) -> Optional[Dict[str, Any]]:
+    """Actor details with the movies they've appeared in, or None if the actor doesn't exist"""
+    loaded = load_actor(actor_id)
+    return loaded[0] if loaded else None
+
+
 @router.get("/{actor_id}", response_model=dict)
-def get_actor(actor_id: int):
+def get_actor(actor_id: int, request: Request, response: Response):
     """
     Get a single actor by ID with their filmography
     
-    Returns actor details along with all movies they've appeared in
+    Returns actor details along with all movies they've appeared in.
+    Answers If-None-Match with 304 when nothing changed.
     """
     try:
-        logger.info(f"Fetching actor with id={actor_id}")
+        logger.info("Fetching actor with id=%s", actor_id)
         
-        # Get actor details
-        actor_query = """
-            SELECT id, name, bio, birth_year, image_url, created_at
-            FROM actors
-            WHERE id = %s
-        """
-        actor = db.execute_query(actor_query, (actor_id,), fetch_one=True)
+        if is_conditional(request):
+            validators = actor_validators(actor_id)
+            if validators is not None and is_not_modified(request, validators):
+                logger.info("Actor not modified: id=%s", actor_id)
+                return not_modified(validators)
+
+        loaded = load_actor(actor_id)
         
-        if not actor:
-            logger.warning(f"Actor not found: id={actor_id}")
+        if not loaded:
+            logger.warning("Actor not found: id=%s", actor_id)
             raise HTTPException(status_code=404, detail="Actor not found")
+        actor, validators = loaded
         
-        # Get actor's movies
-        movies_query = """
-            SELECT m.id, m.title, d.name as director, m.release_year, 
-                   g.name as genre, m.rating, m.description, m.language, 
-                   m.image_url, ma.role
-            FROM movies m
-            JOIN directors d ON m.director_id = d.id
-            JOIN genres g ON m.genre_id = g.id
-            JOIN movie_actors ma ON m.id = ma.movie_id
-            WHERE ma.actor_id = %s
-            ORDER BY m.release_year DESC
-        """
-        movies = db.execute_query(movies_query, (actor_id,))
+        logger.info("Retrieved actor: %s with %s movies", actor['name'], actor['movie_count'])
+        response.headers.update(validators.headers())
+        return actor
+
+    except HTTPException:
+        raise
+    except psycopg2.Error as e:
+        logger.error("Database error in get_actor: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
+    except Exception as e:
+        logger.error("Unexpected error in get_actor: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{actor_id}/path/{other_actor_id}", response_model=dict)
+def get_actor_path(actor_id: int, other_actor_id: int, max_degrees: int = Query(6, ge=1, le=12)):
+    """
+    Get the shortest co-star chain between two actors (degrees of separation)
+
+    Each step names the actor reached and the movie shared with the previous one.
+    degrees is null when the actors are not connected within max_degrees.
+
+    Query Parameters:
+    - max_degrees: Longest chain to search for
+    """
+    try:
+        logger.info("Finding co-star path from actor %s to %s", actor_id, other_actor_id)
+        require_actor_graph()
+
+        path = actor_graph.shortest_path(actor_id, other_actor_id, max_degrees)
+        if path is None:
+            require_actor(actor_id)
+            require_actor(other_actor_id)
+            return {"from_actor_id": actor_id, "to_actor_id": other_actor_id, "degrees": None, "path": []}
+
+        actor_rows = db.execute_query(ACTOR_NAMES_QUERY, ([a for a, _ in path],), name="actor_names")
+        movie_rows = db.execute_query(MOVIE_TITLES_QUERY, ([m for _, m in path if m],), name="movie_titles")
+        actor_names = {row["id"]: row["name"] for row in actor_rows}
+        movie_titles = {row["id"]: row["title"] for row in movie_rows}
+        steps = [
+            {
+                "actor": {"id": step_actor, "name": actor_names.get(step_actor)},
+                "movie": {"id": step_movie, "title": movie_titles.get(step_movie)} if step_movie else None
+            }
+            for step_actor, step_movie in path
+        ]
+
+        logger.info("Actors %s and %s are %s degrees apart", actor_id, other_actor_id, len(path) - 1)
+        return {"from_actor_id": actor_id, "to_actor_id": other_actor_id, "degrees": len(path) - 1, "path": steps}
+
+    except HTTPException:
+        raise
+    except psycopg2.Error as e:
+        logger.error("Database error in get_actor_path: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
+    except Exception as e:
+        logger.error("Unexpected error in get_actor_path: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{actor_id}/collaborators", response_model=dict)
+def get_actor_collaborators(actor_id: int, limit: int = Query(10, ge=1, le=100)):
+    """
+    Get an actor's most frequent co-stars
+
+    Query Parameters:
+    - limit: Number of collaborators to return
+    """
+    try:
+        logger.info("Fetching collaborators for actor %s", actor_id)
+        require_actor_graph()
+
+        collaborators = actor_graph.collaborators(actor_id, limit)
+        if collaborators is None:
+            require_actor(actor_id)
+            collaborators = []
+
+        names = {}
+        if collaborators:
+            rows = db.execute_query(ACTOR_NAMES_QUERY, ([a for a, _ in collaborators],), name="actor_names")
+            names = {row["id"]: row["name"] for row in rows}
+        result = [
+            {"id": costar, "name": names.get(costar), "shared_movies": shared}
+            for costar, shared in collaborators
+        ]
+
+        logger.info("Found %s collaborators for actor %s", len(result), actor_id)
+        return {"actor_id": actor_id, "collaborators": result, "count": len(result)}
+
+    except HTTPException:
+        raise
+    except psycopg2.Error as e:
+        logger.error("Database error in get_actor_collaborators: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
+    except Exception as e:
+        logger.error("Unexpected error in get_actor_collaborators: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{actor_id}/network", response_model=dict)
+def get_actor_network(actor_id: int, hops: int = Query(2, ge=1, le=6)):
+    """
+    Get the size of an actor's co-star neighbourhood
+
+    Counts the actors first reached at each hop (1 = co-stars, 2 = their co-stars, ...).
+
+    Query Parameters:
+    - hops: Number of hops to expand
+    """
+    try:
+        logger.info("Fetching %s-hop network for actor %s", hops, actor_id)
+        require_actor_graph()
+
+        counts = actor_graph.neighbourhood(actor_id, hops)
+        if counts is None:
+            require_actor(actor_id)
+            counts = [0] * hops
         
-        logger.info(f"Retrieved actor: {actor['name']} with {len(movies)} movies")
         return {
-            **actor,
-            "movies": movies,
-            "movie_count": len(movies)
+            "actor_id": actor_id,
+            "hops": [{"hop": hop, "actors": count} for hop, count in enumerate(counts, start=1)],
+            "total": sum(counts)
         }
         
     except HTTPException:
         raise
     except psycopg2.Error as e:
-        logger.error(f"Database error in get_actor: {str(e)}")
+        logger.error("Database error in get_actor_network: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in get_actor: {str(e)}")
+        logger.error("Unexpected error in get_actor_network: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -116,7 +350,7 @@ def get_actor(actor_id: int):
 def create_actor(actor: ActorCreate):
     """Create a new actor"""
     try:
-        logger.info(f"Creating actor: {actor.name}")
+        logger.info("Creating actor: %s", actor.name)
         
         query = """
             INSERT INTO actors (name, bio, birth_year)
@@ -130,18 +364,23 @@ def create_actor(actor: ActorCreate):
         ))
         
         actor_id = result['id']
-        logger.info(f"Actor created successfully: id={actor_id}")
+        response_cache.invalidate(f"actor:{actor_id}")
+        autocomplete_index.mark_changed("actor", actor_id)
+
+        logger.info("Actor created successfully: id=%s", actor_id)
         
-        return get_actor(actor_id)
+        return actor_detail(actor_id)
         
     except psycopg2.IntegrityError as e:
-        logger.error(f"Integrity error in create_actor: {str(e)}")
+        logger.error("Integrity error in create_actor: %s", e)
         raise HTTPException(status_code=400, detail="Invalid data provided")
     except psycopg2.Error as e:
-        logger.error(f"Database error in create_actor: {str(e)}")
+        logger.error("Database error in create_actor: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in create_actor: {str(e)}")
+        logger.error("Unexpected error in create_actor: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -149,7 +388,7 @@ def create_actor(actor: ActorCreate):
 def update_actor(actor_id: int, actor: ActorUpdate):
     """Update an existing actor"""
     try:
-        logger.info(f"Updating actor: id={actor_id}")
+        logger.info("Updating actor: id=%s", actor_id)
         
         # Check if actor exists
         existing = db.execute_query(
@@ -158,7 +397,7 @@ def update_actor(actor_id: int, actor: ActorUpdate):
             fetch_one=True
         )
         if not existing:
-            logger.warning(f"Actor not found for update: id={actor_id}")
+            logger.warning("Actor not found for update: id=%s", actor_id)
             raise HTTPException(status_code=404, detail="Actor not found")
         
         # Build dynamic update
@@ -178,8 +417,8 @@ def update_actor(actor_id: int, actor: ActorUpdate):
             values.append(actor.birth_year)
         
         if not update_fields:
-            logger.info(f"No fields to update for actor: id={actor_id}")
-            return get_actor(actor_id)
+            logger.info("No fields to update for actor: id=%s", actor_id)
+            return actor_detail(actor_id)
         
         values.append(actor_id)
         query = f"""
@@ -190,16 +429,21 @@ def update_actor(actor_id: int, actor: ActorUpdate):
         """
         db.execute_update(query, tuple(values))
         
-        logger.info(f"Actor updated successfully: id={actor_id}")
-        return get_actor(actor_id)
+        response_cache.invalidate(f"actor:{actor_id}")
+        autocomplete_index.mark_changed("actor", actor_id)
+
+        logger.info("Actor updated successfully: id=%s", actor_id)
+        return actor_detail(actor_id)
         
     except HTTPException:
         raise
     except psycopg2.Error as e:
-        logger.error(f"Database error in update_actor: {str(e)}")
+        logger.error("Database error in update_actor: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in update_actor: {str(e)}")
+        logger.error("Unexpected error in update_actor: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -207,25 +451,32 @@ def update_actor(actor_id: int, actor: ActorUpdate):
 def delete_actor(actor_id: int):
     """Delete an actor"""
     try:
-        logger.info(f"Deleting actor: id={actor_id}")
+        logger.info("Deleting actor: id=%s", actor_id)
         
         query = "DELETE FROM actors WHERE id = %s"
         deleted = db.execute_delete(query, (actor_id,))
         
         if not deleted:
-            logger.warning(f"Actor not found for deletion: id={actor_id}")
+            logger.warning("Actor not found for deletion: id=%s", actor_id)
             raise HTTPException(status_code=404, detail="Actor not found")
         
-        logger.info(f"Actor deleted successfully: id={actor_id}")
+        response_cache.invalidate(f"actor:{actor_id}")
+        similar_index.mark_actor_removed(actor_id)
+        actor_graph.mark_actor_removed(actor_id)
+        autocomplete_index.mark_changed("actor", actor_id)
+
+        logger.info("Actor deleted successfully: id=%s", actor_id)
         return {"message": "Actor deleted successfully"}
         
     except HTTPException:
         raise
     except psycopg2.Error as e:
-        logger.error(f"Database error in delete_actor: {str(e)}")
+        logger.error("Database error in delete_actor: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in delete_actor: {str(e)}")
+        logger.error("Unexpected error in delete_actor: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -237,33 +488,42 @@ def add_actor_to_movie(actor_id: int, movie_id: int, role: Optional[str] = None)
     Creates a relationship between an actor and a movie with an optional role/character name
     """
     try:
-        logger.info(f"Adding actor {actor_id} to movie {movie_id}")
+        logger.info("Adding actor %s to movie %s", actor_id, movie_id)
         
-        # Check if actor and movie exist
-        actor = db.execute_query("SELECT id FROM actors WHERE id = %s", (actor_id,), fetch_one=True)
-        movie = db.execute_query("SELECT id FROM movies WHERE id = %s", (movie_id,), fetch_one=True)
-        
-        if not actor:
-            raise HTTPException(status_code=404, detail="Actor not found")
-        if not movie:
-            raise HTTPException(status_code=404, detail="Movie not found")
+        # One connection and one commit for the checks and the insert
+        with db.transaction():
+            # Check if actor and movie exist
+            actor = db.execute_query("SELECT id FROM actors WHERE id = %s", (actor_id,), fetch_one=True)
+            movie = db.execute_query("SELECT id FROM movies WHERE id = %s", (movie_id,), fetch_one=True)
+
+            if not actor:
+                raise HTTPException(status_code=404, detail="Actor not found")
+            if not movie:
+                raise HTTPException(status_code=404, detail="Movie not found")
+
+            query = """
+                INSERT INTO movie_actors (movie_id, actor_id, role)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (movie_id, actor_id) DO UPDATE SET role = EXCLUDED.role
+                RETURNING id
+            """
+            result = db.execute_insert(query, (movie_id, actor_id, role))
         
-        query = """
-            INSERT INTO movie_actors (movie_id, actor_id, role)
-            VALUES (%s, %s, %s)
-            ON CONFLICT (movie_id, actor_id) DO UPDATE SET role = EXCLUDED.role
-            RETURNING id
-        """
-        result = db.execute_insert(query, (movie_id, actor_id, role))
+        response_cache.invalidate(f"movie:{movie_id}", f"actor:{actor_id}")
+        similar_index.mark_changed(movie_id)
+        actor_graph.mark_changed(movie_id)
+        autocomplete_index.mark_changed("actor", actor_id)
         
-        logger.info(f"Actor added to movie successfully")
+        logger.info("Actor added to movie successfully")
         return {"message": "Actor added to movie successfully", "id": result['id']}
         
     except HTTPException:
         raise
     except psycopg2.Error as e:
-        logger.error(f"Database error in add_actor_to_movie: {str(e)}")
+        logger.error("Database error in add_actor_to_movie: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in add_actor_to_movie: {str(e)}")
+        logger.error("Unexpected error in add_actor_to_movie: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1 @@
+# Async routes package (asyncio counterparts of app.routes for benchmarking)
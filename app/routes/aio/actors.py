@@ -0,0 +1,250 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from app.models import ActorCreate, ActorUpdate
+from app.async_database import async_db
+from app.utils.logger import logger
+from app.utils.cache import response_cache
+from app.services.similar import similar_index
+from app.services.actor_graph import actor_graph
+from app.services.autocomplete import autocomplete_index
+import psycopg
+
+router = APIRouter(prefix="/api/async/actors", tags=["actors (async)"])
+
+
+@router.get("", response_model=dict)
+async def get_actors(
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    genre: Optional[str] = None
+):
+    """Get all actors with optional genre filter (async)"""
+    try:
+        logger.info("Fetching actors (async): limit=%s, offset=%s, genre=%s", limit, offset, genre)
+
+        if genre:
+            query = """
+                SELECT DISTINCT a.id, a.name, a.bio, a.birth_year, a.image_url, a.created_at
+                FROM actors a
+                JOIN movie_actors ma ON a.id = ma.actor_id
+                JOIN movies m ON ma.movie_id = m.id
+                JOIN movie_genres mg ON m.id = mg.movie_id
+                JOIN genres g ON mg.genre_id = g.id
+                WHERE g.name ILIKE %s
+                ORDER BY a.name
+                LIMIT %s OFFSET %s
+            """
+            actors = await async_db.execute_query(query, (genre, limit, offset))
+        else:
+            query = """
+                SELECT id, name, bio, birth_year, image_url, created_at
+                FROM actors
+                ORDER BY name
+                LIMIT %s OFFSET %s
+            """
+            actors = await async_db.execute_query(query, (limit, offset))
+
+        return {"actors": actors, "count": len(actors)}
+
+    except psycopg.Error as e:
+        logger.error("Database error in async get_actors: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async get_actors: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{actor_id}", response_model=dict)
+async def get_actor(actor_id: int):
+    """Get a single actor by ID with their filmography (async)"""
+    try:
+        logger.info("Fetching actor with id=%s (async)", actor_id)
+
+        actor_query = """
+            SELECT id, name, bio, birth_year, image_url, created_at
+            FROM actors
+            WHERE id = %s
+        """
+        actor = await async_db.execute_query(actor_query, (actor_id,), fetch_one=True)
+
+        if not actor:
+            logger.warning("Actor not found: id=%s", actor_id)
+            raise HTTPException(status_code=404, detail="Actor not found")
+
+        movies_query = """
+            SELECT m.id, m.title, d.name as director, m.release_year,
+                   g.name as genre, m.rating, m.review_count, m.avg_review_rating, m.description, m.language,
+                   m.image_url, ma.role
+            FROM movies m
+            JOIN directors d ON m.director_id = d.id
+            JOIN genres g ON m.genre_id = g.id
+            JOIN movie_actors ma ON m.id = ma.movie_id
+            WHERE ma.actor_id = %s
+            ORDER BY m.release_year DESC
+        """
+        movies = await async_db.execute_query(movies_query, (actor_id,))
+
+        return {
+            **actor,
+            "movies": movies,
+            "movie_count": len(movies)
+        }
+
+    except HTTPException:
+        raise
+    except psycopg.Error as e:
+        logger.error("Database error in async get_actor: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async get_actor: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("", response_model=dict, status_code=201)
+async def create_actor(actor: ActorCreate):
+    """Create a new actor (async)"""
+    try:
+        logger.info("Creating actor (async): %s", actor.name)
+
+        query = """
+            INSERT INTO actors (name, bio, birth_year)
+            VALUES (%s, %s, %s)
+            RETURNING id
+        """
+        result = await async_db.execute_insert(query, (
+            actor.name,
+            actor.bio,
+            actor.birth_year
+        ))
+
+        response_cache.invalidate(f"actor:{result['id']}")
+        autocomplete_index.mark_changed("actor", result['id'])
+
+        return await get_actor(result['id'])
+
+    except HTTPException:
+        raise
+    except psycopg.IntegrityError as e:
+        logger.error("Integrity error in async create_actor: %s", e)
+        raise HTTPException(status_code=400, detail="Invalid data provided")
+    except psycopg.Error as e:
+        logger.error("Database error in async create_actor: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async create_actor: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.put("/{actor_id}", response_model=dict)
+async def update_actor(actor_id: int, actor: ActorUpdate):
+    """Update an existing actor (async)"""
+    try:
+        logger.info("Updating actor (async): id=%s", actor_id)
+
+        existing = await async_db.execute_query(
+            "SELECT id FROM actors WHERE id = %s",
+            (actor_id,),
+            fetch_one=True
+        )
+        if not existing:
+            logger.warning("Actor not found for update: id=%s", actor_id)
+            raise HTTPException(status_code=404, detail="Actor not found")
+
+        update_fields = []
+        values = []
+        for field in ("name", "bio", "birth_year"):
+            value = getattr(actor, field)
+            if value is not None:
+                update_fields.append(f"{field} = %s")
+                values.append(value)
+
+        if update_fields:
+            values.append(actor_id)
+            query = f"""
+                UPDATE actors
+                SET {', '.join(update_fields)}
+                WHERE id = %s
+                RETURNING id
+            """
+            await async_db.execute_update(query, tuple(values))
+            response_cache.invalidate(f"actor:{actor_id}")
+            autocomplete_index.mark_changed("actor", actor_id)
+
+        return await get_actor(actor_id)
+
+    except HTTPException:
+        raise
+    except psycopg.Error as e:
+        logger.error("Database error in async update_actor: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async update_actor: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.delete("/{actor_id}", response_model=dict)
+async def delete_actor(actor_id: int):
+    """Delete an actor (async)"""
+    try:
+        logger.info("Deleting actor (async): id=%s", actor_id)
+
+        deleted = await async_db.execute_delete("DELETE FROM actors WHERE id = %s", (actor_id,))
+
+        if not deleted:
+            logger.warning("Actor not found for deletion: id=%s", actor_id)
+            raise HTTPException(status_code=404, detail="Actor not found")
+
+        response_cache.invalidate(f"actor:{actor_id}")
+        similar_index.mark_actor_removed(actor_id)
+        actor_graph.mark_actor_removed(actor_id)
+        autocomplete_index.mark_changed("actor", actor_id)
+
+        return {"message": "Actor deleted successfully"}
+
+    except HTTPException:
+        raise
+    except psycopg.Error as e:
+        logger.error("Database error in async delete_actor: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async delete_actor: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/{actor_id}/movies/{movie_id}", response_model=dict, status_code=201)
+async def add_actor_to_movie(actor_id: int, movie_id: int, role: Optional[str] = None):
+    """Add an actor to a movie (async)"""
+    try:
+        logger.info("Adding actor %s to movie %s (async)", actor_id, movie_id)
+
+        actor = await async_db.execute_query("SELECT id FROM actors WHERE id = %s", (actor_id,), fetch_one=True)
+        movie = await async_db.execute_query("SELECT id FROM movies WHERE id = %s", (movie_id,), fetch_one=True)
+
+        if not actor:
+            raise HTTPException(status_code=404, detail="Actor not found")
+        if not movie:
+            raise HTTPException(status_code=404, detail="Movie not found")
+
+        query = """
+            INSERT INTO movie_actors (movie_id, actor_id, role)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (movie_id, actor_id) DO UPDATE SET role = EXCLUDED.role
+            RETURNING id
+        """
+        result = await async_db.execute_insert(query, (movie_id, actor_id, role))
+
+        response_cache.invalidate(f"movie:{movie_id}", f"actor:{actor_id}")
+        similar_index.mark_changed(movie_id)
+        actor_graph.mark_changed(movie_id)
+        autocomplete_index.mark_changed("actor", actor_id)
+
+        return {"message": "Actor added to movie successfully", "id": result['id']}
+
+    except HTTPException:
+        raise
+    except psycopg.Error as e:
+        logger.error("Database error in async add_actor_to_movie: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async add_actor_to_movie: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, HTTPException
+from app.async_database import async_db
+from app.utils.logger import logger
+import psycopg
+
+router = APIRouter(prefix="/api/async/directors", tags=["directors (async)"])
+
+
+@router.get("", response_model=dict)
+async def get_directors():
+    """Get all directors (async)"""
+    try:
+        query = """
+            SELECT id, name, bio, birth_year, image_url, created_at
+            FROM directors
+            ORDER BY name
+        """
+        directors = await async_db.execute_query(query)
+
+        return {"directors": directors, "count": len(directors)}
+
+    except psycopg.Error as e:
+        logger.error("Database error in async get_directors: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async get_directors: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{director_id}", response_model=dict)
+async def get_director(director_id: int):
+    """Get a single director by ID with their filmography (async)"""
+    try:
+        director_query = """
+            SELECT id, name, bio, birth_year, image_url, created_at
+            FROM directors
+            WHERE id = %s
+        """
+        director = await async_db.execute_query(director_query, (director_id,), fetch_one=True)
+
+        if not director:
+            logger.warning("Director not found: id=%s", director_id)
+            raise HTTPException(status_code=404, detail="Director not found")
+
+        movies_query = """
+            SELECT m.id, m.title, g.name as genre, m.release_year,
+                   m.rating, m.review_count, m.avg_review_rating, m.description, m.language, m.image_url
+            FROM movies m
+            JOIN genres g ON m.genre_id = g.id
+            WHERE m.director_id = %s
+            ORDER BY m.release_year DESC
+        """
+        movies = await async_db.execute_query(movies_query, (director_id,))
+
+        return {
+            **director,
+            "movies": movies,
+            "movie_count": len(movies)
+        }
+
+    except HTTPException:
+        raise
+    except psycopg.Error as e:
+        logger.error("Database error in async get_director: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async get_director: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, HTTPException
+from app.async_database import async_db
+from app.utils.logger import logger
+import psycopg
+
+router = APIRouter(prefix="/api/async/genres", tags=["genres (async)"])
+
+
+@router.get("", response_model=dict)
+async def get_genres():
+    """Get all genres (async)"""
+    try:
+        query = """
+            SELECT id, name, description, created_at
+            FROM genres
+            ORDER BY name
+        """
+        genres = await async_db.execute_query(query)
+
+        return {"genres": genres, "count": len(genres)}
+
+    except psycopg.Error as e:
+        logger.error("Database error in async get_genres: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async get_genres: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
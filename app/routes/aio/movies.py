@@ -0,0 +1,334 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from app.models import MovieCreate, MovieUpdate
+from app.async_database import async_db
+from app.routes.movies import (
+    movie_filter_lookups, genre_rows_query, group_genre_rows, search_query, genre_page_query, genre_count_query,
+    keyset_page, cast_members, movie_detail_params, with_reviews_cursor,
+    SEARCH_CURSOR_KEYS, GENRE_PAGE_CURSOR_KEYS, MOVIE_DETAIL_QUERY, CAST_RESOLVE_ACTORS_QUERY, CAST_SYNC_QUERY
+)
+from app.utils.logger import logger
+from app.utils.pagination import decode_cursor
+from app.utils.cache import response_cache
+from app.services.home_rows import home_rows
+from app.services.similar import similar_index
+from app.services.actor_graph import actor_graph
+from app.services.autocomplete import autocomplete_index
+import psycopg
+
+router = APIRouter(prefix="/api/async/movies", tags=["movies (async)"])
+
+
+async def _sync_cast(movie_id: int, cast: list):
+    """Make a movie's cast match the given list in two statements"""
+    members = cast_members(cast)
+    actor_ids = []
+    roles = []
+    if members:
+        resolved = await async_db.execute_query(CAST_RESOLVE_ACTORS_QUERY, (list(members),))
+        ids_by_name = {row['name']: row['id'] for row in resolved}
+        actor_ids = [ids_by_name[name] for name in members]
+        roles = list(members.values())
+    await async_db.execute_query(CAST_SYNC_QUERY, (actor_ids, roles, movie_id, actor_ids, movie_id), fetch_one=True)
+
+
+@router.get("", response_model=dict)
+async def get_movies(
+    limit_per_genre: int = Query(10, ge=1, le=50, description="Movies per genre"),
+    genre: Optional[str] = None,
+    director: Optional[str] = None,
+    actor: Optional[str] = None,
+    year: Optional[int] = None,
+    sort: str = Query("rating", pattern="^(rating|most_reviewed|best_reviewed)$"),
+    min_reviews: Optional[int] = Query(None, ge=1),
+    min_review_rating: Optional[float] = Query(None, ge=0, le=10)
+):
+    """Get movies grouped by genres (async)"""
+    try:
+        logger.info(
+            "Fetching movies grouped by genre (async): limit_per_genre=%s, genre=%s, director=%s, actor=%s, "
+            "year=%s, sort=%s",
+            limit_per_genre, genre, director, actor, year, sort
+        )
+
+        resolved_ids = await async_db.resolve_ids(movie_filter_lookups(genre, director, actor))
+        query, params = genre_rows_query(resolved_ids, year, min_reviews, min_review_rating, sort, limit_per_genre)
+        result = group_genre_rows(await async_db.execute_query(query, params))
+
+        logger.info("Retrieved %s genres with movies", len(result))
+        return {"categories": result, "total_categories": len(result)}
+
+    except psycopg.Error as e:
+        logger.error("Database error in async get_movies: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async get_movies: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{movie_id}", response_model=dict)
+async def get_movie(movie_id: int):
+    """Get a single movie by ID with cast and reviews (async)"""
+    try:
+        logger.info("Fetching movie with id=%s (async)", movie_id)
+
+        movie = with_reviews_cursor(
+            await async_db.execute_query(MOVIE_DETAIL_QUERY, movie_detail_params(movie_id), fetch_one=True)
+        )
+
+        if not movie:
+            logger.warning("Movie not found: id=%s", movie_id)
+            raise HTTPException(status_code=404, detail="Movie not found")
+
+        return movie
+
+    except HTTPException:
+        raise
+    except psycopg.Error as e:
+        logger.error("Database error in async get_movie: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async get_movie: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("", response_model=dict, status_code=201)
+async def create_movie(movie: MovieCreate):
+    """Create a new movie (async)"""
+    try:
+        logger.info("Creating movie (async): %s", movie.title)
+
+        # One connection and one commit for the whole write
+        async with async_db.transaction():
+            director_id = await async_db.get_or_create("directors", "name", movie.director_name)
+            genre_id = await async_db.get_or_create("genres", "name", movie.genre_name)
+
+            query = """
+                INSERT INTO movies (
+                    title, director_id, genre_id, release_year, rating, description, language, image_url
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id
+            """
+            result = await async_db.execute_insert(query, (
+                movie.title,
+                director_id,
+                genre_id,
+                movie.release_year,
+                movie.rating,
+                movie.description,
+                movie.language or 'English',
+                movie.image_url
+            ))
+
+            movie_id = result['id']
+
+            if movie.cast:
+                await _sync_cast(movie_id, movie.cast)
+
+            # Read back on the same connection, before the commit
+            created = with_reviews_cursor(
+                await async_db.execute_query(MOVIE_DETAIL_QUERY, movie_detail_params(movie_id), fetch_one=True)
+            )
+
+        logger.info("Movie created successfully: id=%s", movie_id)
+        response_cache.invalidate("catalog", f"genre:{genre_id}", "genres", "directors")
+        home_rows.mark_dirty()
+        similar_index.mark_changed(movie_id)
+        actor_graph.mark_changed(movie_id)
+        autocomplete_index.mark_changed("movie", movie_id)
+
+        return created
+
+    except HTTPException:
+        raise
+    except psycopg.IntegrityError as e:
+        logger.error("Integrity error in async create_movie: %s", e)
+        raise HTTPException(status_code=400, detail="Invalid data provided")
+    except psycopg.Error as e:
+        logger.error("Database error in async create_movie: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async create_movie: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.put("/{movie_id}", response_model=dict)
+async def update_movie(movie_id: int, movie: MovieUpdate):
+    """Update an existing movie (async)"""
+    try:
+        logger.info("Updating movie (async): id=%s", movie_id)
+
+        # One connection and one commit for the whole write
+        async with async_db.transaction():
+            existing = await async_db.execute_query(
+                "SELECT id FROM movies WHERE id = %s",
+                (movie_id,),
+                fetch_one=True
+            )
+            if not existing:
+                logger.warning("Movie not found for update: id=%s", movie_id)
+                raise HTTPException(status_code=404, detail="Movie not found")
+
+            update_fields = []
+            values = []
+
+            if movie.title is not None:
+                update_fields.append("title = %s")
+                values.append(movie.title)
+
+            if movie.director_name is not None:
+                director_id = await async_db.get_or_create("directors", "name", movie.director_name)
+                update_fields.append("director_id = %s")
+                values.append(director_id)
+
+            if movie.genre_name is not None:
+                genre_id = await async_db.get_or_create("genres", "name", movie.genre_name)
+                update_fields.append("genre_id = %s")
+                values.append(genre_id)
+
+            for field in ("release_year", "rating", "description", "language", "image_url"):
+                value = getattr(movie, field)
+                if value is not None:
+                    update_fields.append(f"{field} = %s")
+                    values.append(value)
+
+            if update_fields:
+                values.append(movie_id)
+                query = f"""
+                    UPDATE movies
+                    SET {', '.join(update_fields)}
+                    WHERE id = %s
+                    RETURNING id
+                """
+                await async_db.execute_update(query, tuple(values))
+
+            if movie.cast is not None:
+                await _sync_cast(movie_id, movie.cast)
+
+            # Read back on the same connection, before the commit
+            updated = with_reviews_cursor(
+                await async_db.execute_query(MOVIE_DETAIL_QUERY, movie_detail_params(movie_id), fetch_one=True)
+            )
+
+        invalidated_tags = [f"movie:{movie_id}", "catalog"]
+        if movie.director_name is not None:
+            invalidated_tags.append("directors")
+        if movie.genre_name is not None:
+            invalidated_tags.append("genres")
+        response_cache.invalidate(*invalidated_tags)
+        home_rows.mark_dirty()
+        if movie.director_name is not None or movie.genre_name is not None or movie.cast is not None:
+            similar_index.mark_changed(movie_id)
+        if movie.cast is not None:
+            actor_graph.mark_changed(movie_id)
+        autocomplete_index.mark_changed("movie", movie_id)
+
+        logger.info("Movie updated successfully: id=%s", movie_id)
+        return updated
+
+    except HTTPException:
+        raise
+    except psycopg.Error as e:
+        logger.error("Database error in async update_movie: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async update_movie: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.delete("/{movie_id}", response_model=dict)
+async def delete_movie(movie_id: int):
+    """Delete a movie (async)"""
+    try:
+        logger.info("Deleting movie (async): id=%s", movie_id)
+
+        deleted = await async_db.execute_delete("DELETE FROM movies WHERE id = %s", (movie_id,))
+
+        if not deleted:
+            logger.warning("Movie not found for deletion: id=%s", movie_id)
+            raise HTTPException(status_code=404, detail="Movie not found")
+
+        response_cache.invalidate(f"movie:{movie_id}", "catalog")
+        home_rows.mark_dirty()
+        similar_index.mark_changed(movie_id)
+        actor_graph.mark_changed(movie_id)
+        autocomplete_index.mark_changed("movie", movie_id)
+
+        return {"message": "Movie deleted successfully"}
+
+    except HTTPException:
+        raise
+    except psycopg.Error as e:
+        logger.error("Database error in async delete_movie: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async delete_movie: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/search/{search_term}", response_model=dict)
+async def search_movies(
+    search_term: str,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    mode: str = Query("fulltext", pattern="^(fulltext|substring)$")
+):
+    """Search movies by title, director, or description (async)"""
+    try:
+        search_term = search_term.strip()
+        if not search_term:
+            raise HTTPException(status_code=400, detail="Search term cannot be empty")
+
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        query, params = search_query(search_term, mode, after, limit)
+        return keyset_page(await async_db.execute_query(query, params), limit, SEARCH_CURSOR_KEYS[mode])
+
+    except HTTPException:
+        raise
+    except psycopg.Error as e:
+        logger.error("Database error in async search_movies: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async search_movies: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/genre/{genre_name}", response_model=dict)
+async def get_movies_by_genre_paginated(
+    genre_name: str,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+    include_total: bool = False
+):
+    """Get paginated movies for a specific genre (async)"""
+    try:
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        genre_ids = (await async_db.resolve_ids({"genres": genre_name}))["genres"]
+        query, params = genre_page_query(genre_ids, after, offset, limit)
+        response = keyset_page(await async_db.execute_query(query, params), limit, GENRE_PAGE_CURSOR_KEYS)
+
+        if include_total:
+            count_query, count_params = genre_count_query(genre_ids)
+            count_result = await async_db.execute_query(count_query, count_params, fetch_one=True)
+            response["total"] = count_result['total'] if count_result else 0
+
+        return response
+
+    except HTTPException:
+        raise
+    except psycopg.Error as e:
+        logger.error("Database error in async get_movies_by_genre_paginated: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async get_movies_by_genre_paginated: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
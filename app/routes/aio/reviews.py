@@ -0,0 +1,101 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from app.models import ReviewCreate
+from app.async_database import async_db
+from app.utils.logger import logger
+from app.utils.cache import response_cache
+from app.utils.pagination import decode_cursor
+from app.routes.reviews import (
+    REVIEWS_FIRST_PAGE_QUERY, REVIEWS_AFTER_CURSOR_QUERY, REVIEW_HISTOGRAM_QUERY, review_cursor, rating_histogram
+)
+from app.services.review_aggregates import CREATE_REVIEW_QUERY, create_review_params
+from app.services.home_rows import home_rows
+import psycopg
+
+router = APIRouter(prefix="/api/async", tags=["reviews (async)"])
+
+
+@router.get("/movies/{movie_id}/reviews", response_model=dict)
+async def get_movie_reviews(
+    movie_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    histogram: bool = False
+):
+    """Get reviews for a movie, newest first, one page at a time (async)"""
+    try:
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        movie = await async_db.execute_query(
+            "SELECT review_count FROM movies WHERE id = %s",
+            (movie_id,),
+            fetch_one=True
+        )
+        if not movie:
+            raise HTTPException(status_code=404, detail="Movie not found")
+
+        if after:
+            reviews = await async_db.execute_query(
+                REVIEWS_AFTER_CURSOR_QUERY,
+                (movie_id, after.get("created_at"), after.get("id"), limit + 1)
+            )
+        else:
+            reviews = await async_db.execute_query(REVIEWS_FIRST_PAGE_QUERY, (movie_id, limit + 1))
+
+        has_more = len(reviews) > limit
+        reviews = reviews[:limit]
+
+        result = {
+            "reviews": reviews,
+            "count": len(reviews),
+            "total": movie["review_count"],
+            "has_more": has_more,
+            "next_cursor": review_cursor(reviews[-1]) if has_more else None
+        }
+        if histogram:
+            result["histogram"] = rating_histogram(await async_db.execute_query(REVIEW_HISTOGRAM_QUERY, (movie_id,)))
+
+        return result
+
+    except HTTPException:
+        raise
+    except psycopg.Error as e:
+        logger.error("Database error in async get_movie_reviews: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async get_movie_reviews: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/reviews", response_model=dict, status_code=201)
+async def create_review(review: ReviewCreate):
+    """Create a new review for a movie (async)"""
+    try:
+        logger.info("Creating review for movie (async): id=%s", review.movie_id)
+
+        new_review = await async_db.execute_insert(
+            CREATE_REVIEW_QUERY,
+            create_review_params(review.movie_id, review.reviewer_name, review.rating, review.comment)
+        )
+        if not new_review:
+            logger.warning("Movie not found for review: id=%s", review.movie_id)
+            raise HTTPException(status_code=404, detail="Movie not found")
+
+        # Review counts and averages show in the genre rows and decide their sort orders
+        genre_id = new_review.pop("genre_id")
+        response_cache.invalidate(f"movie:{review.movie_id}", f"genre:{genre_id}")
+        home_rows.mark_dirty()
+
+        return new_review
+
+    except HTTPException:
+        raise
+    except psycopg.Error as e:
+        logger.error("Database error in async create_review: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except Exception as e:
+        logger.error("Unexpected error in async create_review: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, HTTPException, Query
+from app.config import settings
+from app.database import PoolTimeout
+from app.services.autocomplete import KINDS, autocomplete_index
+from app.utils.logger import logger
+import psycopg2
+
+router = APIRouter(prefix="/api/autocomplete", tags=["autocomplete"])
+
+
+@router.get("", response_model=dict)
+def autocomplete(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    types: str = Query(",".join(KINDS), pattern="^(movie|actor|director)(,(movie|actor|director))*$")
+):
+    """
+    Typeahead suggestions for the search box
+
+    Matches names and titles starting with q, or with a word starting with q,
+    from an in-memory prefix index. Exact matches come first, then whole-name
+    prefixes, then word prefixes; ties go to the more popular entry.
+
+    Query Parameters:
+    - q: Text typed so far
+    - limit: Maximum number of suggestions
+    - types: Comma-separated subset of movie, actor, director
+    """
+    try:
+        if not settings.AUTOCOMPLETE_ENABLED:
+            raise HTTPException(status_code=503, detail="Autocomplete is disabled")
+
+        suggestions = autocomplete_index.suggest(q, limit, types.split(","))
+        return {"query": q, "suggestions": suggestions, "count": len(suggestions)}
+
+    except HTTPException:
+        raise
+    except psycopg2.Error as e:
+        logger.error("Database error in autocomplete: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
+    except Exception as e:
+        logger.error("Unexpected error in autocomplete: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
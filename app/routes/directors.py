@@ -1,11 +1,41 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
+from typing import Optional
 from app.models import DirectorResponse
-from app.database import db
+from app.database import db, PoolTimeout
 from app.utils.logger import logger
+from app.utils.cache import response_cache
+from app.utils.responses import FastJSONResponse
+from app.utils.conditional import (
+    Validators, is_conditional, is_not_modified, make_validators, not_modified, pop_row_versions
+)
 import psycopg2
 
 router = APIRouter(prefix="/api/directors", tags=["directors"])
 
+# Version of a director's filmography: the director row plus each movie and its genre.
+# get_director selects the same xmins as row_version, so a 200 carries its ETag without
+# running this
+DIRECTOR_VERSION_QUERY = """
+    SELECT d.xmin::text as row_version,
+           COALESCE(string_agg(concat_ws('.', m.xmin, g.xmin), ',' ORDER BY m.id), '') as credits
+    FROM directors d
+    LEFT JOIN (movies m JOIN genres g ON g.id = m.genre_id) ON m.director_id = d.id
+    WHERE d.id = %s
+    GROUP BY d.id
+"""
+
+
+def director_validators(director_id: int) -> Optional[Validators]:
+    """
+    ETag of a director with their filmography, or None if the director doesn't exist
+
+    No Last-Modified: a movie leaving the filmography leaves no newer updated_at behind.
+    """
+    row = db.execute_query(DIRECTOR_VERSION_QUERY, (director_id,), fetch_one=True, name="director_version")
+    if row is None:
+        return None
+    return make_validators("director", (row["row_version"], row["credits"]), None)
+
 
 @router.get("", response_model=dict)
 def get_directors():
@@ -18,53 +48,69 @@ def get_directors():
             FROM directors
             ORDER BY name
         """
-        directors = db.execute_query(query)
+        directors = response_cache.get_or_load(
+            "directors:list", lambda: db.execute_query(query, name="directors_list"), tags=["directors"]
+        )
         
-        logger.info(f"Retrieved {len(directors)} directors")
-        return {"directors": directors, "count": len(directors)}
+        logger.info("Retrieved %s directors", len(directors))
+        return FastJSONResponse({"directors": directors, "count": len(directors)})
         
     except psycopg2.Error as e:
-        logger.error(f"Database error in get_directors: {str(e)}")
+        logger.error("Database error in get_directors: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in get_directors: {str(e)}")
+        logger.error("Unexpected error in get_directors: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.get("/{director_id}", response_model=dict)
-def get_director(director_id: int):
+def get_director(director_id: int, request: Request, response: Response):
     """
     Get a single director by ID with their filmography
     
-    Returns director details along with all movies they've directed
+    Returns director details along with all movies they've directed.
+    Answers If-None-Match with 304 when nothing changed.
     """
     try:
-        logger.info(f"Fetching director with id={director_id}")
+        logger.info("Fetching director with id=%s", director_id)
+
+        if is_conditional(request):
+            validators = director_validators(director_id)
+            if validators is not None and is_not_modified(request, validators):
+                logger.info("Director not modified: id=%s", director_id)
+                return not_modified(validators)
         
         # Get director details
         director_query = """
-            SELECT id, name, bio, birth_year, image_url, created_at
+            SELECT id, name, bio, birth_year, image_url, created_at, xmin::text as row_version
             FROM directors
             WHERE id = %s
         """
-        director = db.execute_query(director_query, (director_id,), fetch_one=True)
+        director = db.execute_query(director_query, (director_id,), fetch_one=True, name="director_detail")
         
         if not director:
-            logger.warning(f"Director not found: id={director_id}")
+            logger.warning("Director not found: id=%s", director_id)
             raise HTTPException(status_code=404, detail="Director not found")
         
         # Get director's movies
         movies_query = """
             SELECT m.id, m.title, g.name as genre, m.release_year, 
-                   m.rating, m.description, m.language, m.image_url
+                   m.rating, m.review_count, m.avg_review_rating, m.description, m.language, m.image_url,
+                   concat_ws('.', m.xmin, g.xmin) as row_version
             FROM movies m
             JOIN genres g ON m.genre_id = g.id
             WHERE m.director_id = %s
             ORDER BY m.release_year DESC
         """
-        movies = db.execute_query(movies_query, (director_id,))
+        movies = db.execute_query(movies_query, (director_id,), name="director_movies")
         
-        logger.info(f"Retrieved director: {director['name']} with {len(movies)} movies")
+        # The ETag of exactly the rows being returned
+        validators = make_validators("director", pop_row_versions(director, movies), None)
+
+        logger.info("Retrieved director: %s with %s movies", director['name'], len(movies))
+        response.headers.update(validators.headers())
         return {
             **director,
             "movies": movies,
@@ -74,8 +120,10 @@ def get_director(director_id: int):
     except HTTPException:
         raise
     except psycopg2.Error as e:
-        logger.error(f"Database error in get_director: {str(e)}")
+        logger.error("Database error in get_director: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in get_director: {str(e)}")
+        logger.error("Unexpected error in get_director: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1,143 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Iterable, Iterator, List
+from datetime import date, datetime
+from decimal import Decimal
+from app.config import settings
+from app.database import db
+from app.utils.logger import logger
+import csv
+import io
+import json
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+MOVIES_EXPORT_QUERY = """
+    SELECT m.id, m.title, d.name as director, g.name as genre, m.release_year,
+           m.rating, m.description, m.language, m.image_url, m.created_at,
+           COALESCE((
+               SELECT json_agg(json_build_object('actor_id', a.id, 'name', a.name, 'role', ma.role) ORDER BY a.name)
+               FROM movie_actors ma
+               JOIN actors a ON a.id = ma.actor_id
+               WHERE ma.movie_id = m.id
+           ), '[]'::json) as "cast"
+    FROM movies m
+    LEFT JOIN directors d ON m.director_id = d.id
+    LEFT JOIN genres g ON m.genre_id = g.id
+    ORDER BY m.id
+"""
+MOVIES_EXPORT_COLUMNS = [
+    "id", "title", "director", "genre", "release_year", "rating",
+    "description", "language", "image_url", "created_at", "cast"
+]
+
+REVIEWS_EXPORT_QUERY = """
+    SELECT id, movie_id, reviewer_name, rating, comment, created_at
+    FROM reviews
+    ORDER BY id
+"""
+REVIEWS_EXPORT_COLUMNS = ["id", "movie_id", "reviewer_name", "rating", "comment", "created_at"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+
+def _json_default(value: Any) -> Any:
+    """JSON encoding for database types"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value: Any) -> Any:
+    """Flatten nested values for a CSV cell"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_json_default)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def ndjson_chunks(rows: Iterable[Dict], batch_size: int) -> Iterator[str]:
+    """Encode rows as NDJSON, one chunk per batch (the first row is sent on its own)"""
+    buffer = []
+    first = True
+    for row in rows:
+        buffer.append(json.dumps(row, default=_json_default))
+        if first or len(buffer) >= batch_size:
+            yield "\n".join(buffer) + "\n"
+            buffer = []
+            first = False
+    if buffer:
+        yield "\n".join(buffer) + "\n"
+
+
+def csv_chunks(rows: Iterable[Dict], columns: List[str], batch_size: int) -> Iterator[str]:
+    """Encode rows as CSV with a header, one chunk per batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    count = 0
+    for row in rows:
+        writer.writerow([_csv_value(row[column]) for column in columns])
+        count += 1
+        if count >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+    if count:
+        yield buffer.getvalue()
+
+
+def _stream_export(name: str, query: str, columns: List[str], format: str, batch_size: int) -> StreamingResponse:
+    """Build a streaming response that reads the query through a server-side cursor"""
+    logger.info("Starting %s export: format=%s, batch_size=%s", name, format, batch_size)
+    rows = db.stream_query(query, batch_size=batch_size)
+    if format == "csv":
+        body = csv_chunks(rows, columns, batch_size)
+    else:
+        body = ndjson_chunks(rows, batch_size)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'}
+    )
+
+
+@router.get("/movies")
+def export_movies(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    batch_size: int = Query(settings.EXPORT_BATCH_SIZE, ge=1, le=10000)
+):
+    """
+    Stream the full movie catalog with director, genre and cast
+
+    Query Parameters:
+    - format: "ndjson" (one movie per line) or "csv" (cast as a JSON column)
+    - batch_size: Rows fetched from the database per round trip
+    """
+    return _stream_export("movies", MOVIES_EXPORT_QUERY, MOVIES_EXPORT_COLUMNS, format, batch_size)
+
+
+@router.get("/reviews")
+def export_reviews(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    batch_size: int = Query(settings.EXPORT_BATCH_SIZE, ge=1, le=10000)
+):
+    """
+    Stream all reviews
+
+    Query Parameters:
+    - format: "ndjson" or "csv"
+    - batch_size: Rows fetched from the database per round trip
+    """
+    return _stream_export("reviews", REVIEWS_EXPORT_QUERY, REVIEWS_EXPORT_COLUMNS, format, batch_size)
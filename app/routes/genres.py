@@ -1,31 +1,57 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from app.models import GenreResponse
-from app.database import db
+from app.database import db, PoolTimeout
 from app.utils.logger import logger
+from app.utils.cache import response_cache
+from app.utils.conditional import is_conditional, is_not_modified, not_modified, table_validators
 import psycopg2
 
 router = APIRouter(prefix="/api/genres", tags=["genres"])
 
 
 @router.get("", response_model=dict)
-def get_genres():
-    """Get all genres"""
+def get_genres(request: Request, response: Response):
+    """
+    Get all genres
+
+    Answers If-None-Match / If-Modified-Since with 304 when no genre changed.
+    """
     try:
         logger.info("Fetching all genres")
         
+        validators = None
+        if is_conditional(request):
+            validators = table_validators("genres", ["genres"])
+            if is_not_modified(request, validators):
+                logger.info("Genres not modified")
+                return not_modified(validators)
+
         query = """
             SELECT id, name, description, created_at
             FROM genres
             ORDER BY name
         """
-        genres = db.execute_query(query)
         
-        logger.info(f"Retrieved {len(genres)} genres")
+        def load_genres():
+            # Version first: a list at least as new as its ETag is never served as unchanged
+            version = validators or table_validators("genres", ["genres"])
+            return db.execute_query(query, name="genres_list"), version
+
+        genres, version = response_cache.get_or_load("genres:list", load_genres, tags=["genres"])
+        if validators is not None and version != validators:
+            # Cached before a write made through another worker
+            response_cache.invalidate("genres")
+            genres, version = response_cache.get_or_load("genres:list", load_genres, tags=["genres"])
+
+        logger.info("Retrieved %s genres", len(genres))
+        response.headers.update(version.headers())
         return {"genres": genres, "count": len(genres)}
         
     except psycopg2.Error as e:
-        logger.error(f"Database error in get_genres: {str(e)}")
+        logger.error("Database error in get_genres: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in get_genres: {str(e)}")
+        logger.error("Unexpected error in get_genres: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
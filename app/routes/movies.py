@@ -1,20 +1,503 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, List, Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from starlette.concurrency import run_in_threadpool
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime, timezone
 from app.models import MovieCreate, MovieUpdate, MovieResponse, ErrorResponse
-from app.database import db
+from app.config import settings
+from app.database import db, PoolTimeout
 from app.utils.logger import logger
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.cache import response_cache
+from app.utils.responses import FastJSONResponse
+from app.utils.conditional import (
+    Validators, is_conditional, is_not_modified, make_validators, not_modified, table_validators
+)
+from app.routes.reviews import review_cursor, review_rating_histogram
+from app.services.home_rows import home_rows, read_home_rows, read_home_rows_refreshed_at, HOME_ROWS_TAG
+from app.services.importer import import_catalog
+from app.services.similar import similar_index
+from app.services.actor_graph import actor_graph
+from app.services.autocomplete import autocomplete_index
 import psycopg2
 
 router = APIRouter(prefix="/api/movies", tags=["movies"])
 
 
+def movie_filter_lookups(
+    genre: Optional[str] = None,
+    director: Optional[str] = None,
+    actor: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Name filters to resolve to ids (via Database.resolve_ids) before building movie filters
+
+    Returns:
+        Mapping of table name to ILIKE pattern
+    """
+    lookups = {}
+    if genre:
+        lookups["genres"] = f"%{genre}%"
+    if director:
+        lookups["directors"] = f"%{director}%"
+    if actor:
+        lookups["actors"] = f"%{actor}%"
+    return lookups
+
+
+def build_movie_filters(
+    resolved_ids: Dict[str, List[int]],
+    year: Optional[int] = None,
+    min_reviews: Optional[int] = None,
+    min_review_rating: Optional[float] = None
+) -> Tuple[List[str], List[Any]]:
+    """
+    Build WHERE conditions for movie listings from pre-resolved id sets
+
+    Expects the query to alias movies as m.
+
+    Args:
+        resolved_ids: Result of resolving movie_filter_lookups
+        year: Release year filter
+        min_reviews: Minimum review count
+        min_review_rating: Minimum average review rating
+
+    Returns:
+        Tuple of (conditions, params)
+    """
+    conditions = []
+    params = []
+
+    if "genres" in resolved_ids:
+        conditions.append("m.genre_id = ANY(%s)")
+        params.append(resolved_ids["genres"])
+
+    if "directors" in resolved_ids:
+        conditions.append("m.director_id = ANY(%s)")
+        params.append(resolved_ids["directors"])
+
+    if year:
+        conditions.append("m.release_year = %s")
+        params.append(year)
+
+    if "actors" in resolved_ids:
+        conditions.append("m.id IN (SELECT ma.movie_id FROM movie_actors ma WHERE ma.actor_id = ANY(%s))")
+        params.append(resolved_ids["actors"])
+
+    if min_reviews:
+        conditions.append("m.review_count >= %s")
+        params.append(min_reviews)
+
+    if min_review_rating is not None:
+        conditions.append("m.avg_review_rating >= %s")
+        params.append(min_review_rating)
+
+    return conditions, params
+
+
+# Per-genre orderings for the movie rows, keyed by the get_movies sort parameter
+GENRE_ROW_ORDERINGS = {
+    "rating": "m.rating DESC NULLS LAST, m.created_at DESC, m.id DESC",
+    "most_reviewed": "m.review_count DESC, m.id DESC",
+    "best_reviewed": "m.avg_review_rating DESC NULLS LAST, m.review_count DESC, m.id DESC"
+}
+
+# Top N movies per genre ranked in a single statement; {where_clause} comes from build_movie_filters,
+# {order_by} from GENRE_ROW_ORDERINGS
+GENRE_ROWS_QUERY = """
+    SELECT id, title, director, release_year, genre, rating, review_count, avg_review_rating,
+           description, language, image_url, created_at, genre_id, genre_description, genre_total
+    FROM (
+        SELECT m.id, m.title, d.name as director, m.release_year,
+               g.name as genre, m.rating, m.review_count, m.avg_review_rating, m.description, m.language,
+               m.image_url, m.created_at, g.id as genre_id,
+               g.description as genre_description,
+               ROW_NUMBER() OVER (
+                   PARTITION BY g.id
+                   ORDER BY {order_by}
+               ) as genre_rank,
+               COUNT(*) OVER (PARTITION BY g.id) as genre_total
+        FROM movies m
+        JOIN directors d ON m.director_id = d.id
+        JOIN genres g ON m.genre_id = g.id
+        {where_clause}
+    ) ranked
+    WHERE genre_rank <= %s
+    ORDER BY genre_total DESC, genre, genre_rank
+"""
+
+# Movie details with cast and the latest reviews assembled server-side in one round trip;
+# parameters come from movie_detail_params
+MOVIE_DETAIL_QUERY = """
+    SELECT m.id, m.title, d.name as director, d.id as director_id, m.release_year,
+           g.name as genre, m.rating, m.review_count, m.avg_review_rating, m.description, m.language,
+           m.image_url, m.created_at,
+           COALESCE((
+               SELECT json_agg(json_build_object(
+                          'id', a.id, 'name', a.name, 'role', ma.role, 'birth_year', a.birth_year
+                      ) ORDER BY a.name)
+               FROM actors a
+               JOIN movie_actors ma ON a.id = ma.actor_id
+               WHERE ma.movie_id = m.id
+           ), '[]'::json) as "cast",
+           COALESCE((
+               SELECT json_agg(json_build_object(
+                          'id', r.id, 'reviewer_name', r.reviewer_name, 'rating', r.rating,
+                          'comment', r.comment, 'created_at', r.created_at
+                      ) ORDER BY r.created_at DESC, r.id DESC)
+               FROM (
+                   SELECT id, reviewer_name, rating, comment, created_at
+                   FROM reviews
+                   WHERE movie_id = m.id
+                   ORDER BY created_at DESC, id DESC
+                   LIMIT %s
+               ) r
+           ), '[]'::json) as reviews
+    FROM movies m
+    JOIN directors d ON m.director_id = d.id
+    JOIN genres g ON m.genre_id = g.id
+    WHERE m.id = %s
+"""
+
+
+# Version of a movie detail document: the rows it is built from and their latest change.
+# Reviews update the movie's aggregates and cast changes touch movies.updated_at, so both
+# show up in m.xmin (migrations/007)
+MOVIE_VERSION_QUERY = """
+    SELECT concat_ws(':', m.xmin, d.xmin, g.xmin, c.fingerprint) as fingerprint,
+           GREATEST(m.updated_at, d.updated_at, g.updated_at, c.updated_at) as updated_at
+    FROM movies m
+    JOIN directors d ON m.director_id = d.id
+    JOIN genres g ON m.genre_id = g.id
+    CROSS JOIN LATERAL (
+        SELECT string_agg(ma.xmin || '.' || a.xmin, ',' ORDER BY a.id) as fingerprint,
+               MAX(a.updated_at) as updated_at
+        FROM movie_actors ma
+        JOIN actors a ON a.id = ma.actor_id
+        WHERE ma.movie_id = m.id
+    ) c
+    WHERE m.id = %s
+"""
+
+# Tables the genre rows of GET /api/movies are built from; the actor filter adds the cast tables
+MOVIE_ROWS_TABLES = ("movies", "directors", "genres")
+MOVIE_CAST_TABLES = ("actors", "movie_actors")
+
+
+def movie_validators(movie_id: int, histogram: bool = False) -> Optional[Validators]:
+    """ETag / Last-Modified of a movie detail document, or None if the movie doesn't exist"""
+    row = db.execute_query(MOVIE_VERSION_QUERY, (movie_id,), fetch_one=True, name="movie_version")
+    if row is None:
+        return None
+    return make_validators(
+        "movie", row["fingerprint"], row["updated_at"], histogram, settings.MOVIE_DETAIL_REVIEW_LIMIT
+    )
+
+
+def home_rows_validators(refreshed_at: Any, limit_per_genre: int) -> Validators:
+    """ETag / Last-Modified of the home-page rows computed at refreshed_at"""
+    return make_validators("movies:home", refreshed_at, refreshed_at, limit_per_genre)
+
+
+def movie_detail_params(movie_id: int) -> tuple:
+    """Parameters for MOVIE_DETAIL_QUERY"""
+    return (settings.MOVIE_DETAIL_REVIEW_LIMIT, movie_id)
+
+
+def with_reviews_cursor(movie: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Add reviews_next_cursor for continuing at /api/movies/{id}/reviews when more reviews exist"""
+    if movie is None:
+        return None
+    movie = dict(movie)
+    reviews = movie["reviews"]
+    more = movie["review_count"] > len(reviews) and reviews
+    movie["reviews_next_cursor"] = review_cursor(reviews[-1]) if more else None
+    return movie
+
+
+def movie_cache_tags(movie: Dict[str, Any]) -> List[str]:
+    """Cache dependency tags for a movie detail document"""
+    tags = [f"movie:{movie['id']}", f"director:{movie['director_id']}"]
+    tags.extend(f"actor:{member['id']}" for member in movie["cast"])
+    return tags
+
+
+# Card fields for movies returned by the similar-movies index
+SIMILAR_MOVIES_QUERY = """
+    SELECT m.id, m.title, d.name as director, m.release_year, g.name as genre, m.rating,
+           m.review_count, m.avg_review_rating, m.image_url
+    FROM movies m
+    JOIN directors d ON m.director_id = d.id
+    JOIN genres g ON m.genre_id = g.id
+    WHERE m.id = ANY(%s)
+"""
+
+
+# Resolve cast names to actor ids, creating missing actors, in one statement
+CAST_RESOLVE_ACTORS_QUERY = """
+    WITH wanted(name) AS (
+        SELECT DISTINCT unnest(%s::text[])
+    ),
+    existing AS (
+        SELECT a.name, MIN(a.id) as id
+        FROM actors a
+        JOIN wanted w ON w.name = a.name
+        GROUP BY a.name
+    ),
+    created AS (
+        INSERT INTO actors (name)
+        SELECT w.name FROM wanted w
+        WHERE NOT EXISTS (SELECT 1 FROM existing e WHERE e.name = w.name)
+        RETURNING name, id
+    )
+    SELECT name, id FROM existing
+    UNION ALL
+    SELECT name, id FROM created
+"""
+
+# Apply a cast diff: drop removed members, insert new ones, update changed roles
+CAST_SYNC_QUERY = """
+    WITH new_cast(actor_id, role) AS (
+        SELECT * FROM unnest(%s::int[], %s::text[])
+    ),
+    removed AS (
+        DELETE FROM movie_actors
+        WHERE movie_id = %s AND actor_id <> ALL(%s::int[])
+        RETURNING id
+    ),
+    upserted AS (
+        INSERT INTO movie_actors (movie_id, actor_id, role)
+        SELECT %s, actor_id, role FROM new_cast
+        ON CONFLICT (movie_id, actor_id) DO UPDATE SET role = EXCLUDED.role
+        WHERE movie_actors.role IS DISTINCT FROM EXCLUDED.role
+        RETURNING (xmax = 0) as inserted
+    )
+    SELECT (SELECT COUNT(*) FROM removed) as removed,
+           COUNT(*) FILTER (WHERE inserted) as added,
+           COUNT(*) FILTER (WHERE NOT inserted) as updated
+    FROM upserted
+"""
+
+
+def cast_members(cast: List[dict]) -> Dict[str, str]:
+    """
+    Normalize a cast payload to actor name -> role
+
+    Blank names are skipped; for repeated names the last role wins.
+    """
+    members = {}
+    for cast_member in cast:
+        actor_name = (cast_member.get('actor_name') or '').strip()
+        if actor_name:
+            members[actor_name] = cast_member.get('role', '')
+    return members
+
+
+def sync_movie_cast(movie_id: int, cast: List[dict]) -> Dict[str, int]:
+    """
+    Make a movie's cast match the given list
+
+    Uses two statements whatever the cast size: one to resolve (and create)
+    actors by name, one to apply the diff against the existing cast.
+
+    Returns:
+        Counts of added, updated and removed cast members
+    """
+    members = cast_members(cast)
+    actor_ids = []
+    roles = []
+    if members:
+        resolved = db.execute_query(CAST_RESOLVE_ACTORS_QUERY, (list(members),), name="cast_resolve_actors")
+        ids_by_name = {row['name']: row['id'] for row in resolved}
+        actor_ids = [ids_by_name[name] for name in members]
+        roles = list(members.values())
+    params = (actor_ids, roles, movie_id, actor_ids, movie_id)
+    return dict(db.execute_query(CAST_SYNC_QUERY, params, fetch_one=True, name="cast_sync"))
+
+
+def group_genre_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Group ranked movie rows into genre categories
+
+    Rows must arrive ordered by genre, carrying genre_id, genre_description
+    and genre_total alongside the movie columns.
+    """
+    categories = []
+    by_genre = {}
+    for row in rows:
+        movie = dict(row)
+        genre_id = movie.pop("genre_id")
+        genre_description = movie.pop("genre_description")
+        genre_total = movie.pop("genre_total")
+        category = by_genre.get(genre_id)
+        if category is None:
+            category = {
+                "genre_id": genre_id,
+                "genre_name": movie["genre"],
+                "genre_description": genre_description,
+                "movie_count": genre_total,
+                "movies": []
+            }
+            by_genre[genre_id] = category
+            categories.append(category)
+        category["movies"].append(movie)
+    return categories
+
+
+def genre_rows_query(
+    resolved_ids: Dict[str, List[int]],
+    year: Optional[int],
+    min_reviews: Optional[int],
+    min_review_rating: Optional[float],
+    sort: str,
+    limit_per_genre: int
+) -> Tuple[str, tuple]:
+    """Statement and parameters for the genre rows of GET /api/movies; group the rows with group_genre_rows"""
+    filter_conditions, filter_params = build_movie_filters(resolved_ids, year, min_reviews, min_review_rating)
+    where_clause = ""
+    if filter_conditions:
+        where_clause = "WHERE " + " AND ".join(filter_conditions)
+    query = GENRE_ROWS_QUERY.format(where_clause=where_clause, order_by=GENRE_ROW_ORDERINGS[sort])
+    return query, tuple(filter_params) + (limit_per_genre,)
+
+
+def search_query(search_term: str, mode: str, after: Optional[Dict[str, Any]], limit: int) -> Tuple[str, tuple]:
+    """
+    Statement and parameters for one page of movie search
+
+    Fetches one row more than limit; pass the rows to keyset_page with
+    SEARCH_CURSOR_KEYS[mode].
+    """
+    if mode == "fulltext":
+        query = """
+            SELECT m.id, m.title, d.name as director, m.release_year,
+                   g.name as genre, m.rating, m.review_count, m.avg_review_rating, m.description, m.language,
+                   m.image_url, m.created_at, ts_rank(m.search_vector, q.query) as rank
+            FROM movies m
+            JOIN directors d ON m.director_id = d.id
+            JOIN genres g ON m.genre_id = g.id
+            CROSS JOIN websearch_to_tsquery('english', %s) AS q(query)
+            WHERE m.search_vector @@ q.query
+        """
+        params = [search_term]
+        if after:
+            query += " AND (ts_rank(m.search_vector, q.query), m.id) < (%s::real, %s)"
+            params.extend([after.get("rank"), after.get("id")])
+        query += " ORDER BY rank DESC, m.id DESC LIMIT %s"
+    else:
+        query = """
+            SELECT m.id, m.title, d.name as director, m.release_year,
+                   g.name as genre, m.rating, m.review_count, m.avg_review_rating, m.description, m.language,
+                   m.image_url, m.created_at
+            FROM movies m
+            JOIN directors d ON m.director_id = d.id
+            JOIN genres g ON m.genre_id = g.id
+            WHERE (m.title ILIKE %s OR d.name ILIKE %s OR m.description ILIKE %s)
+        """
+        search_pattern = f"%{search_term}%"
+        params = [search_pattern, search_pattern, search_pattern]
+        if after:
+            query += " AND (m.created_at, m.id) < (%s::timestamp, %s)"
+            params.extend([after.get("created_at"), after.get("id")])
+        query += " ORDER BY m.created_at DESC, m.id DESC LIMIT %s"
+
+    # Fetch one extra row to know whether another page exists
+    params.append(limit + 1)
+    return query, tuple(params)
+
+
+def genre_page_condition(genre_ids: List[int]) -> Tuple[str, Any]:
+    """Condition on m.genre_id and its parameter; a single id keeps the plan on the equality index scan"""
+    if len(genre_ids) == 1:
+        return "m.genre_id = %s", genre_ids[0]
+    return "m.genre_id = ANY(%s)", genre_ids
+
+
+def genre_page_query(
+    genre_ids: List[int],
+    after: Optional[Dict[str, Any]],
+    offset: int,
+    limit: int
+) -> Tuple[str, tuple]:
+    """
+    Statement and parameters for one page of a genre's movies
+
+    Keyed on (rating, created_at, id); offset only applies without a cursor.
+    Fetches one row more than limit; pass the rows to keyset_page with
+    GENRE_PAGE_CURSOR_KEYS.
+    """
+    genre_condition, genre_param = genre_page_condition(genre_ids)
+    params = [genre_param]
+    query = f"""
+        SELECT m.id, m.title, d.name as director, m.release_year,
+               g.name as genre, m.rating, m.review_count, m.avg_review_rating, m.description, m.language,
+               m.image_url, m.created_at, COALESCE(m.rating, -1) as sort_rating
+        FROM movies m
+        JOIN directors d ON m.director_id = d.id
+        JOIN genres g ON m.genre_id = g.id
+        WHERE {genre_condition}
+    """
+    if after:
+        query += " AND (COALESCE(m.rating, -1), m.created_at, m.id) < (%s::numeric, %s::timestamp, %s)"
+        params.extend([after.get("rating"), after.get("created_at"), after.get("id")])
+    query += " ORDER BY COALESCE(m.rating, -1) DESC, m.created_at DESC, m.id DESC LIMIT %s"
+    # Fetch one extra row to know whether another page exists
+    params.append(limit + 1)
+    if not after and offset:
+        query += " OFFSET %s"
+        params.append(offset)
+    return query, tuple(params)
+
+
+def genre_count_query(genre_ids: List[int]) -> Tuple[str, tuple]:
+    """Statement and parameters counting all movies of the genres, for include_total"""
+    genre_condition, genre_param = genre_page_condition(genre_ids)
+    query = f"""
+        SELECT COUNT(*) as total
+        FROM movies m
+        WHERE {genre_condition}
+    """
+    return query, (genre_param,)
+
+
+# Cursor field -> row column for each keyset page; the columns not shown to clients are dropped
+SEARCH_CURSOR_KEYS = {
+    "fulltext": {"rank": "rank", "id": "id"},
+    "substring": {"created_at": "created_at", "id": "id"}
+}
+GENRE_PAGE_CURSOR_KEYS = {"rating": "sort_rating", "created_at": "created_at", "id": "id"}
+KEYSET_ONLY_COLUMNS = ("rank", "sort_rating")
+
+
+def keyset_page(rows: List[Dict[str, Any]], limit: int, cursor_keys: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Page response from rows fetched with one extra row
+
+    Returns:
+        Dict with movies, count, has_more and next_cursor
+    """
+    has_more = len(rows) > limit
+    movies = rows[:limit]
+    next_cursor = None
+    if has_more:
+        last = movies[-1]
+        next_cursor = encode_cursor({field: last[column] for field, column in cursor_keys.items()})
+    for movie in movies:
+        for column in KEYSET_ONLY_COLUMNS:
+            movie.pop(column, None)
+    return {"movies": movies, "count": len(movies), "has_more": has_more, "next_cursor": next_cursor}
+
+
 @router.get("", response_model=dict)
 def get_movies(
+    request: Request,
     limit_per_genre: int = Query(10, ge=1, le=50, description="Movies per genre"),
     genre: Optional[str] = None,
     director: Optional[str] = None,
     actor: Optional[str] = None,
-    year: Optional[int] = None
+    year: Optional[int] = None,
+    sort: str = Query("rating", pattern="^(rating|most_reviewed|best_reviewed)$"),
+    min_reviews: Optional[int] = Query(None, ge=1),
+    min_review_rating: Optional[float] = Query(None, ge=0, le=10)
 ):
     """
     Get movies grouped by genres for Netflix-style horizontal scrolling
@@ -25,158 +508,214 @@ def get_movies(
     - director: Filter by director name
     - actor: Filter by actor name
     - year: Filter by release year
+    - sort: Order within each genre: "rating", "most_reviewed" or "best_reviewed"
+    - min_reviews: Only movies with at least this many reviews
+    - min_review_rating: Only movies whose average review rating is at least this
+
+    Unfiltered responses include refreshed_at, the time the rows were computed.
+    Answers If-None-Match / If-Modified-Since with 304 when the rows are unchanged.
     """
     try:
-        logger.info(f"Fetching movies grouped by genre: limit_per_genre={limit_per_genre}, genre={genre}, director={director}, actor={actor}, year={year}")
-        
-        # Build filter conditions
-        filter_conditions = []
-        filter_params = []
-        
-        if genre:
-            filter_conditions.append("g.name ILIKE %s")
-            filter_params.append(f"%{genre}%")
-        
-        if director:
-            filter_conditions.append("d.name ILIKE %s")
-            filter_params.append(f"%{director}%")
-        
-        if year:
-            filter_conditions.append("m.release_year = %s")
-            filter_params.append(year)
-        
-        if actor:
-            filter_conditions.append("EXISTS (SELECT 1 FROM movie_actors ma JOIN actors a ON ma.actor_id = a.id WHERE ma.movie_id = m.id AND a.name ILIKE %s)")
-            filter_params.append(f"%{actor}%")
-        
-        # Get genres with movie counts
-        genre_filter = ""
-        if filter_conditions:
-            genre_filter = "WHERE " + " AND ".join(filter_conditions)
-        
-        genre_query = f"""
-            SELECT g.id, g.name, g.description, COUNT(DISTINCT m.id) as movie_count
-            FROM genres g
-            LEFT JOIN movies m ON m.genre_id = g.id
-            LEFT JOIN directors d ON m.director_id = d.id
-            {genre_filter}
-            GROUP BY g.id, g.name, g.description
-            HAVING COUNT(DISTINCT m.id) > 0
-            ORDER BY COUNT(DISTINCT m.id) DESC, g.name
-        """
-        
-        genres_data = db.execute_query(genre_query, tuple(filter_params))
-        
-        # For each genre, get movies
-        result = []
-        for genre_info in genres_data:
-            movies_query = """
-                SELECT m.id, m.title, d.name as director, m.release_year, 
-                       g.name as genre, m.rating, m.description, m.language, 
-                       m.image_url, m.created_at
-                FROM movies m
-                JOIN directors d ON m.director_id = d.id
-                JOIN genres g ON m.genre_id = g.id
-                WHERE g.id = %s
-            """
-            
-            movie_params = [genre_info['id']]
-            
-            # Apply additional filters to movies query
-            if director:
-                movies_query += " AND d.name ILIKE %s"
-                movie_params.append(f"%{director}%")
-            
-            if year:
-                movies_query += " AND m.release_year = %s"
-                movie_params.append(year)
-            
-            if actor:
-                movies_query += " AND EXISTS (SELECT 1 FROM movie_actors ma JOIN actors a ON ma.actor_id = a.id WHERE ma.movie_id = m.id AND a.name ILIKE %s)"
-                movie_params.append(f"%{actor}%")
-            
-            movies_query += " ORDER BY m.rating DESC NULLS LAST, m.created_at DESC LIMIT %s"
-            movie_params.append(limit_per_genre)
-            
-            movies = db.execute_query(movies_query, tuple(movie_params))
-            
-            if movies:  # Only include genres that have movies after filtering
-                result.append({
-                    "genre_id": genre_info['id'],
-                    "genre_name": genre_info['name'],
-                    "genre_description": genre_info['description'],
-                    "movie_count": len(movies),
-                    "movies": movies
-                })
+        logger.info(
+            "Fetching movies grouped by genre: limit_per_genre=%s, genre=%s, director=%s, actor=%s, year=%s, sort=%s",
+            limit_per_genre, genre, director, actor, year, sort
+        )
         
-        logger.info(f"Retrieved {len(result)} genres with movies")
-        return {"categories": result, "total_categories": len(result)}
+        def load_rows():
+            resolved_ids = db.resolve_ids(movie_filter_lookups(genre, director, actor))
+            query, params = genre_rows_query(resolved_ids, year, min_reviews, min_review_rating, sort, limit_per_genre)
+            return group_genre_rows(db.execute_query(query, params))
+
+        variant = (limit_per_genre, genre, director, actor, year, sort, min_reviews, min_review_rating)
+
+        def rows_validators():
+            tables = MOVIE_ROWS_TABLES + MOVIE_CAST_TABLES if actor else MOVIE_ROWS_TABLES
+            return table_validators("movies:rows", tables, *variant)
+
+        if genre or director or actor or year or min_reviews or min_review_rating is not None:
+            validators = None
+            if is_conditional(request):
+                validators = rows_validators()
+                if is_not_modified(request, validators):
+                    logger.info("Movies not modified")
+                    return not_modified(validators)
+            # Version first: rows at least as new as their ETag are never served as unchanged
+            validators = validators or rows_validators()
+            result = load_rows()
+            logger.info("Retrieved %s genres with movies", len(result))
+            return FastJSONResponse(
+                {"categories": result, "total_categories": len(result)},
+                headers=validators.headers()
+            )
+
+        # Unfiltered home-page rows: served from the precomputed view while its refresher runs
+        from_view = sort == "rating" and home_rows.available and home_rows.running
+
+        validators = None
+        if from_view:
+            # Always checked: another worker's refresh doesn't drop this worker's cached copy
+            validators = home_rows_validators(read_home_rows_refreshed_at(), limit_per_genre)
+        elif is_conditional(request):
+            validators = rows_validators()
+        if validators is not None and is_not_modified(request, validators):
+            logger.info("Movies not modified")
+            return not_modified(validators)
+
+        def load_home_rows():
+            result, refreshed_at = read_home_rows(limit_per_genre)
+            return result, refreshed_at, home_rows_validators(refreshed_at, limit_per_genre)
+
+        def load_live_rows():
+            # Version first: rows at least as new as their ETag are never served as unchanged
+            version = validators or rows_validators()
+            return load_rows(), datetime.now(timezone.utc), version
+
+        def load_cached():
+            if from_view:
+                return response_cache.get_or_load(
+                    f"movies:home:{limit_per_genre}", load_home_rows, tags=[HOME_ROWS_TAG]
+                )
+            return response_cache.get_or_load(
+                f"movies:rows:{sort}:{limit_per_genre}",
+                load_live_rows,
+                tags=lambda loaded: ["catalog"] + [f"genre:{c['genre_id']}" for c in loaded[0]]
+            )
+
+        loaded = load_cached()
+        if validators is not None and loaded[2] != validators:
+            # Cached before a write (or view refresh) made through another worker
+            response_cache.invalidate(HOME_ROWS_TAG if from_view else "catalog")
+            loaded = load_cached()
+        result, refreshed_at, validators = loaded
+
+        logger.info("Retrieved %s genres with movies (as of %s)", len(result), refreshed_at)
+        return FastJSONResponse(
+            {"categories": result, "total_categories": len(result), "refreshed_at": refreshed_at},
+            headers=validators.headers()
+        )
         
     except psycopg2.Error as e:
-        logger.error(f"Database error in get_movies: {str(e)}")
+        logger.error("Database error in get_movies: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in get_movies: {str(e)}")
+        logger.error("Unexpected error in get_movies: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.get("/{movie_id}", response_model=dict)
-def get_movie(movie_id: int):
+def get_movie(movie_id: int, request: Request, response: Response, histogram: bool = False):
     """
     Get a single movie by ID with full details
     
-    Returns movie details including cast (actors), director, genres, and reviews
+    Returns movie details including cast (actors), director, genres, the latest
+    reviews (review_count holds the total; page through the rest with
+    reviews_next_cursor at /api/movies/{movie_id}/reviews)
+
+    Query Parameters:
+    - histogram: Include review counts per rating bucket
+
+    Answers If-None-Match / If-Modified-Since with 304 when the movie is unchanged.
     """
     try:
-        logger.info(f"Fetching movie with id={movie_id}")
+        logger.info("Fetching movie with id=%s", movie_id)
         
-        query = """
-            SELECT m.id, m.title, d.name as director, d.id as director_id, m.release_year, 
-                   g.name as genre, m.rating, m.description, m.language, m.image_url, m.created_at
-            FROM movies m
-            JOIN directors d ON m.director_id = d.id
-            JOIN genres g ON m.genre_id = g.id
-            WHERE m.id = %s
-        """
-        movie = db.execute_query(query, (movie_id,), fetch_one=True)
+        validators = None
+        if is_conditional(request):
+            validators = movie_validators(movie_id, histogram)
+            if validators is not None and is_not_modified(request, validators):
+                logger.info("Movie not modified: id=%s", movie_id)
+                return not_modified(validators)
+
+        def load_movie():
+            # Version first: a document at least as new as its ETag is never served as unchanged
+            version = validators or movie_validators(movie_id, histogram)
+            if version is None:
+                return None
+            movie = with_reviews_cursor(
+                db.execute_query(MOVIE_DETAIL_QUERY, movie_detail_params(movie_id), fetch_one=True, name="movie_detail")
+            )
+            if movie is None:
+                return None
+            if histogram:
+                movie["review_histogram"] = review_rating_histogram(movie_id)
+            return movie, version
+
+        cache_key = f"movie:{movie_id}:histogram" if histogram else f"movie:{movie_id}"
+        loaded = response_cache.get_or_load(cache_key, load_movie, tags=lambda loaded: movie_cache_tags(loaded[0]))
+        if loaded is not None and validators is not None and loaded[1] != validators:
+            # Cached before a write made through another worker
+            response_cache.invalidate(f"movie:{movie_id}")
+            loaded = response_cache.get_or_load(cache_key, load_movie, tags=lambda loaded: movie_cache_tags(loaded[0]))
+        movie, version = loaded or (None, None)
         
         if not movie:
-            logger.warning(f"Movie not found: id={movie_id}")
+            logger.warning("Movie not found: id=%s", movie_id)
             raise HTTPException(status_code=404, detail="Movie not found")
         
-        # Get actors/cast for this movie
-        actors_query = """
-            SELECT a.id, a.name, ma.role, a.birth_year
-            FROM actors a
-            JOIN movie_actors ma ON a.id = ma.actor_id
-            WHERE ma.movie_id = %s
-            ORDER BY a.name
-        """
-        actors = db.execute_query(actors_query, (movie_id,))
-        
-        # Get reviews for this movie
-        reviews_query = """
-            SELECT id, reviewer_name, rating, comment, created_at
-            FROM reviews
-            WHERE movie_id = %s
-            ORDER BY created_at DESC
-        """
-        reviews = db.execute_query(reviews_query, (movie_id,))
+        logger.info(
+            "Retrieved movie: %s with %s actors and %s of %s reviews",
+            movie['title'], len(movie['cast']), len(movie['reviews']), movie['review_count']
+        )
+        response.headers.update(version.headers())
+        return movie
+
+    except HTTPException:
+        raise
+    except psycopg2.Error as e:
+        logger.error("Database error in get_movie: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
+    except Exception as e:
+        logger.error("Unexpected error in get_movie: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/{movie_id}/similar", response_model=dict)
+def get_similar_movies(movie_id: int, limit: int = Query(10, ge=1, le=settings.SIMILAR_TOP_K)):
+    """
+    Get movies similar to a movie ("more like this")
+
+    Ranked by cosine similarity of shared actors, director and genres, from the
+    in-memory similar movies index.
+
+    Query Parameters:
+    - limit: Number of similar movies to return (max SIMILAR_TOP_K)
+    """
+    try:
+        logger.info("Fetching similar movies for id=%s, limit=%s", movie_id, limit)
+
+        if not settings.SIMILAR_ENABLED:
+            raise HTTPException(status_code=503, detail="Similar movies are disabled")
         
-        logger.info(f"Retrieved movie: {movie['title']} with {len(actors)} actors and {len(reviews)} reviews")
-        return {
-            **movie,
-            "cast": actors,
-            "reviews": reviews
-        }
+        neighbours = similar_index.similar(movie_id, limit)
+        if neighbours is None:
+            logger.warning("Movie not found: id=%s", movie_id)
+            raise HTTPException(status_code=404, detail="Movie not found")
+
+        scores = dict(neighbours)
+        rows = db.execute_query(SIMILAR_MOVIES_QUERY, (list(scores),), name="similar_movies") if scores else []
+        by_id = {row["id"]: row for row in rows}
+        similar = [
+            {**by_id[similar_id], "similarity": score}
+            for similar_id, score in neighbours
+            if similar_id in by_id
+        ]
+
+        logger.info("Found %s similar movies for id=%s", len(similar), movie_id)
+        return {"movie_id": movie_id, "similar": similar, "count": len(similar)}
         
     except HTTPException:
         raise
     except psycopg2.Error as e:
-        logger.error(f"Database error in get_movie: {str(e)}")
+        logger.error("Database error in get_similar_movies: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in get_movie: {str(e)}")
+        logger.error("Unexpected error in get_similar_movies: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -184,58 +723,98 @@ def get_movie(movie_id: int):
 def create_movie(movie: MovieCreate):
     """Create a new movie"""
     try:
-        logger.info(f"Creating movie: {movie.title}")
+        logger.info("Creating movie: %s", movie.title)
         
-        # Get or create director and genre
-        director_id = db.get_or_create("directors", "name", movie.director_name)
-        genre_id = db.get_or_create("genres", "name", movie.genre_name)
-        
-        query = """
-            INSERT INTO movies (title, director_id, genre_id, release_year, rating, description, language, image_url)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """
-        result = db.execute_insert(query, (
-            movie.title,
-            director_id,
-            genre_id,
-            movie.release_year,
-            movie.rating,
-            movie.description,
-            movie.language or 'English',
-            movie.image_url
-        ))
-        
-        movie_id = result['id']
-        logger.info(f"Movie created successfully: id={movie_id}")
-        
-        # Add cast if provided
-        if movie.cast:
-            for cast_member in movie.cast:
-                actor_name = cast_member.get('actor_name')
-                role = cast_member.get('role', '')
-                if actor_name:
-                    # Get or create actor
-                    actor_id = db.get_or_create("actors", "name", actor_name)
-                    # Link to movie
-                    cast_query = """
-                        INSERT INTO movie_actors (movie_id, actor_id, role)
-                        VALUES (%s, %s, %s)
-                        ON CONFLICT (movie_id, actor_id) DO UPDATE SET role = EXCLUDED.role
-                    """
-                    db.execute_insert(cast_query, (movie_id, actor_id, role))
+        # One connection and one commit for the whole write
+        with db.transaction():
+            # Get or create director and genre
+            director_id = db.get_or_create("directors", "name", movie.director_name)
+            genre_id = db.get_or_create("genres", "name", movie.genre_name)
+
+            query = """
+                INSERT INTO movies (
+                    title, director_id, genre_id, release_year, rating, description, language, image_url
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id
+            """
+            result = db.execute_insert(query, (
+                movie.title,
+                director_id,
+                genre_id,
+                movie.release_year,
+                movie.rating,
+                movie.description,
+                movie.language or 'English',
+                movie.image_url
+            ))
+
+            movie_id = result['id']
+
+            # Add cast if provided
+            if movie.cast:
+                sync_movie_cast(movie_id, movie.cast)
+
+            # Read back on the same connection, bypassing the cache until committed
+            created = with_reviews_cursor(
+                db.execute_query(MOVIE_DETAIL_QUERY, movie_detail_params(movie_id), fetch_one=True, name="movie_detail")
+            )
         
-        # Return the created movie
-        return get_movie(movie_id)
+        logger.info("Movie created successfully: id=%s", movie_id)
+        response_cache.invalidate("catalog", f"genre:{genre_id}", "genres", "directors")
+        home_rows.mark_dirty()
+        similar_index.mark_changed(movie_id)
+        actor_graph.mark_changed(movie_id)
+        autocomplete_index.mark_changed("movie", movie_id)
+
+        return created
         
     except psycopg2.IntegrityError as e:
-        logger.error(f"Integrity error in create_movie: {str(e)}")
+        logger.error("Integrity error in create_movie: %s", e)
         raise HTTPException(status_code=400, detail="Invalid data provided")
     except psycopg2.Error as e:
-        logger.error(f"Database error in create_movie: {str(e)}")
+        logger.error("Database error in create_movie: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in create_movie: {str(e)}")
+        logger.error("Unexpected error in create_movie: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/import", response_model=dict, status_code=201)
+async def import_movies(request: Request):
+    """
+    Bulk import movies from an NDJSON body
+
+    Each line is a movie object with the same fields as POST /api/movies.
+    Valid lines are loaded together in a single transaction; invalid lines
+    are skipped and reported.
+    """
+    try:
+        body = await request.body()
+        logger.info("Importing movies: %s bytes", len(body))
+
+        summary = await run_in_threadpool(import_catalog, body.decode("utf-8").splitlines())
+
+        if summary["movies_imported"]:
+            response_cache.invalidate("catalog", "genres", "directors")
+            home_rows.mark_dirty()
+            similar_index.mark_stale()
+            actor_graph.mark_stale()
+            autocomplete_index.mark_stale()
+
+        return summary
+
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Body must be UTF-8 encoded NDJSON")
+    except psycopg2.Error as e:
+        logger.error("Database error in import_movies: %s", e)
+        raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
+    except Exception as e:
+        logger.error("Unexpected error in import_movies: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -243,96 +822,108 @@ def create_movie(movie: MovieCreate):
 def update_movie(movie_id: int, movie: MovieUpdate):
     """Update an existing movie"""
     try:
-        logger.info(f"Updating movie: id={movie_id}")
-        
-        # Check if movie exists
-        existing = db.execute_query(
-            "SELECT id FROM movies WHERE id = %s",
-            (movie_id,),
-            fetch_one=True
-        )
-        if not existing:
-            logger.warning(f"Movie not found for update: id={movie_id}")
-            raise HTTPException(status_code=404, detail="Movie not found")
-        
-        # Build dynamic update
-        update_fields = []
-        values = []
+        logger.info("Updating movie: id=%s", movie_id)
         
-        if movie.title is not None:
-            update_fields.append("title = %s")
-            values.append(movie.title)
+        # One connection and one commit for the whole write
+        with db.transaction():
+            # Check if movie exists
+            existing = db.execute_query(
+                "SELECT id FROM movies WHERE id = %s",
+                (movie_id,),
+                fetch_one=True
+            )
+            if not existing:
+                logger.warning("Movie not found for update: id=%s", movie_id)
+                raise HTTPException(status_code=404, detail="Movie not found")
+
+            # Build dynamic update
+            update_fields = []
+            values = []
+
+            if movie.title is not None:
+                update_fields.append("title = %s")
+                values.append(movie.title)
+
+            if movie.director_name is not None:
+                director_id = db.get_or_create("directors", "name", movie.director_name)
+                update_fields.append("director_id = %s")
+                values.append(director_id)
+
+            if movie.genre_name is not None:
+                genre_id = db.get_or_create("genres", "name", movie.genre_name)
+                update_fields.append("genre_id = %s")
+                values.append(genre_id)
+
+            if movie.release_year is not None:
+                update_fields.append("release_year = %s")
+                values.append(movie.release_year)
+
+            if movie.rating is not None:
+                update_fields.append("rating = %s")
+                values.append(movie.rating)
+
+            if movie.description is not None:
+                update_fields.append("description = %s")
+                values.append(movie.description)
+
+            if movie.language is not None:
+                update_fields.append("language = %s")
+                values.append(movie.language)
+
+            if movie.image_url is not None:
+                update_fields.append("image_url = %s")
+                values.append(movie.image_url)
+
+            if update_fields:
+                values.append(movie_id)
+                query = f"""
+                    UPDATE movies
+                    SET {', '.join(update_fields)}
+                    WHERE id = %s
+                    RETURNING id
+                """
+                db.execute_update(query, tuple(values))
+            elif movie.cast is None:
+                logger.info("No fields to update for movie: id=%s", movie_id)
+
+            # Sync cast if provided
+            if movie.cast is not None:
+                changes = sync_movie_cast(movie_id, movie.cast)
+                logger.info(
+                    "Cast synced for movie %s: added=%s, updated=%s, removed=%s",
+                    movie_id, changes['added'], changes['updated'], changes['removed']
+                )
+
+            # Read back on the same connection, bypassing the cache until committed
+            updated = with_reviews_cursor(
+                db.execute_query(MOVIE_DETAIL_QUERY, movie_detail_params(movie_id), fetch_one=True, name="movie_detail")
+            )
         
+        invalidated_tags = [f"movie:{movie_id}", "catalog"]
         if movie.director_name is not None:
-            director_id = db.get_or_create("directors", "name", movie.director_name)
-            update_fields.append("director_id = %s")
-            values.append(director_id)
-        
+            invalidated_tags.append("directors")
         if movie.genre_name is not None:
-            genre_id = db.get_or_create("genres", "name", movie.genre_name)
-            update_fields.append("genre_id = %s")
-            values.append(genre_id)
-        
-        if movie.release_year is not None:
-            update_fields.append("release_year = %s")
-            values.append(movie.release_year)
-        
-        if movie.rating is not None:
-            update_fields.append("rating = %s")
-            values.append(movie.rating)
-        
-        if movie.description is not None:
-            update_fields.append("description = %s")
-            values.append(movie.description)
-        
-        if movie.language is not None:
-            update_fields.append("language = %s")
-            values.append(movie.language)
-        
-        if movie.image_url is not None:
-            update_fields.append("image_url = %s")
-            values.append(movie.image_url)
-        
-        if not update_fields:
-            logger.info(f"No fields to update for movie: id={movie_id}")
-            return get_movie(movie_id)
-        
-        values.append(movie_id)
-        query = f"""
-            UPDATE movies
-            SET {', '.join(update_fields)}
-            WHERE id = %s
-            RETURNING id
-        """
-        db.execute_update(query, tuple(values))
-        
-        # Update cast if provided
+            invalidated_tags.append("genres")
+        response_cache.invalidate(*invalidated_tags)
+        home_rows.mark_dirty()
+        if movie.director_name is not None or movie.genre_name is not None or movie.cast is not None:
+            similar_index.mark_changed(movie_id)
         if movie.cast is not None:
-            # Remove existing cast
-            db.execute_query("DELETE FROM movie_actors WHERE movie_id = %s", (movie_id,), fetch_all=False)
-            # Add new cast
-            for cast_member in movie.cast:
-                actor_name = cast_member.get('actor_name')
-                role = cast_member.get('role', '')
-                if actor_name:
-                    actor_id = db.get_or_create("actors", "name", actor_name)
-                    cast_query = """
-                        INSERT INTO movie_actors (movie_id, actor_id, role)
-                        VALUES (%s, %s, %s)
-                        ON CONFLICT (movie_id, actor_id) DO UPDATE SET role = EXCLUDED.role
-                    """
-                    db.execute_insert(cast_query, (movie_id, actor_id, role))
-        
-        logger.info(f"Movie updated successfully: id={movie_id}")
-        return get_movie(movie_id)
+            actor_graph.mark_changed(movie_id)
+        autocomplete_index.mark_changed("movie", movie_id)
+
+        logger.info("Movie updated successfully: id=%s", movie_id)
+        return updated
         
     except HTTPException:
         raise
     except psycopg2.Error as e:
-        logger.error(f"Database error in update_movie: {str(e)}")
+        logger.error("Database error in update_movie: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in update_movie: {str(e)}")
+        logger.error("Unexpected error in update_movie: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -340,33 +931,54 @@ def update_movie(movie_id: int, movie: MovieUpdate):
 def delete_movie(movie_id: int):
     """Delete a movie"""
     try:
-        logger.info(f"Deleting movie: id={movie_id}")
+        logger.info("Deleting movie: id=%s", movie_id)
         
         query = "DELETE FROM movies WHERE id = %s"
         deleted = db.execute_delete(query, (movie_id,))
         
         if not deleted:
-            logger.warning(f"Movie not found for deletion: id={movie_id}")
+            logger.warning("Movie not found for deletion: id=%s", movie_id)
             raise HTTPException(status_code=404, detail="Movie not found")
         
-        logger.info(f"Movie deleted successfully: id={movie_id}")
+        response_cache.invalidate(f"movie:{movie_id}", "catalog")
+        home_rows.mark_dirty()
+        similar_index.mark_changed(movie_id)
+        actor_graph.mark_changed(movie_id)
+        autocomplete_index.mark_changed("movie", movie_id)
+
+        logger.info("Movie deleted successfully: id=%s", movie_id)
         return {"message": "Movie deleted successfully"}
         
     except HTTPException:
         raise
     except psycopg2.Error as e:
-        logger.error(f"Database error in delete_movie: {str(e)}")
+        logger.error("Database error in delete_movie: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in delete_movie: {str(e)}")
+        logger.error("Unexpected error in delete_movie: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.get("/search/{search_term}", response_model=dict)
-def search_movies(search_term: str):
-    """Search movies by title, director, or description"""
+def search_movies(
+    search_term: str,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    mode: str = Query("fulltext", pattern="^(fulltext|substring)$")
+):
+    """
+    Search movies by title, director, or description
+
+    Query Parameters:
+    - limit: Maximum number of movies to return
+    - cursor: Opaque cursor from a previous page's next_cursor
+    - mode: "fulltext" ranks matches by relevance (title > director > description);
+      "substring" matches anywhere in the text, newest first
+    """
     try:
-        logger.info(f"Searching movies: term='{search_term}'")
+        logger.info("Searching movies: term='%s', mode=%s, limit=%s", search_term, mode, limit)
         
         # Sanitize search term
         search_term = search_term.strip()
@@ -374,84 +986,78 @@ def search_movies(search_term: str):
             logger.warning("Empty search term provided")
             raise HTTPException(status_code=400, detail="Search term cannot be empty")
         
-        query = """
-            SELECT m.id, m.title, d.name as director, m.release_year, 
-                   g.name as genre, m.rating, m.description, m.language, 
-                   m.image_url, m.created_at
-            FROM movies m
-            JOIN directors d ON m.director_id = d.id
-            JOIN genres g ON m.genre_id = g.id
-            WHERE m.title ILIKE %s OR d.name ILIKE %s OR m.description ILIKE %s
-            ORDER BY m.created_at DESC
-        """
-        search_pattern = f"%{search_term}%"
-        movies = db.execute_query(query, (search_pattern, search_pattern, search_pattern))
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
         
-        logger.info(f"Search returned {len(movies)} results")
-        return {"movies": movies, "count": len(movies)}
+        query, params = search_query(search_term, mode, after, limit)
+        page = keyset_page(db.execute_query(query, params), limit, SEARCH_CURSOR_KEYS[mode])
+
+        logger.info("Search returned %s results", page["count"])
+        return FastJSONResponse(page)
         
     except HTTPException:
         raise
     except psycopg2.Error as e:
-        logger.error(f"Database error in search_movies: {str(e)}")
+        logger.error("Database error in search_movies: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in search_movies: {str(e)}")
+        logger.error("Unexpected error in search_movies: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-
-
-
 @router.get("/genre/{genre_name}", response_model=dict)
 def get_movies_by_genre_paginated(
     genre_name: str,
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+    include_total: bool = False
 ):
     """
     Get paginated movies for a specific genre
     
-    Optimized for infinite scroll - returns movies in batches
+    Optimized for infinite scroll - returns movies in batches. Pass the
+    previous page's next_cursor to continue; the cursor keys on
+    (rating, created_at, id) so every page costs the same. offset is kept
+    for backwards compatibility and ignored when a cursor is given.
+
+    Query Parameters:
+    - limit: Maximum number of movies to return
+    - offset: Number of movies to skip (legacy)
+    - cursor: Opaque cursor from a previous page's next_cursor
+    - include_total: Also count all movies in the genre
     """
     try:
-        logger.info(f"Fetching movies for genre '{genre_name}': limit={limit}, offset={offset}")
+        logger.info("Fetching movies for genre '%s': limit=%s, offset=%s, cursor=%s", genre_name, limit, offset, cursor)
         
-        query = """
-            SELECT m.id, m.title, d.name as director, m.release_year, 
-                   g.name as genre, m.rating, m.description, m.language, 
-                   m.image_url, m.created_at
-            FROM movies m
-            JOIN directors d ON m.director_id = d.id
-            JOIN genres g ON m.genre_id = g.id
-            WHERE g.name ILIKE %s
-            ORDER BY m.rating DESC NULLS LAST, m.created_at DESC
-            LIMIT %s OFFSET %s
-        """
-        movies = db.execute_query(query, (genre_name, limit, offset))
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
         
-        # Get total count for this genre
-        count_query = """
-            SELECT COUNT(*) as total
-            FROM movies m
-            JOIN genres g ON m.genre_id = g.id
-            WHERE g.name ILIKE %s
-        """
-        count_result = db.execute_query(count_query, (genre_name,), fetch_one=True)
-        total = count_result['total'] if count_result else 0
+        genre_ids = db.resolve_ids({"genres": genre_name})["genres"]
+        query, params = genre_page_query(genre_ids, after, offset, limit)
+        response = keyset_page(db.execute_query(query, params), limit, GENRE_PAGE_CURSOR_KEYS)
         
-        logger.info(f"Retrieved {len(movies)} movies for genre '{genre_name}'")
-        return {
-            "movies": movies,
-            "count": len(movies),
-            "total": total,
-            "has_more": (offset + len(movies)) < total
-        }
+        if include_total:
+            count_query, count_params = genre_count_query(genre_ids)
+            count_result = db.execute_query(count_query, count_params, fetch_one=True)
+            response["total"] = count_result['total'] if count_result else 0
         
+        logger.info("Retrieved %s movies for genre '%s'", response["count"], genre_name)
+        return FastJSONResponse(response)
+
+    except HTTPException:
+        raise
     except psycopg2.Error as e:
-        logger.error(f"Database error in get_movies_by_genre_paginated: {str(e)}")
+        logger.error("Database error in get_movies_by_genre_paginated: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in get_movies_by_genre_paginated: {str(e)}")
+        logger.error("Unexpected error in get_movies_by_genre_paginated: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
-
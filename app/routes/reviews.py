@@ -1,34 +1,127 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional, List, Dict, Any
 from app.models import ReviewCreate, ReviewResponse
-from app.database import db
+from app.database import db, PoolTimeout
 from app.utils.logger import logger
+from app.utils.cache import response_cache
+from app.utils.responses import FastJSONResponse
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.services import review_aggregates
+from app.services.home_rows import home_rows
 import psycopg2
 
 router = APIRouter(prefix="/api", tags=["reviews"])
 
 
+# Newest-first review pages, keyed on (created_at, id)
+REVIEWS_FIRST_PAGE_QUERY = """
+    SELECT id, movie_id, reviewer_name, rating, comment, created_at
+    FROM reviews
+    WHERE movie_id = %s
+    ORDER BY created_at DESC, id DESC
+    LIMIT %s
+"""
+REVIEWS_AFTER_CURSOR_QUERY = """
+    SELECT id, movie_id, reviewer_name, rating, comment, created_at
+    FROM reviews
+    WHERE movie_id = %s AND (created_at, id) < (%s::timestamp, %s)
+    ORDER BY created_at DESC, id DESC
+    LIMIT %s
+"""
+
+# Review counts per whole-point rating bucket (10 falls in the 9-10 bucket)
+REVIEW_HISTOGRAM_QUERY = """
+    SELECT LEAST(FLOOR(rating)::int, 9) as bucket, COUNT(*) as count
+    FROM reviews
+    WHERE movie_id = %s AND rating IS NOT NULL
+    GROUP BY 1
+"""
+
+
+def review_cursor(review: Dict[str, Any]) -> str:
+    """Cursor continuing after the given review"""
+    return encode_cursor({"created_at": review["created_at"], "id": review["id"]})
+
+
+def rating_histogram(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Expand REVIEW_HISTOGRAM_QUERY rows to all ten buckets 0-1 ... 9-10, including empty ones"""
+    counts = {row["bucket"]: row["count"] for row in rows}
+    return [{"min": bucket, "max": bucket + 1, "count": counts.get(bucket, 0)} for bucket in range(10)]
+
+
+def review_rating_histogram(movie_id: int) -> List[Dict[str, Any]]:
+    """Review counts per rating bucket for a movie"""
+    return rating_histogram(db.execute_query(REVIEW_HISTOGRAM_QUERY, (movie_id,), name="review_histogram"))
+
+
 @router.get("/movies/{movie_id}/reviews", response_model=dict)
-def get_movie_reviews(movie_id: int):
-    """Get all reviews for a movie"""
+def get_movie_reviews(
+    movie_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    histogram: bool = False
+):
+    """
+    Get reviews for a movie, newest first, one page at a time
+
+    Query Parameters:
+    - limit: Reviews per page
+    - cursor: next_cursor from the previous page
+    - histogram: Include review counts per rating bucket
+    """
     try:
-        logger.info(f"Fetching reviews for movie: id={movie_id}")
+        logger.info("Fetching reviews for movie: id=%s, limit=%s, cursor=%s", movie_id, limit, cursor is not None)
+
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        movie = db.execute_query(
+            "SELECT review_count FROM movies WHERE id = %s",
+            (movie_id,),
+            fetch_one=True,
+            name="movie_review_count"
+        )
+        if not movie:
+            logger.warning("Movie not found: id=%s", movie_id)
+            raise HTTPException(status_code=404, detail="Movie not found")
         
-        query = """
-            SELECT id, movie_id, reviewer_name, rating, comment, created_at
-            FROM reviews
-            WHERE movie_id = %s
-            ORDER BY created_at DESC
-        """
-        reviews = db.execute_query(query, (movie_id,))
+        # Fetch one extra row to know whether another page follows
+        if after:
+            reviews = db.execute_query(
+                REVIEWS_AFTER_CURSOR_QUERY,
+                (movie_id, after.get("created_at"), after.get("id"), limit + 1),
+                name="movie_reviews_after"
+            )
+        else:
+            reviews = db.execute_query(REVIEWS_FIRST_PAGE_QUERY, (movie_id, limit + 1), name="movie_reviews_first")
         
-        logger.info(f"Retrieved {len(reviews)} reviews")
-        return {"reviews": reviews, "count": len(reviews)}
+        has_more = len(reviews) > limit
+        reviews = reviews[:limit]
         
+        result = {
+            "reviews": reviews,
+            "count": len(reviews),
+            "total": movie["review_count"],
+            "has_more": has_more,
+            "next_cursor": review_cursor(reviews[-1]) if has_more else None
+        }
+        if histogram:
+            result["histogram"] = review_rating_histogram(movie_id)
+
+        logger.info("Retrieved %s of %s reviews", len(reviews), movie['review_count'])
+        return FastJSONResponse(result)
+
+    except HTTPException:
+        raise
     except psycopg2.Error as e:
-        logger.error(f"Database error in get_movie_reviews: {str(e)}")
+        logger.error("Database error in get_movie_reviews: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in get_movie_reviews: {str(e)}")
+        logger.error("Unexpected error in get_movie_reviews: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -36,38 +129,34 @@ def get_movie_reviews(movie_id: int):
 def create_review(review: ReviewCreate):
     """Create a new review for a movie"""
     try:
-        logger.info(f"Creating review for movie: id={review.movie_id}")
+        logger.info("Creating review for movie: id=%s", review.movie_id)
         
-        # Check if movie exists
-        movie_check = db.execute_query(
-            "SELECT id FROM movies WHERE id = %s",
-            (review.movie_id,),
-            fetch_one=True
-        )
-        if not movie_check:
-            logger.warning(f"Movie not found for review: id={review.movie_id}")
-            raise HTTPException(status_code=404, detail="Movie not found")
-        
-        query = """
-            INSERT INTO reviews (movie_id, reviewer_name, rating, comment)
-            VALUES (%s, %s, %s, %s)
-            RETURNING id, movie_id, reviewer_name, rating, comment, created_at
-        """
-        new_review = db.execute_insert(query, (
+        # Insert and aggregate update happen in one statement
+        new_review = review_aggregates.create_review(
             review.movie_id,
             review.reviewer_name,
             review.rating,
             review.comment
-        ))
+        )
+        if not new_review:
+            logger.warning("Movie not found for review: id=%s", review.movie_id)
+            raise HTTPException(status_code=404, detail="Movie not found")
+
+        # Review counts and averages show in the genre rows and decide their sort orders
+        genre_id = new_review.pop("genre_id")
+        response_cache.invalidate(f"movie:{review.movie_id}", f"genre:{genre_id}")
+        home_rows.mark_dirty()
         
-        logger.info(f"Review created successfully: id={new_review['id']}")
+        logger.info("Review created successfully: id=%s", new_review['id'])
         return new_review
         
     except HTTPException:
         raise
     except psycopg2.Error as e:
-        logger.error(f"Database error in create_review: {str(e)}")
+        logger.error("Database error in create_review: %s", e)
         raise HTTPException(status_code=500, detail="Database error occurred")
+    except PoolTimeout:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error in create_review: {str(e)}")
+        logger.error("Unexpected error in create_review: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
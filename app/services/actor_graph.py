@@ -0,0 +1,348 @@
+"""
+Actor collaboration graph
+
+movie_actors held in memory as a movies x actors incidence matrix in CSR form,
+plus its transpose (actors x movies), so "co-stars of an actor" is two array
+gathers. Shortest co-star paths use a bidirectional breadth-first search that
+expands whole frontiers with numpy, always from the smaller side.
+
+Cast writes queue the movies they touch with mark_changed(); the next query
+(or refresh()) re-reads only those movies' casts and splices their rows in.
+Writes made by other processes move the movie_actors change counter instead:
+queries compare it every INDEX_VERSION_CHECK_SECONDS and rebuild in the
+background when it moved.
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+import numpy as np
+from scipy import sparse
+from app.config import settings
+from app.database import db
+from app.utils.conditional import table_versions
+from app.utils.csr import append_empty_rows, gather_rows, replace_row
+from app.utils.logger import logger
+
+CAST_QUERY = "SELECT movie_id, actor_id FROM movie_actors"
+
+CHANGED_CAST_QUERY = """
+    SELECT m.id as movie_id, ma.actor_id
+    FROM movies m
+    LEFT JOIN movie_actors ma ON ma.movie_id = m.id
+    WHERE m.id = ANY(%s)
+"""
+
+UNVISITED = -1
+
+# Tables with change counters (migrations/007) the graph is read from; deleting a
+# movie deletes its credits, which moves movie_actors too
+VERSION_TABLES = ("movie_actors",)
+
+
+class ActorGraph:
+    """Bipartite actor/movie graph with co-star path and neighbourhood queries"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._pending: Set[int] = set()
+        self._stale = False
+        self._version_lock = threading.Lock()
+        self._version_checked = 0.0
+        self._rebuilding = False
+        self.version = None
+        self.built = False
+        self.built_at: Optional[float] = None
+        self._reset()
+
+    def _reset(self):
+        self.movie_ids = np.zeros(0, dtype=np.int64)
+        self.actor_ids = np.zeros(0, dtype=np.int64)
+        self.movie_row: Dict[int, int] = {}
+        self.actor_row: Dict[int, int] = {}
+        self.cast = sparse.csr_matrix((0, 0), dtype=np.int8)
+        self.filmography = sparse.csr_matrix((0, 0), dtype=np.int8)
+
+    # ------------------------------------------------------------------ build
+
+    def build(self):
+        """Rebuild the whole graph from movie_actors"""
+        started = time.perf_counter()
+        # Read before the rows: changes made while they are read move the version again
+        queued = set(self._pending)
+        version = table_versions(VERSION_TABLES)
+        rows = db.execute_query(CAST_QUERY)
+        movie_ids = np.fromiter((row["movie_id"] for row in rows), dtype=np.int64, count=len(rows))
+        actor_ids = np.fromiter((row["actor_id"] for row in rows), dtype=np.int64, count=len(rows))
+        with self._lock:
+            self._reset()
+            self.movie_ids, movie_index = np.unique(movie_ids, return_inverse=True)
+            self.actor_ids, actor_index = np.unique(actor_ids, return_inverse=True)
+            self.movie_row = {int(movie_id): row for row, movie_id in enumerate(self.movie_ids)}
+            self.actor_row = {int(actor_id): row for row, actor_id in enumerate(self.actor_ids)}
+            self.cast = sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.int8), (movie_index, actor_index)),
+                shape=(len(self.movie_ids), len(self.actor_ids))
+            )
+            self.filmography = self.cast.T.tocsr()
+            # Changes queued after the rows were read are still to be applied
+            self._pending -= queued
+            self._stale = False
+            self.version = version
+            self.built = True
+            self.built_at = time.time()
+        logger.info(
+            "Actor graph built: %s actors, %s movies, %s credits in %.2fs",
+            len(self.actor_ids), len(self.movie_ids), len(rows), time.perf_counter() - started
+        )
+
+    def start(self):
+        """Build the graph in the background so startup isn't held up"""
+        if not settings.ACTOR_GRAPH_ENABLED:
+            return
+        threading.Thread(target=self._build_in_background, name="actor-graph-build", daemon=True).start()
+
+    def _build_in_background(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error("Failed to build actor graph: %s", e)
+
+    def _check_version(self):
+        """Rebuild in the background when another process changed the credits since the last build"""
+        if self.version is None or settings.INDEX_VERSION_CHECK_SECONDS <= 0:
+            return
+        with self._version_lock:
+            now = time.monotonic()
+            if self._rebuilding or now - self._version_checked < settings.INDEX_VERSION_CHECK_SECONDS:
+                return
+            self._version_checked = now
+            with db.use_primary():
+                version = table_versions(VERSION_TABLES)
+            if version == self.version:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild_in_background, name="actor-graph-rebuild", daemon=True).start()
+
+    def _rebuild_in_background(self):
+        try:
+            # Queries keep reading the current graph until the new one is swapped in
+            with db.use_primary():
+                self.build()
+        except Exception as e:
+            logger.error("Failed to rebuild actor graph: %s", e)
+        finally:
+            self._rebuilding = False
+
+    # ------------------------------------------------------------ incremental
+
+    def mark_changed(self, *movie_ids: int):
+        """Queue movies whose cast changed or that were created or deleted"""
+        with self._lock:
+            self._pending.update(movie_ids)
+
+    def mark_actor_removed(self, actor_id: int):
+        """Queue every movie the deleted actor appeared in"""
+        with self._lock:
+            row = self.actor_row.get(actor_id)
+            if row is not None:
+                movies = self.filmography.indices[self.filmography.indptr[row]:self.filmography.indptr[row + 1]]
+                self._pending.update(int(movie_id) for movie_id in self.movie_ids[movies])
+
+    def mark_stale(self):
+        """Request a full rebuild on the next refresh (e.g. after a bulk import)"""
+        self._stale = True
+
+    def refresh(self):
+        """Apply queued changes; falls back to a full build when many movies changed"""
+        with self._lock, db.use_primary():
+            if not self.built or self._stale:
+                self.build()
+                return
+            if not self._pending:
+                return
+            pending = sorted(self._pending)
+            self._pending.clear()
+            if len(pending) > max(100, len(self.movie_ids) // 10):
+                self.build()
+                return
+            started = time.perf_counter()
+            self._apply_changes(pending)
+        logger.info("Actor graph updated for %s movies in %.1fms", len(pending), (time.perf_counter() - started) * 1000)
+
+    def _apply_changes(self, movie_ids: List[int]):
+        casts: Dict[int, List[int]] = {movie_id: [] for movie_id in movie_ids}
+        existing = set()
+        for row in db.execute_query(CHANGED_CAST_QUERY, (movie_ids,)):
+            existing.add(row["movie_id"])
+            if row["actor_id"] is not None:
+                casts[row["movie_id"]].append(row["actor_id"])
+
+        new_movies = [movie_id for movie_id in movie_ids if movie_id in existing and movie_id not in self.movie_row]
+        if new_movies:
+            for movie_id in new_movies:
+                self.movie_row[movie_id] = len(self.movie_row)
+            self.movie_ids = np.append(self.movie_ids, new_movies)
+            self.cast = append_empty_rows(self.cast, len(new_movies))
+
+        new_actors = sorted({actor_id for cast in casts.values() for actor_id in cast} - self.actor_row.keys())
+        for actor_id in new_actors:
+            self.actor_row[actor_id] = len(self.actor_row)
+        if new_actors:
+            self.actor_ids = np.append(self.actor_ids, new_actors)
+
+        for movie_id in movie_ids:
+            row = self.movie_row.get(movie_id)
+            if row is None:
+                continue
+            cols = np.array(sorted(self.actor_row[actor_id] for actor_id in casts[movie_id]), dtype=np.int32)
+            vector = sparse.csr_matrix(
+                (np.ones(len(cols), dtype=np.int8), cols, np.array([0, len(cols)])),
+                shape=(1, len(self.actor_ids))
+            )
+            self.cast = replace_row(self.cast, row, vector, len(self.actor_ids))
+        self.filmography = self.cast.T.tocsr()
+
+    def _ensure_fresh(self):
+        self._check_version()
+        if not self.built or self._stale or self._pending:
+            self.refresh()
+
+    # ---------------------------------------------------------------- queries
+
+    def _costars(self, actors: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        One co-star hop from a set of actor rows
+
+        Returns:
+            Arrays of (source actor row, shared movie row, reached actor row)
+        """
+        source, movies = gather_rows(self.filmography, actors)
+        # One (movie, source) pair per movie is enough to reach its whole cast
+        movies, first = np.unique(movies, return_index=True)
+        source = source[first]
+        via, reached = gather_rows(self.cast, movies)
+        lookup = np.searchsorted(movies, via)
+        return source[lookup], via, reached
+
+    def shortest_path(
+        self, from_actor_id: int, to_actor_id: int, max_degrees: int = 6
+    ) -> Optional[List[Tuple[int, Optional[int]]]]:
+        """
+        Shortest co-star chain between two actors by bidirectional BFS
+
+        Returns:
+            List of (actor_id, movie_id shared with the previous actor) starting at
+            (from_actor_id, None), or None when the actors are not connected
+            within max_degrees
+        """
+        self._ensure_fresh()
+        with self._lock:
+            start = self.actor_row.get(from_actor_id)
+            goal = self.actor_row.get(to_actor_id)
+            if start is None or goal is None:
+                return None
+            if start == goal:
+                return [(from_actor_id, None)]
+
+            n = len(self.actor_ids)
+            # Per side: depth, parent actor row and the movie linking them
+            depth = [np.full(n, UNVISITED, dtype=np.int32), np.full(n, UNVISITED, dtype=np.int32)]
+            parent = [np.full(n, UNVISITED, dtype=np.int64), np.full(n, UNVISITED, dtype=np.int64)]
+            via = [np.full(n, UNVISITED, dtype=np.int64), np.full(n, UNVISITED, dtype=np.int64)]
+            frontier = [np.array([start]), np.array([goal])]
+            level = [0, 0]
+            depth[0][start] = 0
+            depth[1][goal] = 0
+
+            while level[0] + level[1] < max_degrees and len(frontier[0]) and len(frontier[1]):
+                side = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+                other = 1 - side
+                source, movies, reached = self._costars(frontier[side])
+                fresh = depth[side][reached] == UNVISITED
+                reached, first = np.unique(reached[fresh], return_index=True)
+                level[side] += 1
+                depth[side][reached] = level[side]
+                parent[side][reached] = source[fresh][first]
+                via[side][reached] = movies[fresh][first]
+                frontier[side] = reached
+
+                met = reached[depth[other][reached] != UNVISITED]
+                if len(met):
+                    meet = int(met[np.argmin(depth[other][met])])
+                    return self._join_path(meet, parent, via)
+            return None
+
+    def _join_path(self, meet: int, parent: List[np.ndarray], via: List[np.ndarray]) -> List[Tuple[int, Optional[int]]]:
+        forward = []
+        node = meet
+        while node != UNVISITED:
+            forward.append(node)
+            node = parent[0][node]
+        forward.reverse()
+
+        path = [(int(self.actor_ids[forward[0]]), None)]
+        for node in forward[1:]:
+            path.append((int(self.actor_ids[node]), int(self.movie_ids[via[0][node]])))
+        node = meet
+        while parent[1][node] != UNVISITED:
+            path.append((int(self.actor_ids[parent[1][node]]), int(self.movie_ids[via[1][node]])))
+            node = parent[1][node]
+        return path
+
+    def collaborators(self, actor_id: int, limit: int = 10) -> Optional[List[Tuple[int, int]]]:
+        """
+        Most frequent co-stars of an actor
+
+        Returns:
+            List of (actor_id, shared movie count), most shared first, or None
+            if the actor has no credits
+        """
+        self._ensure_fresh()
+        with self._lock:
+            row = self.actor_row.get(actor_id)
+            if row is None:
+                return None
+            _, movies = gather_rows(self.filmography, np.array([row]))
+            _, costars = gather_rows(self.cast, movies)
+            costars = costars[costars != row]
+            actors, counts = np.unique(costars, return_counts=True)
+            order = np.lexsort((self.actor_ids[actors], -counts))[:limit]
+            return [(int(self.actor_ids[actors[i]]), int(counts[i])) for i in order]
+
+    def neighbourhood(self, actor_id: int, hops: int = 2) -> Optional[List[int]]:
+        """
+        Number of actors first reached at each co-star hop
+
+        Returns:
+            Counts for hops 1..hops, or None if the actor has no credits
+        """
+        self._ensure_fresh()
+        with self._lock:
+            row = self.actor_row.get(actor_id)
+            if row is None:
+                return None
+            visited = np.zeros(len(self.actor_ids), dtype=bool)
+            visited[row] = True
+            frontier = np.array([row])
+            counts = []
+            for _ in range(hops):
+                _, _, reached = self._costars(frontier)
+                reached = np.unique(reached[~visited[reached]])
+                visited[reached] = True
+                counts.append(len(reached))
+                frontier = reached
+            return counts
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "built": self.built,
+            "actors": len(self.actor_ids),
+            "movies": len(self.movie_ids),
+            "credits": int(self.cast.nnz),
+            "pending_changes": len(self._pending),
+            "built_at": self.built_at
+        }
+
+
+# Global actor graph
+actor_graph = ActorGraph()
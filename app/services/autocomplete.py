@@ -0,0 +1,330 @@
+"""
+Typeahead prefix index
+
+Movie titles, actor names and director names are normalized (lowercased,
+accents and punctuation stripped) and stored as one sorted list of keys: the
+full name plus the tail starting at each later word, so "knig" finds "The Dark
+Knight". A prefix lookup is two bisects into that list. Ranges too wide to
+rank quickly (one or two letters) are ranked once and memoized until a write
+touches a name under that prefix.
+
+Writes queue the changed entries with mark_changed(); the next lookup (or
+refresh()) re-reads just those rows. A changed movie also refreshes its
+director and cast, which picks up people created by movie writes. Writes made
+by other processes move the change counters of the tables behind the index
+instead: lookups compare them every INDEX_VERSION_CHECK_SECONDS and rebuild in
+the background when they moved.
+"""
+import math
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from app.config import settings
+from app.database import db
+from app.utils.conditional import table_versions
+from app.utils.logger import logger
+
+KINDS = ("movie", "actor", "director")
+
+# Tail keys are only generated for the first few words of long names
+MAX_WORD_KEYS = 8
+
+# Upper bound on memoized wide prefixes (cleared wholesale when reached)
+MAX_MEMOIZED = 1024
+
+# Match quality, best first
+EXACT, PREFIX, WORD_PREFIX = 0, 1, 2
+
+# Tables with change counters (migrations/007) the names and popularity are read from
+VERSION_TABLES = ("movies", "actors", "directors", "movie_actors")
+
+MOVIE_ENTRIES_QUERY = """
+    SELECT id, title as name, release_year, rating, review_count
+    FROM movies
+    {where}
+"""
+
+ACTOR_ENTRIES_QUERY = """
+    SELECT a.id, a.name, COUNT(ma.movie_id) as movie_count
+    FROM actors a
+    LEFT JOIN movie_actors ma ON ma.actor_id = a.id
+    {where}
+    GROUP BY a.id
+"""
+
+DIRECTOR_ENTRIES_QUERY = """
+    SELECT d.id, d.name, COUNT(m.id) as movie_count
+    FROM directors d
+    LEFT JOIN movies m ON m.director_id = d.id
+    {where}
+    GROUP BY d.id
+"""
+
+# People credited on changed movies, refreshed alongside them
+MOVIE_PEOPLE_QUERY = """
+    SELECT 'director' as kind, director_id as id FROM movies WHERE id = ANY(%s) AND director_id IS NOT NULL
+    UNION
+    SELECT 'actor', actor_id FROM movie_actors WHERE movie_id = ANY(%s)
+"""
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and collapse everything but letters and digits to single spaces"""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def _keys(name: str) -> List[str]:
+    """Full normalized name plus the tail starting at each later word"""
+    words = normalize(name).split(" ")
+    if not words[0]:
+        return []
+    return [" ".join(words[i:]) for i in range(min(len(words), MAX_WORD_KEYS))]
+
+
+def _popularity(kind: str, row: Dict[str, Any]) -> float:
+    if kind == "movie":
+        return math.log1p(row.get("review_count") or 0) + float(row.get("rating") or 0) / 10
+    return math.log1p(row.get("movie_count") or 0)
+
+
+class AutocompleteIndex:
+    """Sorted-key prefix index over movie titles and people's names"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._pending: Set[Tuple[str, int]] = set()
+        self._stale = False
+        self._version_lock = threading.Lock()
+        self._version_checked = 0.0
+        self._rebuilding = False
+        self.version = None
+        self.built = False
+        self.built_at: Optional[float] = None
+        self._reset()
+
+    def _reset(self):
+        # (key, kind, id) sorted; the kind/id tail keeps keys unique
+        self.keys: List[Tuple[str, str, int]] = []
+        # (kind, id) -> suggestion fields, popularity and keys
+        self.entries: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._memo: Dict[Tuple[str, int, Tuple[str, ...]], List[Dict[str, Any]]] = {}
+
+    # ------------------------------------------------------------------ build
+
+    def build(self):
+        """Rebuild the whole index from the database"""
+        started = time.perf_counter()
+        # Read before the rows: changes made while they are read move the version again
+        queued = set(self._pending)
+        version = table_versions(VERSION_TABLES)
+        loaded = {
+            "movie": db.execute_query(MOVIE_ENTRIES_QUERY.format(where="")),
+            "actor": db.execute_query(ACTOR_ENTRIES_QUERY.format(where="")),
+            "director": db.execute_query(DIRECTOR_ENTRIES_QUERY.format(where=""))
+        }
+        with self._lock:
+            self._reset()
+            for kind, rows in loaded.items():
+                for row in rows:
+                    entry = self._entry(kind, row)
+                    self.entries[(kind, row["id"])] = entry
+                    self.keys.extend((key, kind, row["id"]) for key in entry["keys"])
+            self.keys.sort()
+            # Changes queued after the rows were read are still to be applied
+            self._pending -= queued
+            self._stale = False
+            self.version = version
+            self.built = True
+            self.built_at = time.time()
+        logger.info(
+            "Autocomplete index built: %s names, %s keys in %.2fs",
+            len(self.entries), len(self.keys), time.perf_counter() - started
+        )
+
+    @staticmethod
+    def _entry(kind: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        suggestion = {"type": kind, "id": row["id"], "name": row["name"]}
+        if kind == "movie":
+            suggestion["release_year"] = row.get("release_year")
+        return {
+            "suggestion": suggestion,
+            "popularity": _popularity(kind, row),
+            "keys": _keys(row["name"])
+        }
+
+    def start(self):
+        """Build the index in the background so startup isn't held up"""
+        if not settings.AUTOCOMPLETE_ENABLED:
+            return
+        threading.Thread(target=self._build_in_background, name="autocomplete-build", daemon=True).start()
+
+    def _build_in_background(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error("Failed to build autocomplete index: %s", e)
+
+    def _check_version(self):
+        """Rebuild in the background when another process changed the tables since the last build"""
+        if self.version is None or settings.INDEX_VERSION_CHECK_SECONDS <= 0:
+            return
+        with self._version_lock:
+            now = time.monotonic()
+            if self._rebuilding or now - self._version_checked < settings.INDEX_VERSION_CHECK_SECONDS:
+                return
+            self._version_checked = now
+            with db.use_primary():
+                version = table_versions(VERSION_TABLES)
+            if version == self.version:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild_in_background, name="autocomplete-rebuild", daemon=True).start()
+
+    def _rebuild_in_background(self):
+        try:
+            # Lookups keep reading the current index until the new one is swapped in
+            with db.use_primary():
+                self.build()
+        except Exception as e:
+            logger.error("Failed to rebuild autocomplete index: %s", e)
+        finally:
+            self._rebuilding = False
+
+    # ------------------------------------------------------------ incremental
+
+    def mark_changed(self, kind: str, *ids: int):
+        """Queue entries of one kind that were created, renamed or deleted"""
+        with self._lock:
+            self._pending.update((kind, entry_id) for entry_id in ids if entry_id is not None)
+
+    def mark_stale(self):
+        """Request a full rebuild on the next refresh (e.g. after a bulk import)"""
+        self._stale = True
+
+    def refresh(self):
+        """Apply queued changes, building the index first if needed"""
+        with self._lock, db.use_primary():
+            if not self.built or self._stale:
+                self.build()
+                return
+            if not self._pending:
+                return
+            pending = set(self._pending)
+            self._pending.clear()
+            started = time.perf_counter()
+            touched = self._apply_changes(pending)
+            # Only memoized prefixes of added or removed keys can have changed
+            stale = [memo_key for memo_key in self._memo if any(key.startswith(memo_key[0]) for key in touched)]
+            for memo_key in stale:
+                del self._memo[memo_key]
+        logger.info(
+            "Autocomplete index updated for %s names in %.1fms", len(pending), (time.perf_counter() - started) * 1000
+        )
+
+    def _apply_changes(self, pending: Set[Tuple[str, int]]) -> Set[str]:
+        """Re-read pending entries and return the keys added or removed"""
+        touched: Set[str] = set()
+        movie_ids = sorted(entry_id for kind, entry_id in pending if kind == "movie")
+        if movie_ids:
+            for row in db.execute_query(MOVIE_PEOPLE_QUERY, (movie_ids, movie_ids)):
+                pending.add((row["kind"], row["id"]))
+
+        queries = {"movie": MOVIE_ENTRIES_QUERY, "actor": ACTOR_ENTRIES_QUERY, "director": DIRECTOR_ENTRIES_QUERY}
+        aliases = {"movie": "id", "actor": "a.id", "director": "d.id"}
+        for kind in KINDS:
+            ids = sorted(entry_id for pending_kind, entry_id in pending if pending_kind == kind)
+            if not ids:
+                continue
+            rows = db.execute_query(queries[kind].format(where=f"WHERE {aliases[kind]} = ANY(%s)"), (ids,))
+            for entry_id in ids:
+                touched.update(self._remove(kind, entry_id))
+            for row in rows:
+                touched.update(self._add(kind, row))
+        return touched
+
+    def _remove(self, kind: str, entry_id: int) -> List[str]:
+        entry = self.entries.pop((kind, entry_id), None)
+        if entry is None:
+            return []
+        for key in entry["keys"]:
+            position = bisect_left(self.keys, (key, kind, entry_id))
+            if position < len(self.keys) and self.keys[position] == (key, kind, entry_id):
+                del self.keys[position]
+        return entry["keys"]
+
+    def _add(self, kind: str, row: Dict[str, Any]) -> List[str]:
+        entry = self._entry(kind, row)
+        self.entries[(kind, row["id"])] = entry
+        for key in entry["keys"]:
+            insort(self.keys, (key, kind, row["id"]))
+        return entry["keys"]
+
+    # ----------------------------------------------------------------- lookup
+
+    def suggest(self, query: str, limit: int = 10, types: Iterable[str] = KINDS) -> List[Dict[str, Any]]:
+        """
+        Ranked suggestions whose name, or a word in it, starts with query
+
+        Exact names rank first, then names starting with the query, then names
+        with a later word starting with it; ties go to the more popular entry.
+        """
+        self._check_version()
+        if not self.built or self._stale or self._pending:
+            self.refresh()
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        types = tuple(sorted(set(types)))
+
+        with self._lock:
+            memo_key = (prefix, limit, types)
+            memoized = self._memo.get(memo_key)
+            if memoized is not None:
+                return memoized
+
+            lo = bisect_left(self.keys, (prefix,))
+            hi = bisect_left(self.keys, (prefix + "\uffff",))
+            best: Dict[Tuple[str, int], Tuple] = {}
+            for position in range(lo, hi):
+                key, kind, entry_id = self.keys[position]
+                if kind not in types:
+                    continue
+                entry = self.entries[(kind, entry_id)]
+                full_key = entry["keys"][0]
+                if key == full_key:
+                    match = EXACT if key == prefix else PREFIX
+                else:
+                    match = WORD_PREFIX
+                rank = (match, -entry["popularity"], len(full_key), full_key, kind, entry_id)
+                current = best.get((kind, entry_id))
+                if current is None or rank < current:
+                    best[(kind, entry_id)] = rank
+
+            ranked = sorted(best.values())[:limit]
+            suggestions = [self.entries[(kind, entry_id)]["suggestion"] for *_, kind, entry_id in ranked]
+            if hi - lo > settings.AUTOCOMPLETE_MEMO_MIN_MATCHES:
+                if len(self._memo) >= MAX_MEMOIZED:
+                    self._memo.clear()
+                self._memo[memo_key] = suggestions
+            return suggestions
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "built": self.built,
+            "names": len(self.entries),
+            "keys": len(self.keys),
+            "memoized_prefixes": len(self._memo),
+            "pending_changes": len(self._pending),
+            "built_at": self.built_at
+        }
+
+
+# Global autocomplete index
+autocomplete_index = AutocompleteIndex()
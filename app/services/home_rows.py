@@ -0,0 +1,162 @@
+"""
+Precomputed home-page rows
+
+Serves the unfiltered GET /api/movies from the home_genre_rows materialized
+view (migrations/004_home_genre_rows.sql). A background thread refreshes it
+CONCURRENTLY, soon after movie writes mark it dirty and at least every
+HOME_ROWS_REFRESH_SECONDS otherwise. An advisory lock lets one worker refresh
+at a time; the refresh time is kept in home_genre_rows_refresh
+(migrations/008_home_rows_refresh.sql) so every worker can tell when its cached
+copy is older than the view.
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import psycopg2
+from app.config import settings
+from app.database import db
+from app.utils.cache import response_cache
+from app.utils.logger import logger
+
+# Cache tag for responses built from the view; dropped after every refresh
+HOME_ROWS_TAG = "home_rows"
+
+# The rows with the time they were computed, read in one snapshot; the view and its
+# refresh time are committed together
+HOME_ROWS_QUERY = """
+    SELECT h.genre_id, h.genre_name, h.genre_description, h.movie_count, h.movies, r.refreshed_at
+    FROM home_genre_rows_refresh r
+    LEFT JOIN home_genre_rows h ON true
+    ORDER BY h.movie_count DESC, h.genre_name
+"""
+
+# Version of the view: the one row of home_genre_rows_refresh
+HOME_ROWS_VERSION_QUERY = "SELECT refreshed_at FROM home_genre_rows_refresh"
+
+VIEW_EXISTS_QUERY = """
+    SELECT to_regclass('home_genre_rows') IS NOT NULL
+           AND to_regclass('home_genre_rows_refresh') IS NOT NULL AS exists
+"""
+
+# Held until the refresh commits; workers that don't get it leave the refresh to the holder
+REFRESH_LOCK_STATEMENT = "SELECT pg_try_advisory_xact_lock(hashtext('home_genre_rows')) AS locked"
+
+REFRESH_STATEMENT = "REFRESH MATERIALIZED VIEW CONCURRENTLY home_genre_rows"
+
+RECORD_REFRESH_STATEMENT = "UPDATE home_genre_rows_refresh SET refreshed_at = now()"
+
+
+class HomeRowsRefresher:
+    """Keeps home_genre_rows fresh and reports whether it can be served from"""
+
+    def __init__(self):
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.available = False
+        self.last_refresh: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the refresh thread if the view has been migrated"""
+        if not settings.HOME_ROWS_ENABLED or self.running:
+            return
+        self.available = bool(db.execute_query(VIEW_EXISTS_QUERY, fetch_one=True)["exists"])
+        if not self.available:
+            logger.warning("home_genre_rows view not found; home page rows are served live")
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="home-rows-refresh", daemon=True)
+        self._thread.start()
+        logger.info("Home rows refresher started (every %ss or on write)", settings.HOME_ROWS_REFRESH_SECONDS)
+
+    def stop(self):
+        """Stop the refresh thread"""
+        self._stop.set()
+        self._dirty.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+        self.available = False
+
+    def mark_dirty(self):
+        """Request a refresh after a write that changes movies, genres or directors"""
+        self._dirty.set()
+
+    def refresh(self) -> bool:
+        """
+        Refresh the view now and drop cached responses built from it
+
+        Returns:
+            False if another worker is refreshing; this one is marked dirty to retry after it
+        """
+        started = time.perf_counter()
+        with db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(REFRESH_LOCK_STATEMENT)
+            locked = cursor.fetchone()[0]
+            if locked:
+                cursor.execute(REFRESH_STATEMENT)
+                cursor.execute(RECORD_REFRESH_STATEMENT)
+        self.last_refresh = time.monotonic()
+        if not locked:
+            # The running refresh may have started before this worker's writes committed
+            logger.info("home_genre_rows is being refreshed by another worker")
+            self._dirty.set()
+            return False
+        response_cache.invalidate(HOME_ROWS_TAG)
+        logger.info("Refreshed home_genre_rows in %.3fs", time.perf_counter() - started)
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._dirty.wait(settings.HOME_ROWS_REFRESH_SECONDS)
+            if self._stop.is_set():
+                break
+            # Coalesce bursts of writes into one refresh
+            if self.last_refresh is not None:
+                gap = settings.HOME_ROWS_MIN_INTERVAL_SECONDS - (time.monotonic() - self.last_refresh)
+                if gap > 0 and self._stop.wait(gap):
+                    break
+            self._dirty.clear()
+            try:
+                self.refresh()
+            except psycopg2.Error as e:
+                logger.error("Failed to refresh home_genre_rows: %s", e)
+            except Exception as e:
+                logger.error("Unexpected error refreshing home_genre_rows: %s", e)
+
+
+def read_home_rows(limit_per_genre: int) -> Tuple[List[Dict[str, Any]], Any]:
+    """
+    Read the precomputed rows, trimmed to limit_per_genre movies each
+
+    Returns:
+        Tuple of (categories in the GET /api/movies shape, refreshed_at)
+    """
+    rows = db.execute_query(HOME_ROWS_QUERY, name="home_genre_rows")
+    refreshed_at = rows[0]["refreshed_at"] if rows else None
+    categories = [
+        {
+            "genre_id": row["genre_id"],
+            "genre_name": row["genre_name"],
+            "genre_description": row["genre_description"],
+            "movie_count": row["movie_count"],
+            "movies": row["movies"][:limit_per_genre]
+        }
+        for row in rows
+        if row["genre_id"] is not None
+    ]
+    return categories, refreshed_at
+
+
+def read_home_rows_refreshed_at() -> Any:
+    """When the rows read_home_rows would return were computed"""
+    return db.execute_query(HOME_ROWS_VERSION_QUERY, fetch_one=True, name="home_genre_rows_version")["refreshed_at"]
+
+
+# Global refresher instance
+home_rows = HomeRowsRefresher()
@@ -0,0 +1,234 @@
+"""
+Bulk catalog import
+
+Loads NDJSON movie records (same fields as MovieCreate, one object per line)
+by staging them with COPY and resolving directors, genres and actors
+set-wise, all in a single transaction.
+
+Usage:
+    python -m app.services.importer catalog.ndjson
+"""
+import argparse
+import io
+import json
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+from pydantic import ValidationError
+from app.database import db, db_pool
+from app.models import MovieCreate
+from app.utils.logger import logger
+
+# Cap on per-line errors echoed back to the caller
+MAX_REPORTED_ERRORS = 100
+
+STAGING_DDL = """
+    CREATE TEMP TABLE import_movies (
+        line_no INTEGER PRIMARY KEY,
+        title TEXT,
+        director_name TEXT,
+        genre_name TEXT,
+        release_year INTEGER,
+        rating NUMERIC,
+        description TEXT,
+        language TEXT,
+        image_url TEXT,
+        movie_id INTEGER
+    ) ON COMMIT DROP;
+    CREATE TEMP TABLE import_cast (
+        line_no INTEGER,
+        position INTEGER,
+        actor_name TEXT,
+        role TEXT
+    ) ON COMMIT DROP;
+"""
+
+RESOLVE_STATEMENTS = [
+    # Genres have a unique name, so conflicts can be skipped directly
+    """
+    INSERT INTO genres (name)
+    SELECT DISTINCT genre_name FROM import_movies
+    ON CONFLICT (name) DO NOTHING
+    """,
+    # Directors and actors have no unique name constraint; insert only the missing names
+    """
+    INSERT INTO directors (name)
+    SELECT DISTINCT s.director_name
+    FROM import_movies s
+    WHERE NOT EXISTS (SELECT 1 FROM directors d WHERE d.name = s.director_name)
+    """,
+    """
+    INSERT INTO actors (name)
+    SELECT DISTINCT c.actor_name
+    FROM import_cast c
+    WHERE NOT EXISTS (SELECT 1 FROM actors a WHERE a.name = c.actor_name)
+    """,
+    # Pre-assign movie ids so cast rows can reference them
+    """
+    UPDATE import_movies SET movie_id = nextval(pg_get_serial_sequence('movies', 'id'))
+    """
+]
+
+INSERT_MOVIES = """
+    INSERT INTO movies (id, title, director_id, genre_id, release_year, rating, description, language, image_url)
+    SELECT s.movie_id, s.title, d.id, g.id, s.release_year, s.rating, s.description, s.language, s.image_url
+    FROM import_movies s
+    JOIN (
+        SELECT d.name, MIN(d.id) as id
+        FROM directors d
+        JOIN (SELECT DISTINCT director_name FROM import_movies) n ON n.director_name = d.name
+        GROUP BY d.name
+    ) d ON d.name = s.director_name
+    JOIN genres g ON g.name = s.genre_name
+    ORDER BY s.line_no
+"""
+
+INSERT_CAST = """
+    INSERT INTO movie_actors (movie_id, actor_id, role)
+    SELECT DISTINCT ON (s.movie_id, a.id) s.movie_id, a.id, c.role
+    FROM import_cast c
+    JOIN import_movies s ON s.line_no = c.line_no
+    JOIN (
+        SELECT a.name, MIN(a.id) as id
+        FROM actors a
+        JOIN (SELECT DISTINCT actor_name FROM import_cast) n ON n.actor_name = a.name
+        GROUP BY a.name
+    ) a ON a.name = c.actor_name
+    ORDER BY s.movie_id, a.id, c.position DESC
+"""
+
+
+def _copy_value(value: Any) -> str:
+    """Format a value for COPY text format"""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_buffer(rows: Iterable[Tuple]) -> io.StringIO:
+    """Build an in-memory COPY text payload"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def parse_ndjson(lines: Iterable[str]) -> Tuple[List[Tuple[int, MovieCreate]], List[Dict[str, Any]]]:
+    """
+    Validate NDJSON movie records
+
+    Returns:
+        Tuple of (valid (line_no, movie) pairs, per-line errors)
+    """
+    movies = []
+    errors = []
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            movies.append((line_no, MovieCreate(**json.loads(line))))
+        except (ValueError, TypeError, ValidationError) as e:
+            errors.append({"line": line_no, "error": str(e)})
+    return movies, errors
+
+
+def import_catalog(lines: Iterable[str]) -> Dict[str, Any]:
+    """
+    Import NDJSON movie records in one transaction
+
+    Invalid lines are skipped and reported; valid ones are all committed together.
+
+    Returns:
+        Import summary with row counts and throughput
+    """
+    started = time.perf_counter()
+    movies, errors = parse_ndjson(lines)
+
+    movie_rows = []
+    cast_rows = []
+    for line_no, movie in movies:
+        movie_rows.append((
+            line_no,
+            movie.title,
+            movie.director_name,
+            movie.genre_name,
+            movie.release_year,
+            movie.rating,
+            movie.description,
+            movie.language or 'English',
+            movie.image_url
+        ))
+        for position, cast_member in enumerate(movie.cast or []):
+            actor_name = (cast_member.get('actor_name') or '').strip()
+            if actor_name:
+                cast_rows.append((line_no, position, actor_name, cast_member.get('role', '')))
+
+    movies_imported = 0
+    cast_imported = 0
+    if movie_rows:
+        with db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(STAGING_DDL)
+            cursor.copy_expert(
+                "COPY import_movies (line_no, title, director_name, genre_name, release_year, rating, description, "
+                "language, image_url) FROM STDIN",
+                _copy_buffer(movie_rows)
+            )
+            if cast_rows:
+                cursor.copy_expert(
+                    "COPY import_cast (line_no, position, actor_name, role) FROM STDIN",
+                    _copy_buffer(cast_rows)
+                )
+            for statement in RESOLVE_STATEMENTS:
+                cursor.execute(statement)
+            cursor.execute(INSERT_MOVIES)
+            movies_imported = cursor.rowcount
+            cursor.execute(INSERT_CAST)
+            cast_imported = cursor.rowcount
+
+    elapsed = time.perf_counter() - started
+    rows = movies_imported + cast_imported
+    summary = {
+        "movies_imported": movies_imported,
+        "cast_imported": cast_imported,
+        "rejected": len(errors),
+        "errors": errors[:MAX_REPORTED_ERRORS],
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else None
+    }
+    logger.info(
+        "Catalog import: %s movies, %s cast links, %s rejected in %.2fs (%s rows/s)",
+        movies_imported, cast_imported, len(errors), elapsed, summary['rows_per_second']
+    )
+    return summary
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import movies from an NDJSON file")
+    parser.add_argument("path", help="NDJSON file with one movie per line, or - for stdin")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.path == "-":
+            summary = import_catalog(sys.stdin)
+        else:
+            with open(args.path, encoding="utf-8") as f:
+                summary = import_catalog(f)
+    finally:
+        db_pool.close_all()
+
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
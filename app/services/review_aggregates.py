@@ -0,0 +1,116 @@
+"""
+Review aggregates on movies
+
+movies.review_count, review_rating_count and review_rating_sum are updated by
+the same statement that inserts a review (avg_review_rating is a generated
+column). rebuild() recomputes them from reviews and only writes rows that
+drifted.
+
+Usage:
+    python -m app.services.review_aggregates
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional
+from app.database import db, db_pool
+from app.utils.logger import logger
+
+# Inserts a review and counts it on its movie in one statement. The UPDATE's row lock
+# keeps concurrent reviews of the same movie from losing increments, and no row
+# comes back when the movie does not exist. genre_id comes back with the review so
+# callers can invalidate the genre rows the aggregates are shown in.
+CREATE_REVIEW_QUERY = """
+    WITH counted AS (
+        UPDATE movies
+        SET review_count = review_count + 1,
+            review_rating_count = review_rating_count + (CASE WHEN %s::numeric IS NULL THEN 0 ELSE 1 END),
+            review_rating_sum = review_rating_sum + COALESCE(%s::numeric, 0)
+        WHERE id = %s
+        RETURNING id, genre_id
+    ),
+    inserted AS (
+        INSERT INTO reviews (movie_id, reviewer_name, rating, comment)
+        SELECT id, %s, %s, %s FROM counted
+        RETURNING id, movie_id, reviewer_name, rating, comment, created_at
+    )
+    SELECT i.id, i.movie_id, i.reviewer_name, i.rating, i.comment, i.created_at, c.genre_id
+    FROM inserted i
+    JOIN counted c ON c.id = i.movie_id
+"""
+
+
+def create_review_params(movie_id: int, reviewer_name: str, rating: Any, comment: Any) -> tuple:
+    """Parameters for CREATE_REVIEW_QUERY"""
+    return (rating, rating, movie_id, reviewer_name, rating, comment)
+
+
+REBUILD_QUERY = """
+    UPDATE movies m
+    SET review_count = fresh.review_count,
+        review_rating_count = fresh.review_rating_count,
+        review_rating_sum = fresh.review_rating_sum
+    FROM (
+        SELECT mv.id,
+               COUNT(r.id) AS review_count,
+               COUNT(r.rating) AS review_rating_count,
+               COALESCE(SUM(r.rating), 0) AS review_rating_sum
+        FROM movies mv
+        LEFT JOIN reviews r ON r.movie_id = mv.id
+        GROUP BY mv.id
+    ) fresh
+    WHERE m.id = fresh.id
+      AND (m.review_count, m.review_rating_count, m.review_rating_sum)
+          IS DISTINCT FROM (fresh.review_count, fresh.review_rating_count, fresh.review_rating_sum)
+    RETURNING m.id
+"""
+
+
+def create_review(movie_id: int, reviewer_name: str, rating: Any, comment: Any = None) -> Optional[Dict]:
+    """
+    Insert a review and update its movie's aggregates atomically
+
+    Returns:
+        The new review with its movie's genre_id, or None if the movie does not exist
+    """
+    return db.execute_insert(
+        CREATE_REVIEW_QUERY,
+        create_review_params(movie_id, reviewer_name, rating, comment),
+        name="create_review"
+    )
+
+
+def rebuild() -> Dict[str, Any]:
+    """
+    Recompute all review aggregates from the reviews table
+
+    Returns:
+        Summary with the number of corrected movies
+    """
+    started = time.perf_counter()
+    corrected = db.execute_query(REBUILD_QUERY)
+    elapsed = time.perf_counter() - started
+    logger.info("Review aggregates rebuilt: %s movies corrected in %.2fs", len(corrected), elapsed)
+    return {
+        "movies_corrected": len(corrected),
+        "corrected_ids": [row["id"] for row in corrected[:100]],
+        "elapsed_seconds": round(elapsed, 3)
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild movie review aggregates from the reviews table")
+    parser.parse_args(argv)
+
+    try:
+        summary = rebuild()
+    finally:
+        db_pool.close_all()
+
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Row decoding and JSON serialization benchmark
+
+Measures the CPU time spent turning query results into response bytes for
+the actors list and the home-page movie rows. Legacy means RealDictCursor rows
+passed through jsonable_encoder and JSONResponse. Fast means zipped tuple rows
+written by FastJSONResponse. Uses process time, so waiting on the database
+doesn't count; queries run against the configured database.
+
+Usage:
+    python -m app.services.serialization_benchmark --iterations 200
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, List
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from psycopg2.extras import RealDictCursor
+from app.database import ZipDictCursor, db, db_pool
+from app.routes.movies import GENRE_ROWS_QUERY, GENRE_ROW_ORDERINGS, group_genre_rows
+from app.utils.responses import FastJSONResponse, orjson
+
+ACTORS_QUERY = """
+    SELECT id, name, bio, birth_year, image_url, created_at
+    FROM actors
+    ORDER BY name, id
+    LIMIT %s
+"""
+
+
+def _fetch(cursor_factory, query: str, params: tuple) -> List[Dict[str, Any]]:
+    with db.get_connection() as conn:
+        cursor = conn.cursor(cursor_factory=cursor_factory)
+        cursor.execute(query, params)
+        return cursor.fetchall()
+
+
+def _measure(iterations: int, run: Callable[[], Any]) -> float:
+    """Average process time per call in milliseconds"""
+    started = time.process_time()
+    for _ in range(iterations):
+        run()
+    return (time.process_time() - started) * 1000 / iterations
+
+
+def benchmark(
+    name: str, query: str, params: tuple, shape: Callable[[List[Dict]], Any], iterations: int
+) -> Dict[str, Any]:
+    """Compare decode + encode CPU time for one query on both paths"""
+    def legacy():
+        rows = _fetch(RealDictCursor, query, params)
+        return JSONResponse(jsonable_encoder(shape(rows))).body
+
+    def fast():
+        rows = _fetch(ZipDictCursor, query, params)
+        return FastJSONResponse(shape(rows)).body
+
+    body = fast()
+    legacy()
+    legacy_ms = _measure(iterations, legacy)
+    fast_ms = _measure(iterations, fast)
+    return {
+        "endpoint": name,
+        "response_bytes": len(body),
+        "legacy_cpu_ms": round(legacy_ms, 3),
+        "fast_cpu_ms": round(fast_ms, 3),
+        "saved_cpu_ms": round(legacy_ms - fast_ms, 3),
+        "speedup": round(legacy_ms / fast_ms, 2) if fast_ms else None
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare legacy and fast row decoding + JSON serialization")
+    parser.add_argument("--iterations", type=int, default=200, help="Requests simulated per path")
+    parser.add_argument("--actors-limit", type=int, default=500, help="Page size for the actors list")
+    parser.add_argument("--movies-per-genre", type=int, default=10, help="limit_per_genre for the movie rows")
+    args = parser.parse_args(argv)
+
+    movie_rows_query = GENRE_ROWS_QUERY.format(where_clause="", order_by=GENRE_ROW_ORDERINGS["rating"])
+    try:
+        results = [
+            benchmark(
+                "GET /api/actors", ACTORS_QUERY, (args.actors_limit,),
+                lambda rows: {"actors": rows, "count": len(rows), "has_more": False, "next_cursor": None},
+                args.iterations
+            ),
+            benchmark(
+                "GET /api/movies", movie_rows_query, (args.movies_per_genre,),
+                lambda rows: {"categories": group_genre_rows(rows)},
+                args.iterations
+            )
+        ]
+    finally:
+        db_pool.close_all()
+
+    print(json.dumps({"encoder": "orjson" if orjson is not None else "json", "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+"""
+"More like this" index
+
+Each movie is a sparse feature vector over its actors, director and genres
+(movies.genre_id plus movie_genres), L2-normalized so the dot product of two
+rows is their cosine similarity. A full build multiplies the feature matrix by
+its transpose in row blocks and keeps the top SIMILAR_TOP_K neighbours per
+movie in dense arrays, so a lookup is an array read.
+
+Writes don't trigger a full build: changed movies are queued with
+mark_changed(), and the next lookup (or refresh()) re-reads only their
+features, replaces their rows and fixes up the neighbour lists they enter or
+leave. Writes made by other processes are only visible through the change
+counters of the tables the index reads: lookups compare them every
+INDEX_VERSION_CHECK_SECONDS and rebuild in the background when they moved.
+"""
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from scipy import sparse
+from app.config import settings
+from app.database import db
+from app.utils.conditional import table_versions
+from app.utils.csr import append_empty_rows, replace_row
+from app.utils.logger import logger
+
+# Relative weight of a shared feature of each kind
+FEATURE_WEIGHTS = {"actor": 1.0, "director": 1.5, "genre": 0.5}
+KIND_CODES = {"actor": 0, "director": 1, "genre": 2}
+
+# Rows multiplied per block during a full build; bounds the block x movies product
+BUILD_BLOCK_ROWS = 256
+
+# Tables with change counters (migrations/007) the features are read from. movie_genres
+# has none; it is only written by schema loads, which are followed by a restart
+VERSION_TABLES = ("movies", "movie_actors")
+
+# (movie_id, kind, feature_id) for every movie, or for the movies in %s
+FEATURES_QUERY = """
+    SELECT id as movie_id, 'director' as kind, director_id as feature_id
+    FROM movies WHERE director_id IS NOT NULL {movie_filter}
+    UNION
+    SELECT id, 'genre', genre_id FROM movies WHERE genre_id IS NOT NULL {movie_filter}
+    UNION
+    SELECT movie_id, 'genre', genre_id FROM movie_genres WHERE genre_id IS NOT NULL {junction_filter}
+    UNION
+    SELECT movie_id, 'actor', actor_id FROM movie_actors WHERE actor_id IS NOT NULL {junction_filter}
+"""
+
+
+def _feature_key(kind: str, feature_id: int) -> int:
+    return (KIND_CODES[kind] << 32) | int(feature_id)
+
+
+class SimilarMoviesIndex:
+    """Top-K cosine neighbours per movie over cast, director and genre"""
+
+    def __init__(self, top_k: int = None):
+        self.top_k = top_k or settings.SIMILAR_TOP_K
+        self._lock = threading.RLock()
+        self._pending: Set[int] = set()
+        self._stale = False
+        self._version_lock = threading.Lock()
+        self._version_checked = 0.0
+        self._rebuilding = False
+        self.version = None
+        self.built = False
+        self.built_at: Optional[float] = None
+        self._reset()
+
+    def _reset(self):
+        self.movie_ids = np.zeros(0, dtype=np.int64)
+        self.row_of: Dict[int, int] = {}
+        self.columns: Dict[int, int] = {}
+        self.matrix = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self.neighbors = np.full((0, self.top_k), -1, dtype=np.int32)
+        self.scores = np.zeros((0, self.top_k), dtype=np.float32)
+        self.deleted = np.zeros(0, dtype=bool)
+
+    # ------------------------------------------------------------------ build
+
+    def build(self):
+        """Rebuild the whole index from the database"""
+        started = time.perf_counter()
+        # Read before the rows: changes made while they are read move the version again
+        queued = set(self._pending)
+        version = table_versions(VERSION_TABLES)
+        rows = db.execute_query(FEATURES_QUERY.format(movie_filter="", junction_filter=""))
+        all_ids = [row["id"] for row in db.execute_query("SELECT id FROM movies ORDER BY id")]
+        with self._lock:
+            self._reset()
+            self.movie_ids = np.asarray(all_ids, dtype=np.int64)
+            self.row_of = {movie_id: row for row, movie_id in enumerate(all_ids)}
+            self.deleted = np.zeros(len(all_ids), dtype=bool)
+            self.matrix = self._feature_matrix(rows, len(all_ids))
+            self.neighbors, self.scores = self._top_k_all(self.matrix)
+            # Changes queued after the rows were read are still to be applied
+            self._pending -= queued
+            self._stale = False
+            self.version = version
+            self.built = True
+            self.built_at = time.time()
+        logger.info(
+            "Similar movies index built: %s movies, %s features in %.2fs",
+            len(all_ids), self.matrix.nnz, time.perf_counter() - started
+        )
+
+    def _feature_matrix(self, rows: Iterable[Dict[str, Any]], n_rows: int) -> sparse.csr_matrix:
+        """Normalized movies x features matrix, registering unseen features as new columns"""
+        row_index, col_index, weights = [], [], []
+        for row in rows:
+            movie_row = self.row_of.get(row["movie_id"])
+            if movie_row is None:
+                continue
+            key = _feature_key(row["kind"], row["feature_id"])
+            col = self.columns.get(key)
+            if col is None:
+                col = self.columns[key] = len(self.columns)
+            row_index.append(movie_row)
+            col_index.append(col)
+            weights.append(FEATURE_WEIGHTS[row["kind"]])
+        matrix = sparse.csr_matrix(
+            (
+                np.asarray(weights, dtype=np.float32),
+                (np.asarray(row_index, dtype=np.int64), np.asarray(col_index, dtype=np.int64))
+            ),
+            shape=(n_rows, len(self.columns))
+        )
+        return self._normalize(matrix)
+
+    @staticmethod
+    def _normalize(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.csr_matrix(sparse.diags(1.0 / norms).dot(matrix), dtype=np.float32)
+
+    def _top_k_all(self, matrix: sparse.csr_matrix) -> Tuple[np.ndarray, np.ndarray]:
+        n = matrix.shape[0]
+        neighbors = np.full((n, self.top_k), -1, dtype=np.int32)
+        scores = np.zeros((n, self.top_k), dtype=np.float32)
+        transposed = matrix.T.tocsr()
+        for start in range(0, n, BUILD_BLOCK_ROWS):
+            block = (matrix[start:start + BUILD_BLOCK_ROWS] @ transposed).tocsr()
+            for offset in range(block.shape[0]):
+                lo, hi = block.indptr[offset], block.indptr[offset + 1]
+                self._store_top_k(neighbors, scores, start + offset, block.indices[lo:hi], block.data[lo:hi])
+        return neighbors, scores
+
+    def _store_top_k(self, neighbors: np.ndarray, scores: np.ndarray, row: int, cols: np.ndarray, values: np.ndarray):
+        """Keep the top_k highest-scoring columns other than row itself"""
+        keep = (cols != row) & (values > 0)
+        cols, values = cols[keep], values[keep]
+        if len(self.deleted):
+            alive = ~self.deleted[cols]
+            cols, values = cols[alive], values[alive]
+        if len(values) > self.top_k:
+            part = np.argpartition(-values, self.top_k - 1)[:self.top_k]
+            cols, values = cols[part], values[part]
+        # Highest score first, ties broken by lower row (older movie id) for stable results
+        order = np.lexsort((cols, -values))
+        neighbors[row] = -1
+        scores[row] = 0
+        neighbors[row, :len(order)] = cols[order]
+        scores[row, :len(order)] = values[order]
+
+    def start(self):
+        """Build the index in the background so startup isn't held up"""
+        if not settings.SIMILAR_ENABLED:
+            return
+        threading.Thread(target=self._build_in_background, name="similar-index-build", daemon=True).start()
+
+    def _build_in_background(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error("Failed to build similar movies index: %s", e)
+
+    def _check_version(self):
+        """Rebuild in the background when another process changed the tables since the last build"""
+        if self.version is None or settings.INDEX_VERSION_CHECK_SECONDS <= 0:
+            return
+        with self._version_lock:
+            now = time.monotonic()
+            if self._rebuilding or now - self._version_checked < settings.INDEX_VERSION_CHECK_SECONDS:
+                return
+            self._version_checked = now
+            with db.use_primary():
+                version = table_versions(VERSION_TABLES)
+            if version == self.version:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild_in_background, name="similar-index-rebuild", daemon=True).start()
+
+    def _rebuild_in_background(self):
+        try:
+            # Lookups keep reading the current index until the new one is swapped in
+            with db.use_primary():
+                self.build()
+        except Exception as e:
+            logger.error("Failed to rebuild similar movies index: %s", e)
+        finally:
+            self._rebuilding = False
+
+    # ------------------------------------------------------------ incremental
+
+    def mark_changed(self, *movie_ids: int):
+        """Queue movies whose cast, director, genres or existence changed"""
+        with self._lock:
+            self._pending.update(movie_ids)
+
+    def mark_actor_removed(self, actor_id: int):
+        """Queue every movie the deleted actor appeared in"""
+        with self._lock:
+            col = self.columns.get(_feature_key("actor", actor_id))
+            if col is not None:
+                rows = self.matrix[:, col].nonzero()[0]
+                self._pending.update(int(movie_id) for movie_id in self.movie_ids[rows])
+
+    def mark_stale(self):
+        """Request a full rebuild on the next refresh (e.g. after a bulk import)"""
+        self._stale = True
+
+    def refresh(self):
+        """Apply queued changes; falls back to a full build when most of the catalog changed"""
+        with self._lock, db.use_primary():
+            if not self.built or self._stale:
+                self.build()
+                return
+            if not self._pending:
+                return
+            pending = sorted(self._pending)
+            self._pending.clear()
+            if len(pending) > max(100, len(self.movie_ids) // 10):
+                self.build()
+                return
+            started = time.perf_counter()
+            self._apply_changes(pending)
+        logger.info(
+            "Similar movies index updated for %s movies in %.1fms", len(pending), (time.perf_counter() - started) * 1000
+        )
+
+    def _apply_changes(self, movie_ids: List[int]):
+        existing = {row["id"] for row in db.execute_query("SELECT id FROM movies WHERE id = ANY(%s)", (movie_ids,))}
+        rows = db.execute_query(
+            FEATURES_QUERY.format(movie_filter="AND id = ANY(%s)", junction_filter="AND movie_id = ANY(%s)"),
+            (movie_ids,) * 4
+        )
+        features: Dict[int, List[Dict[str, Any]]] = {}
+        for row in rows:
+            features.setdefault(row["movie_id"], []).append(row)
+
+        for movie_id in movie_ids:
+            if movie_id in existing and movie_id not in self.row_of:
+                self._append_row(movie_id)
+
+        changed_rows = []
+        for movie_id in movie_ids:
+            row = self.row_of.get(movie_id)
+            if row is None:
+                continue
+            if movie_id in existing:
+                self.deleted[row] = False
+                vector = self._feature_matrix(features.get(movie_id, []), len(self.movie_ids))[row]
+            else:
+                self.deleted[row] = True
+                vector = sparse.csr_matrix((1, len(self.columns)), dtype=np.float32)
+            self.matrix = replace_row(self.matrix, row, vector, len(self.columns))
+            changed_rows.append(row)
+
+        affected: Set[int] = set()
+        for row in changed_rows:
+            # Rows that listed this movie before the change
+            affected.update(np.nonzero((self.neighbors == row).any(axis=1))[0].tolist())
+            scores = self._scores_against(row)
+            if self.deleted[row]:
+                self.neighbors[row] = -1
+                self.scores[row] = 0
+                continue
+            cols = np.nonzero(scores)[0]
+            self._store_top_k(self.neighbors, self.scores, row, cols, scores[cols])
+            # Rows this movie may now enter
+            for other in cols.tolist():
+                if other != row and not self.deleted[other] and scores[other] > self.scores[other, -1]:
+                    affected.add(other)
+
+        for other in affected - set(changed_rows):
+            if not self.deleted[other]:
+                scores = self._scores_against(other)
+                cols = np.nonzero(scores)[0]
+                self._store_top_k(self.neighbors, self.scores, other, cols, scores[cols])
+
+    def _append_row(self, movie_id: int):
+        row = len(self.movie_ids)
+        self.movie_ids = np.append(self.movie_ids, movie_id)
+        self.row_of[movie_id] = row
+        self.deleted = np.append(self.deleted, False)
+        self.neighbors = np.vstack([self.neighbors, np.full((1, self.top_k), -1, dtype=np.int32)])
+        self.scores = np.vstack([self.scores, np.zeros((1, self.top_k), dtype=np.float32)])
+        self.matrix = append_empty_rows(self.matrix, 1)
+
+    def _scores_against(self, row: int) -> np.ndarray:
+        """Dense cosine scores of one movie against every movie"""
+        return np.asarray(self.matrix @ self.matrix[row].T.toarray()).ravel()
+
+    # ----------------------------------------------------------------- lookup
+
+    def similar(self, movie_id: int, limit: int = 10) -> Optional[List[Tuple[int, float]]]:
+        """
+        Most similar movies as (movie_id, score) pairs, best first
+
+        Returns:
+            None if the movie is not in the catalog
+        """
+        self._check_version()
+        if not self.built or self._stale or self._pending:
+            self.refresh()
+        with self._lock:
+            row = self.row_of.get(movie_id)
+            if row is None or self.deleted[row]:
+                return None
+            neighbors = self.neighbors[row, :limit].copy()
+            scores = self.scores[row, :limit].copy()
+            movie_ids = self.movie_ids
+        return [
+            (int(movie_ids[other]), round(float(score), 4))
+            for other, score in zip(neighbors, scores)
+            if other >= 0
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "built": self.built,
+            "movies": int((~self.deleted).sum()) if self.built else 0,
+            "features": len(self.columns),
+            "pending_changes": len(self._pending),
+            "built_at": self.built_at,
+            "top_k": self.top_k
+        }
+
+
+# Global similar movies index
+similar_index = SimilarMoviesIndex()
@@ -0,0 +1,230 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Union
+from app.config import settings
+from app.utils.logger import logger
+from app.utils.metrics import registry, CallbackMetric
+
+
+class CacheBackend:
+    """Storage interface for ResponseCache backends"""
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float):
+        raise NotImplementedError
+
+    def delete(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class LRUTTLBackend(CacheBackend):
+    """
+    In-process LRU cache with per-entry expiry
+
+    Not thread-safe on its own; ResponseCache serializes access.
+    """
+
+    def __init__(self, max_entries: int, on_evict: Optional[Callable[[str], None]] = None):
+        self.max_entries = max(1, max_entries)
+        self.on_evict = on_evict
+        self._entries = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._evicted(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._evicted(evicted_key)
+
+    def delete(self, key: str) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evicted(self, key: str):
+        if self.on_evict:
+            self.on_evict(key)
+
+
+class ResponseCache:
+    """
+    Response cache with dependency tags
+
+    Each entry is stored with tags such as "movie:42" or "catalog";
+    invalidate() drops every entry carrying any of the given tags.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self._lock = threading.RLock()
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._key_tags: Dict[str, Set[str]] = {}
+        # Bumped on every invalidation so in-flight loads started before it are not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        backend.on_evict = self._on_evict
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return cached value or None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            value = self.backend.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, tags: Iterable[str], ttl: Optional[float] = None):
+        """Store a value under key with its dependency tags"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._untag(key)
+            self.backend.set(key, value, ttl or self.ttl)
+            tag_set = set(tags)
+            self._key_tags[key] = tag_set
+            for tag in tag_set:
+                self._tag_index.setdefault(tag, set()).add(key)
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        tags: Union[Iterable[str], Callable[[Any], Iterable[str]]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Return the cached value for key, or call loader and cache its result
+
+        Args:
+            key: Cache key
+            loader: Produces the value on a miss; None results are not cached
+            tags: Dependency tags, or a callable deriving them from the loaded value
+            ttl: Override the default time-to-live in seconds
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        generation = self._generation
+        value = loader()
+        if value is None or not self.enabled:
+            return value
+        with self._lock:
+            # Skip storing if a write invalidated anything while we were loading
+            if generation == self._generation:
+                self.set(key, value, tags(value) if callable(tags) else tags, ttl)
+        return value
+
+    def invalidate(self, *tags: str) -> int:
+        """Drop every entry tagged with any of tags; returns number of entries removed"""
+        with self._lock:
+            self._generation += 1
+            keys = set()
+            for tag in tags:
+                keys |= self._tag_index.get(tag, set())
+            for key in keys:
+                self.backend.delete(key)
+                self._untag(key)
+            self.invalidations += len(keys)
+        if keys:
+            logger.debug("Cache invalidated %s entries for tags %s", len(keys), tags)
+        return len(keys)
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._generation += 1
+            self.backend.clear()
+            self._tag_index.clear()
+            self._key_tags.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters for sizing the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self.backend),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+    def _on_evict(self, key: str):
+        self.evictions += 1
+        self._untag(key)
+
+    def _untag(self, key: str):
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+
+def create_response_cache() -> ResponseCache:
+    """Build the response cache from settings"""
+    backends = {
+        "memory": lambda: LRUTTLBackend(settings.CACHE_MAX_ENTRIES)
+    }
+    if settings.CACHE_BACKEND not in backends:
+        raise ValueError(f"Unknown cache backend: {settings.CACHE_BACKEND}")
+    return ResponseCache(
+        backends[settings.CACHE_BACKEND](),
+        ttl=settings.CACHE_TTL_SECONDS,
+        enabled=settings.CACHE_ENABLED
+    )
+
+
+# Global response cache instance
+response_cache = create_response_cache()
+
+
+def _cache_samples(field: str):
+    return lambda: [("", {}, response_cache.stats()[field])]
+
+
+registry.register(CallbackMetric("cache_hits_total", "Response cache hits", "counter", _cache_samples("hits")))
+registry.register(CallbackMetric("cache_misses_total", "Response cache misses", "counter", _cache_samples("misses")))
+registry.register(CallbackMetric(
+    "cache_hit_ratio", "Response cache hits / lookups since start", "gauge", _cache_samples("hit_ratio")
+))
+registry.register(CallbackMetric("cache_entries", "Entries currently cached", "gauge", _cache_samples("entries")))
+registry.register(CallbackMetric(
+    "cache_evictions_total", "Entries evicted by LRU or expiry", "counter", _cache_samples("evictions")
+))
@@ -0,0 +1,122 @@
+"""
+Conditional GET support (ETag / Last-Modified / 304)
+
+Handlers look up a resource's version with a cheap query, answer a matching
+If-None-Match or If-Modified-Since with 304 before running the full query, and
+attach the validators to 200 responses. ETags are weak: they fingerprint the
+rows a response is built from (their xmin, which changes on every write) rather
+than the response bytes. Lists use per-table change counters.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from fastapi import Request, Response
+from app.config import settings
+from app.database import db
+
+# Change counters of whole tables (migrations/007): statement triggers advance each
+# table's sequence, so this is a primary-key read that no writer waits on or blocks
+TABLE_VERSIONS_QUERY = """
+    SELECT table_name, pg_sequence_last_value(seq) as version
+    FROM table_version_seqs
+    WHERE table_name = ANY(%s)
+    ORDER BY table_name
+"""
+
+
+class Validators(NamedTuple):
+    """ETag and Last-Modified of one representation"""
+    etag: str
+    last_modified: Optional[datetime]
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified.astimezone(timezone.utc), usegmt=True)
+        return headers
+
+
+def make_validators(kind: str, fingerprint: Any, updated_at: Optional[datetime], *variant: Any) -> Validators:
+    """
+    Build validators from a version fingerprint
+
+    Args:
+        kind: Resource kind, so equal fingerprints of different resources differ
+        fingerprint: Version data from the database
+        updated_at: Last change time, sent as Last-Modified
+        variant: Request parameters that change the representation
+    """
+    key = repr((settings.API_VERSION, kind, fingerprint, variant))
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=12).hexdigest()
+    return Validators(f'W/"{digest}"', updated_at)
+
+
+def table_versions(tables: Iterable[str]) -> Tuple[Tuple[str, Optional[int]], ...]:
+    """Current change counter of each table, as (table_name, version) pairs"""
+    rows = db.execute_query(TABLE_VERSIONS_QUERY, (sorted(tables),), name="table_versions")
+    return tuple((row["table_name"], row["version"]) for row in rows)
+
+
+def table_validators(kind: str, tables: Iterable[str], *variant: Any) -> Validators:
+    """
+    Validators for a list built from whole tables
+
+    Only an ETag: deletes leave no updated_at behind, so there is no Last-Modified
+    that would reliably move forward.
+    """
+    return make_validators(kind, table_versions(tables), None, *variant)
+
+
+def pop_row_versions(row: Dict[str, Any], movies: List[Dict[str, Any]]) -> Tuple[str, str]:
+    """
+    Remove the row_version columns from a detail row and its movie rows
+
+    Returns the (row_version, credits) fingerprint the matching version query
+    computes, with the movies' row versions joined in movie id order.
+    """
+    credits = ",".join(movie["row_version"] for movie in sorted(movies, key=lambda movie: movie["id"]))
+    for movie in movies:
+        del movie["row_version"]
+    return row.pop("row_version"), credits
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_conditional(request: Request) -> bool:
+    """Whether the request carries a validator to check"""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    """
+    Whether the client's cached copy is current
+
+    If-None-Match takes precedence (weak comparison); If-Modified-Since is only
+    consulted without it, at the one-second resolution of HTTP dates.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        etag = _opaque(validators.etag)
+        return any(_opaque(tag) == etag for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and validators.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return validators.last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified(validators: Validators) -> Response:
+    """304 carrying the same validators a 200 would"""
+    return Response(status_code=304, headers=validators.headers())
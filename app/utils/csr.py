@@ -0,0 +1,41 @@
+from typing import Optional
+import numpy as np
+from scipy import sparse
+
+
+def replace_row(
+    matrix: sparse.csr_matrix, row: int, vector: sparse.csr_matrix, n_cols: Optional[int] = None
+) -> sparse.csr_matrix:
+    """
+    Return matrix with one row replaced by a 1 x n vector
+
+    Splices the CSR arrays directly (one copy of the data, no format
+    conversions). n_cols widens the result when new columns were registered.
+    """
+    lo, hi = matrix.indptr[row], matrix.indptr[row + 1]
+    data = np.concatenate([matrix.data[:lo], vector.data.astype(matrix.dtype, copy=False), matrix.data[hi:]])
+    indices = np.concatenate([matrix.indices[:lo], vector.indices, matrix.indices[hi:]])
+    indptr = matrix.indptr.copy()
+    indptr[row + 1:] += len(vector.data) - (hi - lo)
+    shape = (matrix.shape[0], max(n_cols or 0, matrix.shape[1]))
+    return sparse.csr_matrix((data, indices, indptr), shape=shape)
+
+
+def append_empty_rows(matrix: sparse.csr_matrix, count: int) -> sparse.csr_matrix:
+    """Return matrix with count empty rows added at the bottom"""
+    indptr = np.concatenate([matrix.indptr, np.full(count, matrix.indptr[-1], dtype=matrix.indptr.dtype)])
+    return sparse.csr_matrix((matrix.data, matrix.indices, indptr), shape=(matrix.shape[0] + count, matrix.shape[1]))
+
+
+def gather_rows(matrix: sparse.csr_matrix, rows: np.ndarray):
+    """
+    Column indices of the given rows, flattened
+
+    Returns:
+        Tuple of (source row for each entry, column index for each entry)
+    """
+    counts = np.diff(matrix.indptr)[rows]
+    if not len(rows) or not counts.sum():
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    sub = matrix[rows]
+    return np.repeat(rows, counts), sub.indices.astype(np.int64)
@@ -1,24 +1,144 @@
+import atexit
+import json
 import logging
+import queue
+import random
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
 from app.config import settings
+from app.utils.metrics import registry, Counter
+
+log_records_dropped = registry.register(Counter(
+    "log_records_dropped_total",
+    "Log records dropped because the log queue was full"
+))
+
+# LogRecord attributes that are not user-supplied extra fields
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "route"}
+
+# Scope key holding a request's sampling decision, so all its INFO lines are kept or dropped together
+_SAMPLED_KEY = "movies_api.log_sampled"
+
+
+def parse_route_sample_rates(value: str) -> Dict[str, float]:
+    """Parse LOG_ROUTE_SAMPLE_RATES ("/api/movies=0.1,/api/actors/{actor_id}=0.5")"""
+    rates = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        route, _, rate = item.rpartition("=")
+        if route:
+            rates[route.strip()] = float(rate)
+    return rates
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the route and any extra= fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "route": getattr(record, "route", None),
+            "thread": record.threadName
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RequestSamplingFilter(logging.Filter):
+    """
+    Keeps a sample of INFO-and-below records logged while serving a request
+
+    The rate comes from LOG_ROUTE_SAMPLE_RATES for the route template, else
+    LOG_INFO_SAMPLE_RATE. Warnings and errors, and records logged outside a
+    request (startup, background threads), are always kept. Also stamps the
+    route on each record for the JSON formatter.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.route_rates = parse_route_sample_rates(settings.LOG_ROUTE_SAMPLE_RATES)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Imported here: slow_query imports this module
+        from app.utils.slow_query import current_scope, current_route
+
+        scope = current_scope.get()
+        record.route = current_route() if scope is not None else None
+        if scope is None or record.levelno > logging.INFO:
+            return True
+        sampled = scope.get(_SAMPLED_KEY)
+        if sampled is None:
+            rate = self.route_rates.get(record.route, settings.LOG_INFO_SAMPLE_RATE)
+            sampled = scope[_SAMPLED_KEY] = rate >= 1 or random.random() < rate
+        return sampled
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks or formats on the calling thread
+
+    Records are queued as-is so %-style arguments are only rendered by the
+    listener thread, and a full queue drops the record (counted in
+    log_records_dropped_total) instead of stalling the request.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped.inc()
+
+
+def build_formatter() -> logging.Formatter:
+    if settings.LOG_FORMAT == "json":
+        return JsonFormatter()
+    return logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+
+_listener: Optional[QueueListener] = None
+
 
 def setup_logger():
     """Setup application logger"""
+    global _listener
     logger = logging.getLogger("movies_api")
     logger.setLevel(getattr(logging, settings.LOG_LEVEL))
-    
-    # Console handler
+
+    # Console handler, written from the listener thread
     handler = logging.StreamHandler(sys.stdout)
     handler.setLevel(getattr(logging, settings.LOG_LEVEL))
-    
-    # Formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    handler.setFormatter(formatter)
-    
-    logger.addHandler(handler)
+    handler.setFormatter(build_formatter())
+
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    queue_handler.addFilter(RequestSamplingFilter())
+    logger.addHandler(queue_handler)
+
+    _listener = QueueListener(queue_handler.queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
     return logger
 
+
+def stop_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 logger = setup_logger()
@@ -0,0 +1,43 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+from fastapi.responses import JSONResponse
+from app.config import settings
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib encoder
+    orjson = None
+
+
+def json_default(value: Any) -> Any:
+    """Encode database types the way FastAPI's jsonable_encoder does"""
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes with orjson when available and enabled"""
+    if orjson is not None and settings.FAST_JSON_ENABLED:
+        return orjson.dumps(content, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+    text = json.dumps(content, default=json_default, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+    return text.encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response written straight from database rows
+
+    Returning it from a route skips FastAPI's jsonable_encoder pass over the
+    payload; datetimes and Decimals are encoded by the serializer itself.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
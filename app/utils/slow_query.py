@@ -0,0 +1,166 @@
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, Optional
+from app.config import settings
+from app.utils.logger import logger
+
+# ASGI scope of the request being served, so queries can be attributed to a route
+current_scope: ContextVar = ContextVar("current_scope", default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\$\d+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(query: str) -> str:
+    """Collapse whitespace and replace literals/placeholders with ? so equal statements group together"""
+    query = _STRING_LITERAL.sub("?", query)
+    query = _PLACEHOLDER.sub("?", query)
+    query = _NUMBER_LITERAL.sub("?", query)
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def current_route() -> Optional[str]:
+    """Route template of the current request, if any"""
+    scope = current_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path")
+
+
+class RouteContextMiddleware:
+    """ASGI middleware exposing the request scope to code running for that request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_scope.reset(token)
+
+
+class SlowQueryLog:
+    """
+    Records statements slower than SLOW_QUERY_THRESHOLD_MS as JSON lines in a rotating file
+
+    A sample of entries also carries an EXPLAIN (ANALYZE, BUFFERS) plan. Plans are
+    captured by a background worker on its own pooled connection, inside a
+    read-only transaction that is rolled back, so the slow request isn't delayed
+    further and re-running the statement cannot write.
+    """
+
+    def __init__(self):
+        self._file_logger = None
+        self._queue: Optional[queue.Queue] = None
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def threshold_seconds(self) -> float:
+        return settings.SLOW_QUERY_THRESHOLD_MS / 1000.0
+
+    def is_slow(self, duration: float) -> bool:
+        return settings.SLOW_QUERY_THRESHOLD_MS > 0 and duration >= self.threshold_seconds
+
+    def record(self, query: str, params: Any, duration: float, statement: Optional[str] = None):
+        """Log a slow statement, queueing an EXPLAIN for a sample of them"""
+        entry = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(duration * 1000, 2),
+            "statement": statement,
+            "route": current_route(),
+            "sql": normalize_sql(query)
+        }
+        logger.warning(
+            "Slow query (%sms) on %s: %s", entry['duration_ms'], entry['route'], statement or entry['sql'][:120]
+        )
+
+        if random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE:
+            self._ensure_worker()
+            try:
+                self._queue.put_nowait((entry, query, params))
+                return
+            except queue.Full:
+                entry["plan_skipped"] = "explain queue full"
+        self._write(entry)
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._queue = queue.Queue(maxsize=settings.SLOW_QUERY_EXPLAIN_QUEUE)
+                self._worker = threading.Thread(target=self._run, name="slow-query-explain", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            entry, query, params = self._queue.get()
+            try:
+                entry["plan"] = self._explain(query, params)
+            except Exception as e:
+                entry["plan_error"] = str(e)
+            try:
+                self._write(entry)
+            finally:
+                self._queue.task_done()
+
+    def _explain(self, query: str, params: Any) -> Any:
+        from app.database import db_pool
+
+        conn = db_pool.get_connection(timeout=1)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SET TRANSACTION READ ONLY")
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", params or ())
+            return cursor.fetchone()[0]
+        finally:
+            conn.rollback()
+            db_pool.return_connection(conn)
+
+    def _write(self, entry: Dict[str, Any]):
+        with self._lock:
+            if self._file_logger is None:
+                self._file_logger = self._build_file_logger()
+        self._file_logger.info(json.dumps(entry, default=str))
+
+    def _build_file_logger(self) -> logging.Logger:
+        directory = os.path.dirname(settings.SLOW_QUERY_LOG_FILE)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        file_logger = logging.getLogger("movies_api.slow_queries")
+        file_logger.setLevel(logging.INFO)
+        file_logger.propagate = False
+        handler = RotatingFileHandler(
+            settings.SLOW_QUERY_LOG_FILE,
+            maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+            backupCount=settings.SLOW_QUERY_LOG_BACKUPS
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        file_logger.addHandler(handler)
+        return file_logger
+
+    def drain(self, timeout: float = 5.0):
+        """Wait until queued EXPLAINs are written (used by tests and shutdown)"""
+        deadline = time.monotonic() + timeout
+        while self._queue is not None and self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+
+# Global slow query log instance
+slow_query_log = SlowQueryLog()
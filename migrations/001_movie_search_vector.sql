@@ -0,0 +1,43 @@
+-- Full-text search for movies
+-- Maintains a weighted tsvector (title > director > description) on movies
+-- and indexes it with GIN for /api/movies/search.
+
+BEGIN;
+
+ALTER TABLE movies ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+CREATE OR REPLACE FUNCTION movies_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce((SELECT name FROM directors WHERE id = NEW.director_id), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS movies_search_vector_trigger ON movies;
+CREATE TRIGGER movies_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, director_id, description ON movies
+    FOR EACH ROW EXECUTE FUNCTION movies_search_vector_update();
+
+-- Director renames re-index the director's movies
+CREATE OR REPLACE FUNCTION directors_search_vector_refresh() RETURNS trigger AS $$
+BEGIN
+    UPDATE movies SET director_id = director_id WHERE director_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS directors_search_vector_trigger ON directors;
+CREATE TRIGGER directors_search_vector_trigger
+    AFTER UPDATE OF name ON directors
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION directors_search_vector_refresh();
+
+-- Backfill existing rows through the trigger
+UPDATE movies SET title = title;
+
+CREATE INDEX IF NOT EXISTS idx_movies_search_vector ON movies USING GIN (search_vector);
+
+COMMIT;
@@ -0,0 +1,9 @@
+-- Trigram indexes for substring name filters
+-- Lets ILIKE '%term%' on genre, director and actor names use an index.
+-- Run outside a transaction block (CREATE INDEX CONCURRENTLY).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_genres_name_trgm ON genres USING GIN (name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_directors_name_trgm ON directors USING GIN (name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_actors_name_trgm ON actors USING GIN (name gin_trgm_ops);
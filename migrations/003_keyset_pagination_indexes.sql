@@ -0,0 +1,13 @@
+-- Keyset pagination indexes
+-- Genre pages page on (rating, created_at, id) and the actor list on (name, id).
+-- Run outside a transaction block (CREATE INDEX CONCURRENTLY).
+
+-- Keyset comparisons need a non-null created_at
+UPDATE movies SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL;
+ALTER TABLE movies ALTER COLUMN created_at SET NOT NULL;
+
+-- Matches ORDER BY COALESCE(rating, -1) DESC, created_at DESC, id DESC within a genre
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_movies_genre_keyset
+    ON movies (genre_id, (COALESCE(rating, -1)) DESC, created_at DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_actors_name_id ON actors (name, id);
@@ -0,0 +1,43 @@
+-- Precomputed home-page rows
+-- One row per genre with its movie total and top 50 movies (the largest
+-- limit_per_genre GET /api/movies accepts), in the same order the live query uses.
+-- app.services.home_rows refreshes it CONCURRENTLY, which needs the unique index.
+
+BEGIN;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS home_genre_rows AS
+SELECT ranked.genre_id,
+       g.name AS genre_name,
+       g.description AS genre_description,
+       ranked.genre_total AS movie_count,
+       json_agg(json_build_object(
+           'id', ranked.id,
+           'title', ranked.title,
+           'director', ranked.director,
+           'release_year', ranked.release_year,
+           'genre', g.name,
+           'rating', ranked.rating,
+           'description', ranked.description,
+           'language', ranked.language,
+           'image_url', ranked.image_url,
+           'created_at', ranked.created_at
+       ) ORDER BY ranked.genre_rank) AS movies,
+       now() AS refreshed_at
+FROM (
+    SELECT m.id, m.title, d.name AS director, m.release_year, m.genre_id, m.rating,
+           m.description, m.language, m.image_url, m.created_at,
+           ROW_NUMBER() OVER (
+               PARTITION BY m.genre_id
+               ORDER BY m.rating DESC NULLS LAST, m.created_at DESC, m.id DESC
+           ) AS genre_rank,
+           COUNT(*) OVER (PARTITION BY m.genre_id) AS genre_total
+    FROM movies m
+    JOIN directors d ON m.director_id = d.id
+) ranked
+JOIN genres g ON g.id = ranked.genre_id
+WHERE ranked.genre_rank <= 50
+GROUP BY ranked.genre_id, g.name, g.description, ranked.genre_total;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_home_genre_rows_genre ON home_genre_rows (genre_id);
+
+COMMIT;
@@ -0,0 +1,75 @@
+-- Review aggregates on movies
+-- review_count / review_rating_count / review_rating_sum are kept current by
+-- the statement that inserts each review; avg_review_rating is derived from them. Rebuild with: python -m app.services.review_aggregates
+-- The indexes at the end run outside a transaction block (CREATE INDEX CONCURRENTLY).
+
+BEGIN;
+
+ALTER TABLE movies ADD COLUMN IF NOT EXISTS review_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE movies ADD COLUMN IF NOT EXISTS review_rating_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE movies ADD COLUMN IF NOT EXISTS review_rating_sum NUMERIC NOT NULL DEFAULT 0;
+ALTER TABLE movies ADD COLUMN IF NOT EXISTS avg_review_rating NUMERIC(4, 2)
+    GENERATED ALWAYS AS (
+        CASE WHEN review_rating_count > 0 THEN ROUND(review_rating_sum / review_rating_count, 2) END
+    ) STORED;
+
+UPDATE movies m
+SET review_count = r.review_count,
+    review_rating_count = r.review_rating_count,
+    review_rating_sum = r.review_rating_sum
+FROM (
+    SELECT movie_id, COUNT(*) AS review_count, COUNT(rating) AS review_rating_count,
+           COALESCE(SUM(rating), 0) AS review_rating_sum
+    FROM reviews
+    GROUP BY movie_id
+) r
+WHERE r.movie_id = m.id;
+
+-- Home page rows carry the aggregates too
+DROP MATERIALIZED VIEW IF EXISTS home_genre_rows;
+
+CREATE MATERIALIZED VIEW home_genre_rows AS
+SELECT ranked.genre_id,
+       g.name AS genre_name,
+       g.description AS genre_description,
+       ranked.genre_total AS movie_count,
+       json_agg(json_build_object(
+           'id', ranked.id,
+           'title', ranked.title,
+           'director', ranked.director,
+           'release_year', ranked.release_year,
+           'genre', g.name,
+           'rating', ranked.rating,
+           'review_count', ranked.review_count,
+           'avg_review_rating', ranked.avg_review_rating,
+           'description', ranked.description,
+           'language', ranked.language,
+           'image_url', ranked.image_url,
+           'created_at', ranked.created_at
+       ) ORDER BY ranked.genre_rank) AS movies,
+       now() AS refreshed_at
+FROM (
+    SELECT m.id, m.title, d.name AS director, m.release_year, m.genre_id, m.rating,
+           m.review_count, m.avg_review_rating,
+           m.description, m.language, m.image_url, m.created_at,
+           ROW_NUMBER() OVER (
+               PARTITION BY m.genre_id
+               ORDER BY m.rating DESC NULLS LAST, m.created_at DESC, m.id DESC
+           ) AS genre_rank,
+           COUNT(*) OVER (PARTITION BY m.genre_id) AS genre_total
+    FROM movies m
+    JOIN directors d ON m.director_id = d.id
+) ranked
+JOIN genres g ON g.id = ranked.genre_id
+WHERE ranked.genre_rank <= 50
+GROUP BY ranked.genre_id, g.name, g.description, ranked.genre_total;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_home_genre_rows_genre ON home_genre_rows (genre_id);
+
+COMMIT;
+
+-- Per-genre "most reviewed" and "best reviewed" orderings
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_movies_genre_review_count
+    ON movies (genre_id, review_count DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_movies_genre_avg_review_rating
+    ON movies (genre_id, avg_review_rating DESC NULLS LAST, review_count DESC, id DESC);
@@ -0,0 +1,14 @@
+-- Review pagination indexes
+-- /api/movies/{id}/reviews pages newest-first on (created_at, id) and the
+-- rating histogram groups a movie's ratings.
+-- Run outside a transaction block (CREATE INDEX CONCURRENTLY).
+
+-- Keyset comparisons need a non-null created_at
+UPDATE reviews SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL;
+ALTER TABLE reviews ALTER COLUMN created_at SET NOT NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reviews_movie_created
+    ON reviews (movie_id, created_at DESC, id DESC);
+
+-- Index-only scans for the per-movie rating histogram
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reviews_movie_rating ON reviews (movie_id, rating);
@@ -0,0 +1,110 @@
+-- Change tracking for conditional GETs (ETag / Last-Modified)
+-- updated_at is set on every UPDATE; cast changes also touch the movie they belong to.
+-- Lists are versioned by per-table sequences that statement triggers advance. Sequences
+-- are not transactional and take no lock that other writers wait on, so writers never
+-- queue behind each other here.
+
+BEGIN;
+
+ALTER TABLE movies ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+ALTER TABLE actors ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+ALTER TABLE directors ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+ALTER TABLE genres ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+ALTER TABLE reviews ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+
+CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS movies_touch_updated_at ON movies;
+CREATE TRIGGER movies_touch_updated_at BEFORE UPDATE ON movies
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+DROP TRIGGER IF EXISTS actors_touch_updated_at ON actors;
+CREATE TRIGGER actors_touch_updated_at BEFORE UPDATE ON actors
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+DROP TRIGGER IF EXISTS directors_touch_updated_at ON directors;
+CREATE TRIGGER directors_touch_updated_at BEFORE UPDATE ON directors
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+DROP TRIGGER IF EXISTS genres_touch_updated_at ON genres;
+CREATE TRIGGER genres_touch_updated_at BEFORE UPDATE ON genres
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+DROP TRIGGER IF EXISTS reviews_touch_updated_at ON reviews;
+CREATE TRIGGER reviews_touch_updated_at BEFORE UPDATE ON reviews
+    FOR EACH ROW EXECUTE FUNCTION touch_updated_at();
+
+-- Cast changes touch their movies once per statement (bulk imports included)
+CREATE OR REPLACE FUNCTION touch_movies_for_cast() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        UPDATE movies SET updated_at = now() WHERE id IN (SELECT movie_id FROM old_cast);
+    ELSE
+        UPDATE movies SET updated_at = now() WHERE id IN (SELECT movie_id FROM new_cast);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS movie_actors_touch_movies_insert ON movie_actors;
+CREATE TRIGGER movie_actors_touch_movies_insert AFTER INSERT ON movie_actors
+    REFERENCING NEW TABLE AS new_cast
+    FOR EACH STATEMENT EXECUTE FUNCTION touch_movies_for_cast();
+DROP TRIGGER IF EXISTS movie_actors_touch_movies_update ON movie_actors;
+CREATE TRIGGER movie_actors_touch_movies_update AFTER UPDATE ON movie_actors
+    REFERENCING NEW TABLE AS new_cast
+    FOR EACH STATEMENT EXECUTE FUNCTION touch_movies_for_cast();
+DROP TRIGGER IF EXISTS movie_actors_touch_movies_delete ON movie_actors;
+CREATE TRIGGER movie_actors_touch_movies_delete AFTER DELETE ON movie_actors
+    REFERENCING OLD TABLE AS old_cast
+    FOR EACH STATEMENT EXECUTE FUNCTION touch_movies_for_cast();
+
+-- Per-table change counters for list ETags, read by table name (app/utils/conditional.py).
+-- nextval alone WAL-logs in batches of 32, so standbys would miss most bumps; setval logs
+-- every new value
+CREATE TABLE IF NOT EXISTS table_version_seqs (
+    table_name TEXT PRIMARY KEY,
+    seq REGCLASS NOT NULL
+);
+
+CREATE SEQUENCE IF NOT EXISTS movies_version_seq;
+CREATE SEQUENCE IF NOT EXISTS actors_version_seq;
+CREATE SEQUENCE IF NOT EXISTS directors_version_seq;
+CREATE SEQUENCE IF NOT EXISTS genres_version_seq;
+CREATE SEQUENCE IF NOT EXISTS reviews_version_seq;
+CREATE SEQUENCE IF NOT EXISTS movie_actors_version_seq;
+
+INSERT INTO table_version_seqs (table_name, seq)
+VALUES ('movies', 'movies_version_seq'), ('actors', 'actors_version_seq'),
+       ('directors', 'directors_version_seq'), ('genres', 'genres_version_seq'),
+       ('reviews', 'reviews_version_seq'), ('movie_actors', 'movie_actors_version_seq')
+ON CONFLICT (table_name) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    PERFORM setval(TG_ARGV[0]::regclass, nextval(TG_ARGV[0]::regclass));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS movies_bump_version ON movies;
+CREATE TRIGGER movies_bump_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON movies
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version('movies_version_seq');
+DROP TRIGGER IF EXISTS actors_bump_version ON actors;
+CREATE TRIGGER actors_bump_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON actors
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version('actors_version_seq');
+DROP TRIGGER IF EXISTS directors_bump_version ON directors;
+CREATE TRIGGER directors_bump_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON directors
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version('directors_version_seq');
+DROP TRIGGER IF EXISTS genres_bump_version ON genres;
+CREATE TRIGGER genres_bump_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON genres
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version('genres_version_seq');
+DROP TRIGGER IF EXISTS reviews_bump_version ON reviews;
+CREATE TRIGGER reviews_bump_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON reviews
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version('reviews_version_seq');
+DROP TRIGGER IF EXISTS movie_actors_bump_version ON movie_actors;
+CREATE TRIGGER movie_actors_bump_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON movie_actors
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version('movie_actors_version_seq');
+
+COMMIT;
@@ -0,0 +1,55 @@
+-- Home page rows refresh time in a side table
+-- Every refresh used to rewrite refreshed_at (now()) on every row of the view. The refresh
+-- time now lives in the one-row home_genre_rows_refresh, updated in the refresh's own
+-- transaction, so readers can compare it cheaply before serving a cached copy.
+
+BEGIN;
+
+DROP MATERIALIZED VIEW IF EXISTS home_genre_rows;
+
+CREATE MATERIALIZED VIEW home_genre_rows AS
+SELECT ranked.genre_id,
+       g.name AS genre_name,
+       g.description AS genre_description,
+       ranked.genre_total AS movie_count,
+       json_agg(json_build_object(
+           'id', ranked.id,
+           'title', ranked.title,
+           'director', ranked.director,
+           'release_year', ranked.release_year,
+           'genre', g.name,
+           'rating', ranked.rating,
+           'review_count', ranked.review_count,
+           'avg_review_rating', ranked.avg_review_rating,
+           'description', ranked.description,
+           'language', ranked.language,
+           'image_url', ranked.image_url,
+           'created_at', ranked.created_at
+       ) ORDER BY ranked.genre_rank) AS movies
+FROM (
+    SELECT m.id, m.title, d.name AS director, m.release_year, m.genre_id, m.rating,
+           m.review_count, m.avg_review_rating,
+           m.description, m.language, m.image_url, m.created_at,
+           ROW_NUMBER() OVER (
+               PARTITION BY m.genre_id
+               ORDER BY m.rating DESC NULLS LAST, m.created_at DESC, m.id DESC
+           ) AS genre_rank,
+           COUNT(*) OVER (PARTITION BY m.genre_id) AS genre_total
+    FROM movies m
+    JOIN directors d ON m.director_id = d.id
+) ranked
+JOIN genres g ON g.id = ranked.genre_id
+WHERE ranked.genre_rank <= 50
+GROUP BY ranked.genre_id, g.name, g.description, ranked.genre_total;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_home_genre_rows_genre ON home_genre_rows (genre_id);
+
+CREATE TABLE IF NOT EXISTS home_genre_rows_refresh (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    refreshed_at TIMESTAMPTZ NOT NULL
+);
+
+INSERT INTO home_genre_rows_refresh (refreshed_at) VALUES (now())
+ON CONFLICT (id) DO UPDATE SET refreshed_at = EXCLUDED.refreshed_at;
+
+COMMIT;
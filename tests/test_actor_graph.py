@@ -0,0 +1,140 @@
+import time
+from collections import deque
+import numpy as np
+from scipy import sparse
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.database import db
+from app.main import app
+from app.services.actor_graph import ActorGraph
+
+client = TestClient(app)
+
+
+def _create_movie(title, cast):
+    payload = {
+        "title": title,
+        "director_name": "Graph Director",
+        "release_year": 2021,
+        "genre_name": "Graph Genre",
+        "rating": 6.5,
+        "cast": [{"actor_name": name} for name in cast]
+    }
+    response = client.post("/api/movies", json=payload)
+    assert response.status_code == 201
+    return response.json()
+
+
+def _actor_id(movie, name):
+    return next(member["id"] for member in movie["cast"] if member["name"] == name)
+
+
+def test_path_collaborators_and_network():
+    """Test co-star queries over a small chain of movies"""
+    first = _create_movie("Graph One", ["Graph A", "Graph B"])
+    second = _create_movie("Graph Two", ["Graph A", "Graph B"])
+    third = _create_movie("Graph Three", ["Graph B", "Graph C"])
+    fourth = _create_movie("Graph Four", ["Graph C", "Graph D"])
+    a, b = _actor_id(first, "Graph A"), _actor_id(first, "Graph B")
+    c, d = _actor_id(third, "Graph C"), _actor_id(fourth, "Graph D")
+
+    response = client.get(f"/api/actors/{a}/path/{d}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["degrees"] == 3
+    assert [step["actor"]["id"] for step in data["path"]] == [a, b, c, d]
+    assert data["path"][0]["movie"] is None
+    assert [step["movie"]["title"] for step in data["path"][1:]] in (
+        ["Graph One", "Graph Three", "Graph Four"],
+        ["Graph Two", "Graph Three", "Graph Four"]
+    )
+    assert client.get(f"/api/actors/{a}/path/{d}", params={"max_degrees": 2}).json()["degrees"] is None
+
+    collaborators = client.get(f"/api/actors/{b}/collaborators").json()["collaborators"]
+    assert collaborators[0] == {"id": a, "name": "Graph A", "shared_movies": 2}
+    assert {"id": c, "name": "Graph C", "shared_movies": 1} in collaborators
+
+    network = client.get(f"/api/actors/{a}/network", params={"hops": 3}).json()
+    assert [hop["actors"] for hop in network["hops"]][:1] == [1]
+    assert network["total"] >= 3
+
+    # Removing the middle link is picked up incrementally
+    client.put(f"/api/movies/{third['id']}", json={"cast": [{"actor_name": "Graph C"}]})
+    assert client.get(f"/api/actors/{a}/path/{d}").json()["degrees"] is None
+
+    for movie in (first, second, third, fourth):
+        client.delete(f"/api/movies/{movie['id']}")
+
+
+def test_graph_queries_unknown_actor():
+    """Test 404 for actors that don't exist"""
+    assert client.get("/api/actors/999999/collaborators").status_code == 404
+    assert client.get("/api/actors/999999/network").status_code == 404
+    assert client.get("/api/actors/999999/path/999998").status_code == 404
+
+
+def test_bidirectional_search_matches_plain_bfs():
+    """Test shortest path lengths against a reference BFS on a random graph"""
+    rng = np.random.default_rng(7)
+    n_movies, n_actors = 300, 400
+    movies = np.repeat(np.arange(n_movies), 3)
+    actors = rng.integers(0, n_actors, len(movies))
+
+    graph = ActorGraph()
+    graph.movie_ids = np.arange(n_movies)
+    graph.actor_ids = np.arange(n_actors)
+    graph.movie_row = {i: i for i in range(n_movies)}
+    graph.actor_row = {i: i for i in range(n_actors)}
+    graph.cast = sparse.csr_matrix((np.ones(len(movies), dtype=np.int8), (movies, actors)), shape=(n_movies, n_actors))
+    graph.cast.data[:] = 1
+    graph.filmography = graph.cast.T.tocsr()
+    graph.built = True
+
+    costars = {actor: set() for actor in range(n_actors)}
+    for movie in range(n_movies):
+        cast = set(actors[movies == movie].tolist())
+        for actor in cast:
+            costars[actor] |= cast - {actor}
+
+    def reference(start, goal):
+        seen = {start: 0}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if node == goal:
+                return seen[node]
+            for nxt in costars[node]:
+                if nxt not in seen:
+                    seen[nxt] = seen[node] + 1
+                    queue.append(nxt)
+        return None
+
+    for start, goal in rng.integers(0, n_actors, (50, 2)):
+        expected = reference(int(start), int(goal))
+        path = graph.shortest_path(int(start), int(goal), max_degrees=20)
+        assert (None if path is None else len(path) - 1) == expected
+        if path:
+            # Every consecutive pair actually shares the movie named in the step
+            for (prev, _), (actor, movie) in zip(path, path[1:]):
+                assert {prev, actor} <= set(actors[movies == movie].tolist())
+
+
+def test_rebuilt_after_writes_from_another_process(monkeypatch):
+    """Test that a query rebuilds the graph once movie_actors changed without mark_changed"""
+    monkeypatch.setattr(settings, "INDEX_VERSION_CHECK_SECONDS", 0.01)
+    movie = _create_movie("Graph Elsewhere", ["Graph Elsewhere A", "Graph Elsewhere B"])
+    a, b = _actor_id(movie, "Graph Elsewhere A"), _actor_id(movie, "Graph Elsewhere B")
+    graph = ActorGraph()
+    graph.build()
+    assert graph.collaborators(a) == [(b, 1)]
+
+    # What the importer CLI or another worker does: nothing tells this process
+    db.execute_delete("DELETE FROM movie_actors WHERE movie_id = %s AND actor_id = %s", (movie["id"], b))
+
+    time.sleep(0.02)
+    deadline = time.monotonic() + 5
+    while graph.collaborators(a) != []:
+        assert time.monotonic() < deadline, "graph was not rebuilt"
+        time.sleep(0.05)
+
+    client.delete(f"/api/movies/{movie['id']}")
@@ -1,6 +1,10 @@
+import csv
+import io
+import json
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.services import review_aggregates
 
 client = TestClient(app)
 
@@ -144,6 +148,29 @@ def test_update_movie_positive():
     response = client.put(f"/api/movies/{movie_id}", json=payload)
     assert response.status_code in [200, 404, 400]
 
+
+def test_update_movie_cast_sync():
+    payload = {
+        "title": "Cast Sync Movie",
+        "director_name": "Cast Director",
+        "release_year": 2020,
+        "genre_name": "Drama",
+        "cast": [{"actor_name": "Cast One", "role": "A"}, {"actor_name": "Cast Two", "role": "B"}]
+    }
+    response = client.post("/api/movies", json=payload)
+    assert response.status_code == 201
+    movie_id = response.json()["id"]
+    # Write responses have the same shape as GET /api/movies/{id}
+    assert set(response.json()) == set(client.get(f"/api/movies/{movie_id}").json())
+    # Keep one member with a new role, drop one, add one
+    cast = [{"actor_name": "Cast One", "role": "A2"}, {"actor_name": "Cast Three", "role": "C"}]
+    response = client.put(f"/api/movies/{movie_id}", json={"cast": cast})
+    assert response.status_code == 200
+    roles = {member["name"]: member["role"] for member in response.json()["cast"]}
+    assert roles == {"Cast One": "A2", "Cast Three": "C"}
+    assert "reviews_next_cursor" in response.json()
+    client.delete(f"/api/movies/{movie_id}")
+
 def test_update_movie_negative():
     payload = {"description": "Updated movie description"}
     response = client.put(f"/api/movies/999999", json=payload)
@@ -159,6 +186,29 @@ def test_delete_movie_negative():
     assert response.status_code in [404]
 
 
+def test_import_movies_positive():
+    lines = [
+        '{"title": "Imported Movie", "director_name": "Import Director", "release_year": 2021, '
+        '"genre_name": "Drama", "cast": [{"actor_name": "Import Actor", "role": "Lead"}]}',
+        '{"title": "Imported Movie 2", "director_name": "Import Director", "release_year": 2022, "genre_name": "Drama"}'
+    ]
+    response = client.post("/api/movies/import", content="\n".join(lines))
+    assert response.status_code == 201
+    data = response.json()
+    assert data["movies_imported"] == 2
+    assert data["cast_imported"] == 1
+    assert "rows_per_second" in data
+
+
+def test_import_movies_negative():
+    # Malformed and invalid lines are rejected, not imported
+    response = client.post("/api/movies/import", content='{"title": ""}\nnot json')
+    assert response.status_code == 201
+    data = response.json()
+    assert data["movies_imported"] == 0
+    assert data["rejected"] == 2
+
+
 # ------------------- Reviews CRUD -------------------
 def test_create_review_positive():
     payload = {
@@ -183,6 +233,33 @@ def test_create_review_negative():
     response = client.post("/api/reviews", json=payload)
     assert response.status_code in [400, 422]
 
+
+def test_create_review_updates_aggregates():
+    before = client.get("/api/movies/2").json()
+    response = client.post("/api/reviews", json={"movie_id": 2, "reviewer_name": "Aggregate", "rating": 6})
+    assert response.status_code == 201
+    after = client.get("/api/movies/2").json()
+    assert after["review_count"] == before["review_count"] + 1
+    assert after["avg_review_rating"] is not None
+
+
+def test_create_review_missing_movie():
+    response = client.post("/api/reviews", json={"movie_id": 999999, "reviewer_name": "Nobody", "rating": 5})
+    assert response.status_code == 404
+
+
+def test_get_movies_sorted_by_reviews():
+    response = client.get("/api/movies", params={"sort": "most_reviewed", "min_reviews": 1})
+    assert response.status_code == 200
+    for category in response.json()["categories"]:
+        counts = [movie["review_count"] for movie in category["movies"]]
+        assert counts == sorted(counts, reverse=True)
+        assert min(counts) >= 1
+
+
+def test_rebuild_review_aggregates_is_noop_when_consistent():
+    assert review_aggregates.rebuild()["movies_corrected"] == 0
+
 def test_get_movie_reviews_positive():
     movie_id = globals().get("created_movie_id", 1)
     response = client.get(f"/api/movies/{movie_id}/reviews")
@@ -192,6 +269,33 @@ def test_get_movie_reviews_negative():
     response = client.get(f"/api/movies/999999/reviews")
     assert response.status_code in [200, 404]
 
+
+def test_get_movie_reviews_pages():
+    for rating in (4, 7, 9.5):
+        client.post("/api/reviews", json={"movie_id": 3, "reviewer_name": "Pager", "rating": rating})
+    first = client.get("/api/movies/3/reviews", params={"limit": 2, "histogram": True}).json()
+    assert first["count"] == 2
+    assert first["has_more"] is True
+    assert first["total"] >= 4
+    assert sum(bucket["count"] for bucket in first["histogram"]) == first["total"]
+    second = client.get("/api/movies/3/reviews", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    first_ids = {review["id"] for review in first["reviews"]}
+    assert not first_ids & {review["id"] for review in second["reviews"]}
+
+
+def test_get_movie_reviews_invalid_cursor():
+    response = client.get("/api/movies/3/reviews", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_get_movie_embeds_latest_reviews():
+    response = client.get("/api/movies/3")
+    assert response.status_code == 200
+    movie = response.json()
+    assert len(movie["reviews"]) <= movie["review_count"]
+    if movie["review_count"] > len(movie["reviews"]):
+        assert movie["reviews_next_cursor"]
+
 def test_update_review_positive():
     review_id = globals().get("created_review_id", 1)
     payload = {"comment": "Updated review comment"}
@@ -211,3 +315,25 @@ def test_delete_review_positive():
 def test_delete_review_negative():
     response = client.delete(f"/api/reviews/999999")
     assert response.status_code in [404]
+
+
+# ------------------- Export -------------------
+def test_export_movies_ndjson():
+    response = client.get("/api/export/movies", params={"batch_size": 2})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines
+    assert {"id", "title", "director", "genre", "cast"} <= set(lines[0])
+
+
+def test_export_reviews_csv():
+    response = client.get("/api/export/reviews", params={"format": "csv"})
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "movie_id", "reviewer_name", "rating", "comment", "created_at"]
+
+
+def test_export_invalid_format():
+    response = client.get("/api/export/movies", params={"format": "xml"})
+    assert response.status_code == 422
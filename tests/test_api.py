@@ -1,3 +1,4 @@
+import uuid
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
@@ -40,6 +41,38 @@ class TestMoviesAPI:
         response = client.get("/api/movies/search/ ")
         assert response.status_code == 400
 
+    def test_search_movies_pagination(self, client):
+        """Test paginated, ranked movie search"""
+        response = client.get("/api/movies/search/knight?limit=1")
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["movies"]) <= 1
+        assert "has_more" in data
+        assert "next_cursor" in data
+
+    def test_search_movies_substring_mode(self, client):
+        """Test substring search mode"""
+        response = client.get("/api/movies/search/kni?mode=substring")
+        assert response.status_code == 200
+        assert "movies" in response.json()
+
+    def test_search_movies_invalid_cursor(self, client):
+        """Test movie search with a malformed cursor"""
+        response = client.get("/api/movies/search/test?cursor=not-a-cursor")
+        assert response.status_code == 400
+
+    def test_get_movies_by_genre_cursor(self, client):
+        """Test genre pages with keyset cursors and optional total"""
+        response = client.get("/api/movies/genre/Drama?limit=1&include_total=true")
+        assert response.status_code == 200
+        data = response.json()
+        assert "total" in data
+        assert "next_cursor" in data
+        if data["has_more"]:
+            response = client.get(f"/api/movies/genre/Drama?limit=1&cursor={data['next_cursor']}")
+            assert response.status_code == 200
+            assert "total" not in response.json()
+
 
 class TestDirectorsAPI:
     """Test cases for Directors API endpoints"""
@@ -79,9 +112,45 @@ class TestActorsAPI:
         assert "count" in data
         assert isinstance(data["actors"], list)
     
+    def test_get_actors_cursor_pagination(self, client):
+        """Test walking the actor list with keyset cursors"""
+        first = client.get("/api/actors?limit=2").json()
+        assert "next_cursor" in first
+        if first["has_more"]:
+            second = client.get(f"/api/actors?limit=2&cursor={first['next_cursor']}").json()
+            first_ids = {a["id"] for a in first["actors"]}
+            assert not first_ids & {a["id"] for a in second["actors"]}
+
+    def test_get_actors_invalid_cursor(self, client):
+        """Test actor listing with a malformed cursor"""
+        response = client.get("/api/actors?cursor=not-a-cursor")
+        assert response.status_code == 400
+
     def test_get_actors_with_genre_filter(self, client):
         """Test getting actors filtered by genre"""
         response = client.get("/api/actors?genre=Action")
         assert response.status_code == 200
         data = response.json()
         assert "actors" in data
+
+
+class TestReviewsAPI:
+    """Test cases for Reviews API endpoints"""
+
+    def test_create_review_refreshes_genre_rows(self, client):
+        """Test that a new review shows in the cached genre rows it changes"""
+        genre = f"Reviewed Genre {uuid.uuid4().hex[:8]}"
+        movie = client.post("/api/movies", json={
+            "title": "Reviewed Movie", "director_name": "Reviewed Director", "release_year": 2020, "genre_name": genre
+        }).json()
+
+        def review_count():
+            categories = client.get("/api/movies?sort=most_reviewed&limit_per_genre=1").json()["categories"]
+            return next(c["movies"][0]["review_count"] for c in categories if c["genre_name"] == genre)
+
+        assert review_count() == 0
+        response = client.post("/api/reviews", json={"movie_id": movie["id"], "reviewer_name": "Reviewer", "rating": 9})
+        assert response.status_code == 201
+        assert "genre_id" not in response.json()
+        assert review_count() == 1
+        client.delete(f"/api/movies/{movie['id']}")
@@ -0,0 +1,92 @@
+import asyncio
+from contextlib import asynccontextmanager
+import pytest
+from app import async_database
+from app.async_database import AsyncDatabase
+
+
+class FakeAsyncCursor:
+    rowcount = 1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, query, params=None):
+        pass
+
+    async def fetchone(self):
+        return {"id": 1}
+
+    async def fetchall(self):
+        return [{"id": 1}]
+
+
+class FakeAsyncConnection:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeAsyncCursor()
+
+
+class FakeAsyncPool:
+    """Mimics AsyncConnectionPool.connection(): commit on success, rollback on error"""
+
+    def __init__(self):
+        self.checkouts = []
+
+    @asynccontextmanager
+    async def connection(self):
+        conn = FakeAsyncConnection()
+        self.checkouts.append(conn)
+        try:
+            yield conn
+        except BaseException:
+            conn.rollbacks += 1
+            raise
+        conn.commits += 1
+
+
+@pytest.fixture
+def fake_async_pool(monkeypatch):
+    pool = FakeAsyncPool()
+    monkeypatch.setattr(async_database, "async_db_pool", pool)
+    return pool
+
+
+def test_async_transaction_pins_one_connection(fake_async_pool):
+    """Test that an async transaction uses one checkout and one commit"""
+    db = AsyncDatabase()
+
+    async def write():
+        async with db.transaction():
+            await db.execute_query("SELECT 1", fetch_one=True)
+            await db.execute_insert("INSERT INTO genres (name) VALUES (%s) RETURNING id", ("x",))
+            await db.execute_delete("DELETE FROM movies WHERE id = %s", (1,))
+            async with db.transaction():
+                await db.get_or_create("directors", "name", "x")
+        await db.execute_query("SELECT 1")
+
+    asyncio.run(write())
+    assert len(fake_async_pool.checkouts) == 2
+    assert fake_async_pool.checkouts[0].commits == 1
+
+
+def test_async_transaction_rolls_back_on_error(fake_async_pool):
+    """Test that an exception rolls back instead of committing"""
+    db = AsyncDatabase()
+
+    async def write():
+        async with db.transaction():
+            await db.execute_query("SELECT 1")
+            raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(write())
+    conn = fake_async_pool.checkouts[0]
+    assert conn.commits == 0
+    assert conn.rollbacks == 1
@@ -0,0 +1,97 @@
+import time
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.database import db
+from app.main import app
+from app.services.autocomplete import AutocompleteIndex, normalize
+
+client = TestClient(app)
+
+
+def _suggest(q, **params):
+    response = client.get("/api/autocomplete", params={"q": q, **params})
+    assert response.status_code == 200
+    return [(s["type"], s["name"]) for s in response.json()["suggestions"]]
+
+
+def test_normalize():
+    """Test case, accent and punctuation folding"""
+    assert normalize("  Amélie: Le Fabuleux-Destin ") == "amelie le fabuleux destin"
+    assert normalize("WALL·E") == "wall e"
+    assert normalize("!!!") == ""
+
+
+def test_autocomplete_ranks_and_follows_writes():
+    """Test mixed-type suggestions and that writes are reflected"""
+    payload = {
+        "title": "Zyxwv Quantum Heist",
+        "director_name": "Zyxwv Director",
+        "release_year": 2022,
+        "genre_name": "Autocomplete Genre",
+        "rating": 8.0,
+        "cast": [{"actor_name": "Emile Zyxwvson", "role": "Lead"}]
+    }
+    movie = client.post("/api/movies", json=payload).json()
+    actor_id = movie["cast"][0]["id"]
+
+    # Whole-name prefixes rank above word prefixes
+    suggestions = _suggest("zyxwv")
+    assert suggestions[:2] in (
+        [("movie", "Zyxwv Quantum Heist"), ("director", "Zyxwv Director")],
+        [("director", "Zyxwv Director"), ("movie", "Zyxwv Quantum Heist")]
+    )
+    assert ("actor", "Emile Zyxwvson") in suggestions
+    assert _suggest("QUANTUM h") == [("movie", "Zyxwv Quantum Heist")]
+    assert _suggest("emile") == [("actor", "Emile Zyxwvson")]
+    assert _suggest("zyxwv", types="actor") == [("actor", "Emile Zyxwvson")]
+    assert len(_suggest("zyxwv", limit=1)) == 1
+
+    client.put(f"/api/movies/{movie['id']}", json={"title": "Zyxwv Renamed Caper"})
+    assert _suggest("zyxwv quantum") == []
+    assert _suggest("caper") == [("movie", "Zyxwv Renamed Caper")]
+
+    client.delete(f"/api/actors/{actor_id}")
+    assert _suggest("emile") == []
+    client.delete(f"/api/movies/{movie['id']}")
+    assert _suggest("caper") == []
+
+
+def test_memoized_prefix_dropped_on_write(monkeypatch):
+    """Test that a memoized prefix is recomputed once a write touches a name under it"""
+    from app.services.autocomplete import autocomplete_index
+    monkeypatch.setattr(settings, "AUTOCOMPLETE_MEMO_MIN_MATCHES", 0)
+    # A background rebuild would drop the memo this test looks at
+    monkeypatch.setattr(settings, "INDEX_VERSION_CHECK_SECONDS", 0)
+    first = client.post("/api/actors", json={"name": "Qqmemo First"}).json()
+    assert _suggest("qq") == [("actor", "Qqmemo First")]
+    assert ("qq", 10, ("actor", "director", "movie")) in autocomplete_index._memo
+    second = client.post("/api/actors", json={"name": "Qqmemo Second"}).json()
+    assert ("actor", "Qqmemo Second") in _suggest("qq")
+    client.delete(f"/api/actors/{first['id']}")
+    client.delete(f"/api/actors/{second['id']}")
+
+
+def test_autocomplete_validation():
+    """Test parameter validation"""
+    assert client.get("/api/autocomplete").status_code == 422
+    assert client.get("/api/autocomplete", params={"q": "a", "types": "genre"}).status_code == 422
+    assert client.get("/api/autocomplete", params={"q": "!!"}).json()["suggestions"] == []
+
+
+def test_rebuilt_after_writes_from_another_process(monkeypatch):
+    """Test that a lookup rebuilds the index once its tables changed without mark_changed"""
+    monkeypatch.setattr(settings, "INDEX_VERSION_CHECK_SECONDS", 0.01)
+    index = AutocompleteIndex()
+    index.build()
+
+    # What the importer CLI or another worker does: nothing tells this process
+    actor = db.execute_insert("INSERT INTO actors (name) VALUES (%s) RETURNING id", ("Qqelsewhere Actor",))
+
+    time.sleep(0.02)
+    deadline = time.monotonic() + 5
+    while not index.suggest("qqelsewhere"):
+        assert time.monotonic() < deadline, "index was not rebuilt"
+        time.sleep(0.05)
+    assert index.suggest("qqelsewhere")[0]["id"] == actor["id"]
+
+    client.delete(f"/api/actors/{actor['id']}")
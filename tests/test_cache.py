@@ -0,0 +1,86 @@
+import pytest
+import time
+from app.utils.cache import LRUTTLBackend, ResponseCache
+
+
+@pytest.fixture
+def cache():
+    """Create a small response cache"""
+    return ResponseCache(LRUTTLBackend(max_entries=3), ttl=60)
+
+
+def test_get_or_load_caches_result(cache):
+    """Test that the loader only runs on a miss"""
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"id": 1}
+
+    assert cache.get_or_load("movie:1", loader, tags=["movie:1"]) == {"id": 1}
+    assert cache.get_or_load("movie:1", loader, tags=["movie:1"]) == {"id": 1}
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_none_is_not_cached(cache):
+    """Test that missing rows (404s) are not cached"""
+    cache.get_or_load("movie:404", lambda: None, tags=["movie:404"])
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalidate_by_tag(cache):
+    """Test that invalidation drops exactly the tagged entries"""
+    cache.set("movie:1", {"id": 1}, tags=["movie:1", "actor:7"])
+    cache.set("movie:2", {"id": 2}, tags=["movie:2"])
+    cache.set("rows", [], tags=["catalog"])
+    assert cache.invalidate("actor:7") == 1
+    assert cache.get("movie:1") is None
+    assert cache.get("movie:2") == {"id": 2}
+    assert cache.get("rows") == []
+
+
+def test_tags_derived_from_value(cache):
+    """Test that tags can be computed from the loaded value"""
+    cache.get_or_load("movie:1", lambda: {"id": 1, "cast": [5]}, tags=lambda m: [f"actor:{a}" for a in m["cast"]])
+    assert cache.invalidate("actor:5") == 1
+
+
+def test_lru_eviction(cache):
+    """Test that the least recently used entry is evicted first"""
+    for key in ("a", "b", "c"):
+        cache.set(key, key, tags=[key])
+    cache.get("a")
+    cache.set("d", "d", tags=["d"])
+    assert cache.get("b") is None
+    assert cache.get("a") == "a"
+    assert cache.stats()["evictions"] == 1
+    assert cache.invalidate("b") == 0
+
+
+def test_ttl_expiry():
+    """Test that expired entries are treated as misses"""
+    cache = ResponseCache(LRUTTLBackend(max_entries=10), ttl=0.0001)
+    cache.set("genres:list", [], tags=["genres"])
+    time.sleep(0.01)
+    assert cache.get("genres:list") is None
+
+
+def test_invalidation_during_load_is_not_cached(cache):
+    """Test that a load racing with a write does not store stale data"""
+    def loader():
+        cache.invalidate("catalog")
+        return ["stale"]
+    assert cache.get_or_load("rows", loader, tags=["catalog"]) == ["stale"]
+    assert cache.get("rows") is None
+
+
+def test_disabled_cache_always_loads():
+    """Test that a disabled cache never stores values"""
+    cache = ResponseCache(LRUTTLBackend(max_entries=10), ttl=60, enabled=False)
+    calls = []
+    for _ in range(2):
+        cache.get_or_load("k", lambda: calls.append(1) or 1, tags=["t"])
+    assert len(calls) == 2
@@ -0,0 +1,133 @@
+import uuid
+from datetime import datetime, timezone
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from app.main import app
+from app.utils.conditional import is_not_modified, make_validators
+
+client = TestClient(app)
+
+
+def _request(**headers):
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "headers": raw})
+
+
+def _unique(name):
+    """Name no earlier run has created, so get_or_create always writes"""
+    return f"{name} {uuid.uuid4().hex[:8]}"
+
+
+def _create_movie(title, cast, genre="Conditional Genre"):
+    payload = {
+        "title": _unique(title),
+        "director_name": _unique("Conditional Director"),
+        "release_year": 2022,
+        "genre_name": genre,
+        "rating": 7.0,
+        "cast": [{"actor_name": _unique(name)} for name in cast]
+    }
+    response = client.post("/api/movies", json=payload)
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_is_not_modified():
+    """Test If-None-Match (weak comparison, takes precedence) and If-Modified-Since"""
+    updated_at = datetime(2024, 5, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+    validators = make_validators("movie", "1:2:3", updated_at)
+    opaque = validators.etag[2:]
+    assert validators.etag.startswith('W/"')
+    assert validators != make_validators("movie", "1:2:4", updated_at)
+    assert validators != make_validators("actor", "1:2:3", updated_at)
+
+    assert is_not_modified(_request(if_none_match=validators.etag), validators)
+    assert is_not_modified(_request(if_none_match=f'"other", {opaque}'), validators)
+    assert is_not_modified(_request(if_none_match="*"), validators)
+    assert not is_not_modified(_request(if_none_match='"other"'), validators)
+
+    assert is_not_modified(_request(if_modified_since="Wed, 01 May 2024 12:00:00 GMT"), validators)
+    assert not is_not_modified(_request(if_modified_since="Wed, 01 May 2024 11:59:59 GMT"), validators)
+    assert not is_not_modified(_request(if_modified_since="yesterday"), validators)
+    assert not is_not_modified(
+        _request(if_none_match='"other"', if_modified_since="Wed, 01 May 2024 12:00:00 GMT"), validators
+    )
+    assert not is_not_modified(_request(), validators)
+
+
+def test_movie_not_modified_until_written():
+    """Test 304 for an unchanged movie and a new ETag after movie, cast and review writes"""
+    movie = _create_movie("Conditional Movie", ["Conditional Actor"])
+    url = f"/api/movies/{movie['id']}"
+
+    response = client.get(url)
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-cache"
+    not_modified = client.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert not not_modified.content
+    assert client.get(url, headers={"If-Modified-Since": response.headers["last-modified"]}).status_code == 304
+    assert client.get(url, params={"histogram": True}, headers={"If-None-Match": etag}).status_code == 200
+
+    writes = [
+        lambda: client.put(url, json={"description": "Changed"}),
+        lambda: client.post(
+            "/api/reviews", json={"movie_id": movie["id"], "reviewer_name": "Conditional", "rating": 8}
+        ),
+        lambda: client.put(f"/api/actors/{movie['cast'][0]['id']}", json={"bio": "Changed"})
+    ]
+    for write in writes:
+        assert write().status_code in (200, 201)
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        etag = response.headers["etag"]
+
+    client.delete(url)
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 404
+
+
+def test_actor_and_director_not_modified():
+    """Test 304 for an unchanged filmography and a new ETag once a movie in it changes or leaves"""
+    movie = _create_movie("Conditional Filmography", ["Conditional Star"])
+    urls = [f"/api/actors/{movie['cast'][0]['id']}", f"/api/directors/{movie['director_id']}"]
+    responses = [client.get(url) for url in urls]
+    assert all("last-modified" not in response.headers for response in responses)
+    etags = [response.headers["etag"] for response in responses]
+    for url, etag in zip(urls, etags):
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/api/movies/{movie['id']}", json={"title": "Conditional Filmography II"})
+    for url, etag in zip(urls, etags):
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert any(m["title"] == "Conditional Filmography II" for m in response.json()["movies"])
+
+    etags = [client.get(url).headers["etag"] for url in urls]
+    client.delete(f"/api/movies/{movie['id']}")
+    for url, etag in zip(urls, etags):
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["movies"] == []
+    assert client.get("/api/actors/999999", headers={"If-None-Match": "*"}).status_code == 404
+    assert client.get("/api/directors/999999", headers={"If-None-Match": "*"}).status_code == 404
+
+
+def test_lists_not_modified():
+    """Test 304 for genre and movie lists until a write to their tables"""
+    genre = _unique("Conditional List Genre")
+    urls = ["/api/genres", f"/api/movies?genre={genre}", "/api/movies?sort=most_reviewed"]
+    etags = []
+    for url in urls:
+        response = client.get(url)
+        assert "last-modified" not in response.headers
+        etags.append(response.headers["etag"])
+    for url, etag in zip(urls, etags):
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    movie = _create_movie("Conditional List Movie", [], genre=genre)
+    for url, etag in zip(urls, etags):
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+    client.delete(f"/api/movies/{movie['id']}")
@@ -0,0 +1,224 @@
+import threading
+import time
+import psycopg2
+import pytest
+from app import database
+from app.config import settings
+from app.database import Database, DatabaseConnectionPool, PoolTimeout, to_positional
+
+
+class FakeCursor:
+    rowcount = 1
+
+    def execute(self, query, params=None):
+        self.query = query
+
+    def fetchone(self):
+        return {"id": 1}
+
+    def fetchall(self):
+        return [{"id": 1}]
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakePool:
+    def __init__(self):
+        self.checkouts = []
+
+    def get_connection(self):
+        conn = FakeConnection()
+        self.checkouts.append(conn)
+        return conn
+
+    def return_connection(self, conn):
+        pass
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    """Replace the global pool with an in-memory fake"""
+    pool = FakePool()
+    monkeypatch.setattr(database, "db_pool", pool)
+    return pool
+
+
+def test_calls_outside_transaction_check_out_separately(fake_pool):
+    """Test that each call checks out and commits its own connection"""
+    db = Database()
+    db.execute_query("SELECT 1", fetch_one=True)
+    db.execute_delete("DELETE FROM movies WHERE id = %s", (1,))
+    assert len(fake_pool.checkouts) == 2
+    assert all(conn.commits == 1 for conn in fake_pool.checkouts)
+
+
+def test_transaction_pins_one_connection(fake_pool):
+    """Test that a transaction uses one checkout and one commit"""
+    db = Database()
+    with db.transaction():
+        db.execute_query("SELECT 1", fetch_one=True)
+        db.execute_insert("INSERT INTO genres (name) VALUES (%s) RETURNING id", ("x",))
+        db.execute_delete("DELETE FROM movies WHERE id = %s", (1,))
+        with db.transaction():
+            db.execute_query("SELECT 2")
+    assert len(fake_pool.checkouts) == 1
+    assert fake_pool.checkouts[0].commits == 1
+
+
+def test_transaction_rolls_back_on_error(fake_pool):
+    """Test that an exception rolls back instead of committing"""
+    db = Database()
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.execute_query("SELECT 1")
+            raise RuntimeError("boom")
+    conn = fake_pool.checkouts[0]
+    assert conn.commits == 0
+    assert conn.rollbacks == 1
+    # The pin is released once the block exits
+    db.execute_query("SELECT 1")
+    assert len(fake_pool.checkouts) == 2
+
+
+def test_to_positional_rewrites_placeholders():
+    """Test that %s becomes $n and %% is unescaped for PREPARE"""
+    query, count = to_positional("SELECT * FROM movies WHERE title ILIKE '%%x' AND id = %s AND year = %s")
+    assert query == "SELECT * FROM movies WHERE title ILIKE '%x' AND id = $1 AND year = $2"
+    assert count == 2
+
+
+class RecordingCursor(FakeCursor):
+    def __init__(self, log):
+        self.log = log
+
+    def execute(self, query, params=None):
+        self.log.append(query)
+
+
+class PreparingConnection(FakeConnection):
+    def __init__(self):
+        super().__init__()
+        self.prepared = {}
+        self.prepare_seq = 0
+        self.statements = []
+
+    def cursor(self, cursor_factory=None):
+        return RecordingCursor(self.statements)
+
+
+def test_named_query_prepares_once_per_connection(monkeypatch):
+    """Test that a named query is PREPAREd on first use and EXECUTEd afterwards"""
+    conn = PreparingConnection()
+    pool = FakePool()
+    pool.get_connection = lambda: conn
+    monkeypatch.setattr(database, "db_pool", pool)
+    db = Database()
+    db.execute_query("SELECT * FROM movies WHERE id = %s", (1,), fetch_one=True, name="movie_by_id")
+    db.execute_query("SELECT * FROM movies WHERE id = %s", (2,), fetch_one=True, name="movie_by_id")
+    assert conn.statements == [
+        "PREPARE movie_by_id_1 AS SELECT * FROM movies WHERE id = $1",
+        "EXECUTE movie_by_id_1 (%s)",
+        "EXECUTE movie_by_id_1 (%s)"
+    ]
+    with pytest.raises(ValueError):
+        db.execute_query("SELECT 1", name="movie_by_id")
+
+
+class StaleStatementCursor(RecordingCursor):
+    def execute(self, query, params=None):
+        super().execute(query, params)
+        if query.startswith("EXECUTE"):
+            raise psycopg2.errors.InvalidSqlStatementName("prepared statement does not exist")
+
+
+def test_named_query_retried_unprepared_when_statement_is_gone(monkeypatch, fake_pool):
+    """Test that a dropped prepared statement costs one plain retry, not a failed request"""
+    conn = PreparingConnection()
+    conn.prepared["movie_by_id"] = ("SELECT * FROM movies WHERE id = %s", "movie_by_id_1")
+    monkeypatch.setattr(conn, "cursor", lambda cursor_factory=None: StaleStatementCursor(conn.statements))
+    fake_pool.get_connection = lambda: conn
+    db = Database()
+    assert db.execute_query("SELECT * FROM movies WHERE id = %s", (1,), fetch_one=True, name="movie_by_id") == {"id": 1}
+    assert conn.statements == ["EXECUTE movie_by_id_1 (%s)", "SELECT * FROM movies WHERE id = %s"]
+    assert conn.rollbacks == 1
+    assert "movie_by_id" not in conn.prepared
+
+    # Inside a transaction the earlier statements can't be rolled back to retry
+    conn.prepared["movie_by_id"] = ("SELECT * FROM movies WHERE id = %s", "movie_by_id_1")
+    with pytest.raises(psycopg2.errors.InvalidSqlStatementName):
+        with db.transaction():
+            db.execute_query("SELECT * FROM movies WHERE id = %s", (1,), fetch_one=True, name="movie_by_id")
+
+
+class PooledFakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+    def get_transaction_status(self):
+        return psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def blocking_pool(monkeypatch):
+    """A fresh DatabaseConnectionPool of at most two fake connections"""
+    monkeypatch.setattr(DatabaseConnectionPool, "_instance", None)
+    monkeypatch.setattr(settings, "DB_MIN_CONN", 0)
+    monkeypatch.setattr(settings, "DB_MAX_CONN", 2)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 0.2)
+    pool = DatabaseConnectionPool()
+    monkeypatch.setattr(pool, "_connect", lambda: PooledFakeConnection())
+    pool.initialize()
+    return pool
+
+
+def test_pool_times_out_when_exhausted(blocking_pool):
+    """Test that checkout waits for the acquire timeout, then raises PoolTimeout"""
+    blocking_pool.get_connection()
+    blocking_pool.get_connection()
+    with pytest.raises(PoolTimeout):
+        blocking_pool.get_connection()
+    stats = blocking_pool.stats()
+    assert stats["in_use"] == 2
+    assert stats["timeouts"] == 1
+
+
+def test_pool_waiter_gets_returned_connection(blocking_pool):
+    """Test that a waiting caller receives a connection returned by another thread"""
+    first = blocking_pool.get_connection()
+    blocking_pool.get_connection()
+    timer = threading.Timer(0.05, blocking_pool.return_connection, (first,))
+    timer.start()
+    assert blocking_pool.get_connection(timeout=1) is first
+    timer.join()
+    assert blocking_pool.stats()["wait_histogram"]["+Inf"] == 3
+
+
+def test_pool_recycles_expired_connections(blocking_pool, monkeypatch):
+    """Test that connections past their max lifetime are closed instead of reused"""
+    monkeypatch.setattr(settings, "DB_POOL_MAX_LIFETIME", 0)
+    conn = blocking_pool.get_connection()
+    blocking_pool.return_connection(conn)
+    assert conn.closed
+    assert blocking_pool.stats()["size"] == 0
+    assert blocking_pool.get_connection() is not conn
@@ -0,0 +1,83 @@
+import time
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.main import app
+from app.database import db
+from app.services.home_rows import (
+    home_rows, read_home_rows, REFRESH_LOCK_STATEMENT, REFRESH_STATEMENT, RECORD_REFRESH_STATEMENT
+)
+
+
+def _movie_ids(categories):
+    return [(c["genre_id"], c["movie_count"], [m["id"] for m in c["movies"]]) for c in categories]
+
+
+def test_view_matches_live_rows():
+    """Test that the precomputed rows match the live per-genre query"""
+    home_rows.refresh()
+    live = TestClient(app).get("/api/movies", params={"limit_per_genre": 3}).json()["categories"]
+    precomputed, refreshed_at = read_home_rows(3)
+    assert refreshed_at is not None
+    assert _movie_ids(precomputed) == _movie_ids(live)
+
+
+def test_home_page_served_from_view_and_refreshed_on_write(monkeypatch):
+    """Test that the unfiltered listing reads the view and picks up writes after a refresh"""
+    monkeypatch.setattr(settings, "HOME_ROWS_MIN_INTERVAL_SECONDS", 0)
+    with TestClient(app) as client:
+        assert home_rows.running
+        before = client.get("/api/movies").json()
+        assert before["refreshed_at"] is not None
+
+        # A genre no earlier run created, so it only shows up after this write is refreshed in
+        genre = f"Home Rows Genre {uuid.uuid4().hex[:8]}"
+        payload = {
+            "title": "Home Rows Movie",
+            "director_name": "Home Rows Director",
+            "release_year": 2024,
+            "genre_name": genre,
+            "rating": 7.5
+        }
+        response = client.post("/api/movies", json=payload)
+        assert response.status_code == 201
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            after = client.get("/api/movies").json()
+            if any(c["genre_name"] == genre for c in after["categories"]):
+                break
+            time.sleep(0.05)
+        else:
+            pytest.fail("home rows were not refreshed after the write")
+        assert after["refreshed_at"] > before["refreshed_at"]
+        client.delete(f"/api/movies/{response.json()['id']}")
+    assert not home_rows.running
+
+
+def test_refresh_skipped_while_another_worker_refreshes():
+    """Test that a worker leaves the refresh to the advisory lock holder and retries later"""
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(REFRESH_LOCK_STATEMENT)
+        assert cursor.fetchone()[0]
+        assert home_rows.refresh() is False
+        assert home_rows._dirty.is_set()
+    home_rows._dirty.clear()
+    assert home_rows.refresh() is True
+
+
+def test_cached_rows_dropped_after_another_workers_refresh():
+    """Test that the home rows cached by this worker are not served once the view is newer"""
+    with TestClient(app) as client:
+        home_rows.refresh()
+        before = client.get("/api/movies").json()["refreshed_at"]
+        assert client.get("/api/movies").json()["refreshed_at"] == before
+
+        # What a refresh in another worker does; this worker's cache isn't told
+        with db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(REFRESH_STATEMENT)
+            cursor.execute(RECORD_REFRESH_STATEMENT)
+        assert client.get("/api/movies").json()["refreshed_at"] > before
@@ -0,0 +1,92 @@
+import json
+import logging
+import queue
+import pytest
+from app.config import settings
+from app.utils.logger import (
+    JsonFormatter, NonBlockingQueueHandler, RequestSamplingFilter,
+    log_records_dropped, parse_route_sample_rates
+)
+from app.utils.slow_query import current_scope
+
+
+def make_record(level=logging.INFO, msg="Fetched %s movies", args=(3,), **extra):
+    record = logging.LogRecord("movies_api", level, __file__, 1, msg, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def dropped():
+    return sum(value for _, _, value in log_records_dropped.samples())
+
+
+@pytest.fixture
+def request_scope():
+    """Pretend a request for /api/movies is being served"""
+    token = current_scope.set({"type": "http", "path": "/api/movies"})
+    yield
+    current_scope.reset(token)
+
+
+def test_parse_route_sample_rates():
+    """Test that route rates are parsed from the settings string"""
+    assert parse_route_sample_rates("") == {}
+    assert parse_route_sample_rates("/api/movies=0.1, /api/actors/{actor_id}=0.5") == {
+        "/api/movies": 0.1,
+        "/api/actors/{actor_id}": 0.5
+    }
+
+
+def test_json_formatter_includes_route_and_extra_fields():
+    """Test that the JSON formatter renders args and keeps extra= fields"""
+    record = make_record(route="/api/movies", movie_id=7)
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Fetched 3 movies"
+    assert entry["level"] == "INFO"
+    assert entry["route"] == "/api/movies"
+    assert entry["movie_id"] == 7
+
+
+def test_sampling_drops_info_but_keeps_warnings(monkeypatch, request_scope):
+    """Test that a zero sample rate drops INFO in requests but keeps warnings"""
+    monkeypatch.setattr(settings, "LOG_INFO_SAMPLE_RATE", 0.0)
+    sampling = RequestSamplingFilter()
+    assert sampling.filter(make_record()) is False
+    assert sampling.filter(make_record(level=logging.WARNING)) is True
+
+
+def test_sampling_route_override(monkeypatch, request_scope):
+    """Test that a per-route rate overrides the default"""
+    monkeypatch.setattr(settings, "LOG_INFO_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(settings, "LOG_ROUTE_SAMPLE_RATES", "/api/movies=1")
+    record = make_record()
+    assert RequestSamplingFilter().filter(record) is True
+    assert record.route == "/api/movies"
+
+
+def test_sampling_keeps_records_outside_requests(monkeypatch):
+    """Test that startup and background logs are never sampled away"""
+    monkeypatch.setattr(settings, "LOG_INFO_SAMPLE_RATE", 0.0)
+    record = make_record()
+    assert RequestSamplingFilter().filter(record) is True
+    assert record.route is None
+
+
+def test_queue_handler_defers_formatting():
+    """Test that records are queued with their args unrendered"""
+    handler = NonBlockingQueueHandler(queue.Queue())
+    handler.handle(make_record())
+    queued = handler.queue.get_nowait()
+    assert queued.msg == "Fetched %s movies"
+    assert queued.args == (3,)
+
+
+def test_full_queue_drops_and_counts():
+    """Test that a full queue drops records instead of blocking"""
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    before = dropped()
+    handler.handle(make_record())
+    handler.handle(make_record())
+    assert handler.queue.qsize() == 1
+    assert dropped() == before + 1
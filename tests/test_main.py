@@ -41,3 +41,35 @@ def test_openapi_schema(client):
     assert "openapi" in data
     assert "info" in data
     assert "paths" in data
+
+
+def test_cache_stats(client):
+    """Test that response cache counters are exposed"""
+    response = client.get("/cache/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert "hits" in data
+    assert "misses" in data
+    assert "evictions" in data
+
+
+def test_prepared_statement_stats(client):
+    """Test that named statements are prepared once and then executed"""
+    client.get("/api/actors/1")
+    client.get("/api/actors/1")
+    response = client.get("/db/statements")
+    assert response.status_code == 200
+    stats = response.json()["actor_detail"]
+    assert stats["executions"] >= 2
+    assert stats["prepares"] <= stats["executions"]
+
+
+def test_metrics(client):
+    """Test that /metrics exposes route-template latency in Prometheus text format"""
+    client.get("/api/actors/1")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/api/actors/{actor_id}"' in response.text
+    assert "db_query_duration_seconds_bucket" in response.text
+    assert "db_pool_wait_seconds_count" in response.text
@@ -0,0 +1,28 @@
+from app.utils.metrics import Counter, Histogram, CallbackMetric, MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test that observations land in cumulative le buckets with sum and count"""
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(3, "/a")
+    lines = histogram.render()
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{route="/a"} 3.55' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+
+
+def test_counter_and_callback_render():
+    """Test counters per label set, callback metrics and label escaping"""
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("rows_total", "Rows", ("statement",)))
+    counter.inc(3, 'say "hi"')
+    counter.inc(2, 'say "hi"')
+    registry.register(CallbackMetric("pool_in_use", "In use", "gauge", lambda: [("", {}, 4)]))
+    text = registry.render()
+    assert 'rows_total{statement="say \\"hi\\""} 5' in text
+    assert "pool_in_use 4" in text
@@ -0,0 +1,42 @@
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    """Test that cursors decode to the values they were built from"""
+    cursor = encode_cursor({"rank": 0.0607927, "id": 42})
+    assert decode_cursor(cursor) == {"rank": 0.0607927, "id": 42}
+
+
+def test_cursor_is_url_safe():
+    """Test that cursors can be passed as query parameters unescaped"""
+    cursor = encode_cursor({"name": "Zoë ??>>", "id": 7})
+    assert all(c.isalnum() or c in "-_" for c in cursor)
+
+
+def test_cursor_stringifies_datetime_and_decimal():
+    """Test that datetime and Decimal keys survive as strings"""
+    created_at = datetime(2024, 1, 2, 3, 4, 5, 678)
+    values = decode_cursor(encode_cursor({"rating": Decimal("8.5"), "created_at": created_at}))
+    assert values["rating"] == "8.5"
+    assert datetime.fromisoformat(values["created_at"]) == created_at
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "!!", "W10"])
+def test_decode_invalid_cursor(cursor):
+    """Test that malformed cursors raise ValueError"""
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_keyset_page():
+    """Test that the extra row sets has_more and the cursor, and keyset-only columns are dropped"""
+    from app.routes.movies import keyset_page, GENRE_PAGE_CURSOR_KEYS
+    rows = [{"id": i, "sort_rating": Decimal("7.5"), "created_at": datetime(2024, 1, i)} for i in (3, 2, 1)]
+    page = keyset_page(rows, 2, GENRE_PAGE_CURSOR_KEYS)
+    assert page["count"] == 2 and page["has_more"]
+    assert all("sort_rating" not in movie for movie in page["movies"])
+    assert decode_cursor(page["next_cursor"]) == {"rating": "7.5", "created_at": "2024-01-02 00:00:00", "id": 2}
+    assert keyset_page(rows[2:], 2, GENRE_PAGE_CURSOR_KEYS)["next_cursor"] is None
@@ -0,0 +1,214 @@
+import asyncio
+import time
+import psycopg2
+import pytest
+from app import database
+from app.config import settings
+from app.database import (
+    Database, ReadYourWritesMiddleware, ReplicaSet, PRIMARY_READS_KEY, REPLICA_KEY, WROTE_KEY,
+    is_read_only, parse_replica_hosts, replica_lag
+)
+from app.utils.slow_query import current_scope
+
+
+class FakeCursor:
+    rowcount = 1
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchone(self):
+        return {"id": 1}
+
+    def fetchall(self):
+        return [{"id": 1}]
+
+
+class FakeConnection:
+    def cursor(self, cursor_factory=None):
+        return FakeCursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakePool:
+    def __init__(self):
+        self.checkouts = []
+
+    def get_connection(self):
+        conn = FakeConnection()
+        self.checkouts.append(conn)
+        return conn
+
+    def return_connection(self, conn):
+        pass
+
+
+class FakeReplicaPool(FakePool):
+    def __init__(self, name="replica-1:5432"):
+        super().__init__()
+        self.name = name
+        self.healthy = True
+        self.last_error = None
+
+
+class UnreachableReplicaPool(FakeReplicaPool):
+    def get_connection(self):
+        raise psycopg2.OperationalError("connection refused")
+
+
+@pytest.fixture
+def routed(monkeypatch):
+    """A fake primary pool and one healthy fake replica"""
+    primary = FakePool()
+    replica = FakeReplicaPool()
+    replica_set = ReplicaSet()
+    replica_set.pools = [replica]
+    monkeypatch.setattr(database, "db_pool", primary)
+    monkeypatch.setattr(database, "replicas", replica_set)
+    return primary, replica
+
+
+@pytest.fixture
+def request_scope():
+    scope = {"type": "http", "path": "/api/movies"}
+    token = current_scope.set(scope)
+    yield scope
+    current_scope.reset(token)
+
+
+def test_is_read_only():
+    """Test which statements may run on a replica"""
+    assert is_read_only("SELECT * FROM movies WHERE updated_at > %s")
+    assert is_read_only("  WITH top AS (SELECT 1) SELECT * FROM top")
+    assert not is_read_only("INSERT INTO genres (name) VALUES (%s) RETURNING id")
+    assert not is_read_only("WITH moved AS (DELETE FROM reviews RETURNING *) SELECT count(*) FROM moved")
+    assert not is_read_only("SELECT * FROM movies WHERE id = %s FOR UPDATE")
+    assert not is_read_only("SELECT * FROM movies FOR KEY SHARE")
+    assert not is_read_only("SELECT pg_advisory_lock(1)")
+    assert not is_read_only("SELECT pg_try_advisory_xact_lock(1)")
+
+
+def test_parse_replica_hosts(monkeypatch):
+    """Test that hosts without a port use DB_PORT"""
+    monkeypatch.setattr(settings, "DB_PORT", "5432")
+    assert parse_replica_hosts("") == []
+    assert parse_replica_hosts("replica-1:5433, replica-2") == [("replica-1", 5433), ("replica-2", 5432)]
+
+
+def test_replica_lag():
+    """Test lag from the replay position and timestamp"""
+    assert replica_lag(False, None, None) == 0.0
+    assert replica_lag(True, None, None) is None
+    # Caught up with the primary: an old replay timestamp just means no recent writes
+    assert replica_lag(True, 0, 3600.0) == 0.0
+    assert replica_lag(True, 8192, 2.5) == 2.5
+
+
+def test_reads_go_to_replica_and_writes_to_primary(routed):
+    """Test statement routing outside a request"""
+    primary, replica = routed
+    db = Database()
+    db.execute_query("SELECT * FROM movies")
+    assert len(replica.checkouts) == 1
+    db.execute_insert("INSERT INTO genres (name) VALUES (%s) RETURNING id", ("x",))
+    db.execute_delete("DELETE FROM genres WHERE id = %s", (1,))
+    assert len(primary.checkouts) == 2
+    with db.use_primary():
+        db.execute_query("SELECT * FROM movies")
+    assert len(primary.checkouts) == 3
+    assert len(replica.checkouts) == 1
+
+
+def test_reads_after_a_write_stay_on_primary(routed, request_scope):
+    """Test read-your-writes within a request"""
+    primary, replica = routed
+    db = Database()
+    db.execute_query("SELECT * FROM movies")
+    db.execute_update("UPDATE movies SET title = %s WHERE id = %s RETURNING id", ("x", 1))
+    db.execute_query("SELECT * FROM movies")
+    assert len(replica.checkouts) == 1
+    assert len(primary.checkouts) == 2
+    assert request_scope[WROTE_KEY]
+
+
+def test_request_reads_stay_on_one_replica(routed, request_scope):
+    """Test that a request keeps its replica and moves to the primary if it leaves the rotation"""
+    primary, replica = routed
+    other = FakeReplicaPool("replica-2:5432")
+    database.replicas.pools.append(other)
+    db = Database()
+    for _ in range(4):
+        db.execute_query("SELECT 1")
+    pinned = request_scope[REPLICA_KEY]
+    assert len(pinned.checkouts) == 4
+    pinned.healthy = False
+    db.execute_query("SELECT 1")
+    assert len(primary.checkouts) == 1
+    assert len(replica.checkouts) + len(other.checkouts) == 4
+
+
+def test_unhealthy_or_unreachable_replica_falls_back(routed, monkeypatch):
+    """Test that reads use the primary when no replica is usable"""
+    primary, replica = routed
+    db = Database()
+    replica.healthy = False
+    db.execute_query("SELECT 1")
+    assert len(primary.checkouts) == 1
+
+    unreachable = UnreachableReplicaPool()
+    database.replicas.pools = [unreachable]
+    db.execute_query("SELECT 1")
+    assert len(primary.checkouts) == 2
+    assert not unreachable.healthy
+
+
+def test_replica_set_ejects_lagging_replica(monkeypatch):
+    """Test that a replica over the lag limit leaves the rotation and returns once caught up"""
+    monkeypatch.setattr(settings, "DB_REPLICA_MAX_LAG_SECONDS", 5)
+    replica = FakeReplicaPool()
+    replica_set = ReplicaSet()
+    replica_set.pools = [replica]
+    replica_set._update(replica, 12.0, None)
+    assert replica_set.choose() is None
+    replica_set._update(replica, 0.0, None)
+    assert replica_set.choose() is replica
+
+
+def run_middleware(headers, wrote=False):
+    """Send one request through ReadYourWritesMiddleware; returns (scope, response headers)"""
+    scope = {"type": "http", "path": "/api/movies", "headers": headers}
+    sent = []
+
+    async def app(scope, receive, send):
+        if wrote:
+            scope[WROTE_KEY] = True
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(ReadYourWritesMiddleware(app)(scope, None, send))
+    return scope, dict(sent[0]["headers"])
+
+
+def test_middleware_sets_and_honours_last_write_cookie(monkeypatch):
+    """Test that a write sets the cookie and a fresh cookie pins reads to the primary"""
+    monkeypatch.setattr(settings, "DB_REPLICA_STICKY_SECONDS", 5)
+    scope, headers = run_middleware([], wrote=True)
+    assert headers[b"set-cookie"].startswith(b"db_last_write=")
+    assert PRIMARY_READS_KEY not in scope
+
+    cookie = headers[b"set-cookie"].split(b";")[0]
+    scope, headers = run_middleware([(b"cookie", cookie)])
+    assert scope[PRIMARY_READS_KEY]
+    assert b"set-cookie" not in headers
+
+    stale = f"db_last_write={time.time() - 60:.3f}".encode()
+    scope, _ = run_middleware([(b"cookie", stale)])
+    assert PRIMARY_READS_KEY not in scope
@@ -0,0 +1,60 @@
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.config import settings
+from app.database import db
+from app.utils.responses import FastJSONResponse
+
+PAYLOAD = {
+    "movies": [
+        {
+            "id": 1,
+            "title": "Amélie",
+            "rating": Decimal("8.3"),
+            "review_count": Decimal("12"),
+            "created_at": datetime(2024, 5, 1, 12, 30, 15, 123456),
+            "released": date(2001, 4, 25),
+            "cast": [{"name": "Audrey", "rating": Decimal("4.5")}],
+            "next_cursor": None
+        }
+    ],
+    "refreshed_at": datetime(2024, 5, 1, tzinfo=timezone.utc),
+    "has_more": False
+}
+
+
+@pytest.mark.parametrize("fast_json", [True, False])
+def test_fast_response_matches_default_encoding(monkeypatch, fast_json):
+    """Test that the fast path emits the same JSON as jsonable_encoder + JSONResponse"""
+    monkeypatch.setattr(settings, "FAST_JSON_ENABLED", fast_json)
+    expected = json.loads(JSONResponse(jsonable_encoder(PAYLOAD)).body)
+    assert json.loads(FastJSONResponse(PAYLOAD).body) == expected
+
+
+def test_tuple_rows_match_real_dict_rows(monkeypatch):
+    """Test that zipped tuple rows equal RealDictCursor rows"""
+    query = "SELECT id, name, birth_year, created_at FROM actors ORDER BY id"
+    monkeypatch.setattr(settings, "DB_TUPLE_ROWS", True)
+    fast = db.execute_query(query)
+    fast_one = db.execute_query(query + " LIMIT 1", fetch_one=True)
+    streamed = list(db.stream_query(query, batch_size=2))
+    monkeypatch.setattr(settings, "DB_TUPLE_ROWS", False)
+    legacy = db.execute_query(query)
+
+    assert fast == legacy == streamed
+    assert fast_one == legacy[0]
+    assert type(fast[0]) is dict
+    assert db.execute_query(query + " LIMIT 0") == []
+
+
+def test_list_endpoint_serialized_by_fast_path():
+    """Test that list endpoints still return their usual documents"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    response = TestClient(app).get("/api/actors", params={"limit": 5})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert {"actors", "count", "has_more", "next_cursor"} <= set(response.json())
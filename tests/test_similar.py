@@ -0,0 +1,114 @@
+import time
+import numpy as np
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.database import db
+from app.main import app
+from app.services.similar import SimilarMoviesIndex, similar_index
+
+client = TestClient(app)
+
+
+def _create_movie(title, director, genre, cast):
+    payload = {
+        "title": title,
+        "director_name": director,
+        "release_year": 2020,
+        "genre_name": genre,
+        "rating": 7.0,
+        "cast": [{"actor_name": name} for name in cast]
+    }
+    response = client.post("/api/movies", json=payload)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _neighbour_ids(index, movie_id):
+    return [other for other, _ in index.similar(movie_id, index.top_k)]
+
+
+def test_similar_movies_ranked_by_shared_cast_and_director():
+    """Test that movies sharing director and cast rank above genre-only matches"""
+    original = _create_movie(
+        "Similar Original", "Similar Director", "Similar Genre", ["Similar Lead", "Similar Sidekick"]
+    )
+    sequel = _create_movie("Similar Sequel", "Similar Director", "Similar Genre", ["Similar Lead", "Similar Sidekick"])
+    genre_only = _create_movie("Similar Genre Only", "Other Similar Director", "Similar Genre", ["Unrelated Actor"])
+
+    response = client.get(f"/api/movies/{original}/similar", params={"limit": 5})
+    assert response.status_code == 200
+    data = response.json()
+    ids = [movie["id"] for movie in data["similar"]]
+    assert ids[0] == sequel
+    assert genre_only in ids
+    assert original not in ids
+    assert data["similar"][0]["similarity"] > data["similar"][ids.index(genre_only)]["similarity"]
+
+    # Deleting a movie removes it from its neighbours' lists
+    assert client.delete(f"/api/movies/{sequel}").status_code == 200
+    ids = [movie["id"] for movie in client.get(f"/api/movies/{original}/similar").json()["similar"]]
+    assert sequel not in ids
+    assert client.get(f"/api/movies/{sequel}/similar").status_code == 404
+
+    client.delete(f"/api/movies/{original}")
+    client.delete(f"/api/movies/{genre_only}")
+
+
+def test_similar_movies_not_found_and_limit():
+    """Test 404 for unknown movies and validation of limit"""
+    assert client.get("/api/movies/999999/similar").status_code == 404
+    assert client.get("/api/movies/1/similar", params={"limit": 0}).status_code == 422
+
+
+def test_incremental_update_matches_full_build():
+    """Test that applying changes incrementally gives the same neighbours as rebuilding"""
+    similar_index.refresh()
+    first = _create_movie("Incremental One", "Incremental Director", "Incremental Genre", ["Incremental Star"])
+    second = _create_movie(
+        "Incremental Two", "Incremental Director", "Incremental Genre", ["Incremental Star", "Incremental Extra"]
+    )
+    client.put(f"/api/movies/{first}", json={"cast": [{"actor_name": "Incremental Extra"}]})
+
+    similar_index.refresh()
+    rebuilt = SimilarMoviesIndex()
+    rebuilt.build()
+
+    for movie_id in [first, second] + [int(m) for m in rebuilt.movie_ids[:20]]:
+        assert _neighbour_ids(similar_index, movie_id) == _neighbour_ids(rebuilt, movie_id)
+        np.testing.assert_allclose(
+            [score for _, score in similar_index.similar(movie_id, rebuilt.top_k)],
+            [score for _, score in rebuilt.similar(movie_id, rebuilt.top_k)],
+            atol=1e-3
+        )
+
+    client.delete(f"/api/movies/{first}")
+    client.delete(f"/api/movies/{second}")
+
+
+def test_rebuilt_after_writes_from_another_process(monkeypatch):
+    """Test that a lookup rebuilds the index once its tables changed without mark_changed"""
+    monkeypatch.setattr(settings, "INDEX_VERSION_CHECK_SECONDS", 0.01)
+    original = _create_movie("Elsewhere Original", "Elsewhere Director", "Elsewhere Genre", ["Elsewhere Star"])
+    index = SimilarMoviesIndex()
+    index.build()
+
+    # What the importer CLI or another worker does: nothing tells this process
+    copy = db.execute_insert(
+        "INSERT INTO movies (title, director_id, genre_id, release_year) "
+        "SELECT 'Elsewhere Copy', director_id, genre_id, release_year FROM movies WHERE id = %s RETURNING id",
+        (original,)
+    )["id"]
+    db.execute_insert(
+        "INSERT INTO movie_actors (movie_id, actor_id) SELECT %s, actor_id FROM movie_actors WHERE movie_id = %s "
+        "RETURNING id",
+        (copy, original)
+    )
+
+    time.sleep(0.02)
+    deadline = time.monotonic() + 5
+    while copy not in _neighbour_ids(index, original):
+        assert time.monotonic() < deadline, "index was not rebuilt"
+        time.sleep(0.05)
+
+    client.delete(f"/api/movies/{original}")
+    client.delete(f"/api/movies/{copy}")
@@ -0,0 +1,52 @@
+import json
+import pytest
+from app import database
+from app.config import settings
+from app.database import Database
+from app.utils.slow_query import SlowQueryLog, normalize_sql
+
+
+def test_normalize_sql_groups_equal_statements():
+    """Test that literals, placeholders and whitespace are normalized"""
+    query = """
+        SELECT * FROM movies
+        WHERE title = 'It''s' AND id = %s   AND year > 1999
+    """
+    assert normalize_sql(query) == "SELECT * FROM movies WHERE title = ? AND id = ? AND year > ?"
+
+
+@pytest.fixture
+def slow_log(monkeypatch, tmp_path):
+    """Route slow queries from the global Database to a fresh log file, explaining every one"""
+    log_file = tmp_path / "slow.log"
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 1)
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(settings, "SLOW_QUERY_LOG_FILE", str(log_file))
+    log = SlowQueryLog()
+    monkeypatch.setattr(database, "slow_query_log", log)
+    yield log, log_file
+    if log._file_logger:
+        for handler in list(log._file_logger.handlers):
+            log._file_logger.removeHandler(handler)
+            handler.close()
+
+
+def test_slow_query_is_logged_with_plan(slow_log):
+    """Test that a statement over the threshold is written with its EXPLAIN plan"""
+    log, log_file = slow_log
+    Database().execute_query("SELECT pg_sleep(0.01), %s::int AS n", (1,), fetch_one=True, name="sleepy")
+    log.drain()
+    entry = json.loads(log_file.read_text().splitlines()[-1])
+    assert entry["statement"] == "sleepy"
+    assert entry["duration_ms"] >= 10
+    assert entry["sql"] == "SELECT pg_sleep(?), ?::int AS n"
+    assert entry["plan"][0]["Plan"]["Actual Rows"] == 1
+
+
+def test_fast_query_is_not_logged(slow_log, monkeypatch):
+    """Test that statements under the threshold are not recorded"""
+    log, log_file = slow_log
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 10000)
+    Database().execute_query("SELECT 1", fetch_one=True)
+    log.drain()
+    assert not log_file.exists()